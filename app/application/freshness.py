@@ -0,0 +1,24 @@
+"""Freshness signals: the per-request stale flag and process-wide refresh counters"""
+from contextvars import ContextVar
+
+_served_stale: ContextVar[bool] = ContextVar("served_stale", default=False)
+
+
+def mark_served_stale() -> None:
+    _served_stale.set(True)
+
+
+def served_stale() -> bool:
+    return _served_stale.get()
+
+
+class RefreshStats:
+    """Counts cache refreshes by trigger: probabilistic early recompute or expiry"""
+
+    def __init__(self) -> None:
+        self.early = 0
+        self.expired = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"early": self.early, "expired": self.expired}
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+from app.core.exceptions import TwitterAPIError
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from app.application.services import TweetService
+
+logger = get_logger(__name__)
+
+# Rate limiter buckets a refresh of each kind of key may spend; a user refresh also
+# looks up the user ID when it is not cached
+QUOTA_BUCKETS = {"hashtag": ("search_tweets",), "user": ("get_user", "user_timeline")}
+
+
+class QuotaGauge(Protocol):
+    def capacity(self, key: str) -> int: ...
+
+    def remaining(self, key: str) -> int: ...
+
+
+@dataclass
+class _Popularity:
+    kind: str
+    subject: str
+    limit: int
+    score: float
+    updated_at: float
+
+
+class PrewarmScheduler:
+    """
+    Tracks exponentially decayed request counts per cache key and, every `interval`
+    seconds, refreshes the `top_n` most popular keys that expire within `lead_time`.
+    Refreshes only spend quota while more than (1 - quota_share) of the key's rate
+    limiter bucket is left, so on-demand traffic keeps the rest
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], "TweetService"],
+        quota: QuotaGauge,
+        top_n: int = 100,
+        interval: float = 15.0,
+        lead_time: float = 30.0,
+        quota_share: float = 0.25,
+        half_life: float = 600.0,
+    ) -> None:
+        self.service_factory = service_factory
+        self.quota = quota
+        self.top_n = top_n
+        self.interval = interval
+        self.lead_time = lead_time
+        self.quota_share = quota_share
+        self.half_life = half_life
+        self._keys: dict[str, _Popularity] = {}
+        self._task: asyncio.Task[None] | None = None
+        self.refreshed = 0
+        self.skipped_quota = 0
+        self.failed = 0
+
+    def _decayed(self, item: _Popularity, now: float) -> float:
+        return item.score * 0.5 ** ((now - item.updated_at) / self.half_life)
+
+    def record(self, cache_key: str, kind: str, subject: str, limit: int) -> None:
+        now = time.monotonic()
+        item = self._keys.get(cache_key)
+        if item is None:
+            self._keys[cache_key] = _Popularity(kind, subject, limit, 1.0, now)
+            if len(self._keys) > self.top_n * 10:
+                self._prune(now)
+            return
+        item.score = self._decayed(item, now) + 1.0
+        item.updated_at = now
+        item.limit = max(item.limit, limit)
+
+    def _prune(self, now: float) -> None:
+        ranked = sorted(self._keys, key=lambda key: self._decayed(self._keys[key], now), reverse=True)
+        for key in ranked[self.top_n * 5 :]:
+            del self._keys[key]
+
+    def top(self) -> list[str]:
+        now = time.monotonic()
+        return sorted(self._keys, key=lambda key: self._decayed(self._keys[key], now), reverse=True)[
+            : self.top_n
+        ]
+
+    def _has_budget(self, kind: str) -> bool:
+        return all(
+            self.quota.remaining(bucket) > self.quota.capacity(bucket) * (1 - self.quota_share)
+            for bucket in QUOTA_BUCKETS[kind]
+        )
+
+    async def run_once(self) -> None:
+        service = self.service_factory()
+        now = time.time()
+        for cache_key in self.top():
+            item = self._keys[cache_key]
+            entry = await service.cache_service.get(cache_key)
+            if entry is not None and not entry.tweets:
+                # Unknown subjects and empty results are not worth quota: forget them
+                # until they are requested again
+                del self._keys[cache_key]
+                continue
+            if entry is not None and entry.fetched_at + entry.ttl - now > self.lead_time:
+                continue
+            if not self._has_budget(item.kind):
+                self.skipped_quota += 1
+                continue
+            try:
+                await service.refresh(item.kind, item.subject, item.limit)
+                self.refreshed += 1
+            except TwitterAPIError as e:
+                self.failed += 1
+                logger.warning(f"Prewarm refresh failed for '{cache_key}': {e.message}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Prewarm cycle failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Prewarm scheduler started (top_n={self.top_n}, interval={self.interval}s)")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "tracked": len(self._keys),
+            "refreshed": self.refreshed,
+            "skipped_quota": self.skipped_quota,
+            "failed": self.failed,
+        }
@@ -1,56 +1,345 @@
-from collections.abc import Awaitable, Callable
-from typing import Any
+import asyncio
+import math
+import random
+import time
+from typing import Protocol
 
+from app.application.freshness import RefreshStats, mark_served_stale
+from app.application.prewarm import PrewarmScheduler
+from app.application.singleflight import SingleFlight
 from app.bootstrap.config import Settings
-from app.core.entities import Tweet
-from app.core.interfaces import CacheService, TweetRepository
+from app.core.entities import CacheEntry, Tweet
+from app.core.exceptions import (
+    CacheError,
+    TwitterAPIError,
+    TwitterRateLimitError,
+    TwitterResourceNotFoundError,
+    TwitterServiceUnavailableError,
+)
+from app.core.interfaces import CacheService, DistributedLock, TweetRepository
+from app.core.scheduling import BACKGROUND_CLIENT, Priority, upstream_origin
+from app.utils.bloom import RotatingBloomFilter
 from app.utils.decorators import measure_time
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class FetchFn(Protocol):
+    async def __call__(self, subject: str, limit: int, /, since_id: str | None = None) -> list[Tweet]: ...
+
+
+def merge_tweets(new: list[Tweet], old: list[Tweet], limit: int) -> list[Tweet]:
+    """Newest-first merge of a since_id delta into a cached list, deduplicated by tweet ID"""
+    seen = {tweet.id for tweet in new}
+    return (new + [tweet for tweet in old if tweet.id not in seen])[:limit]
+
+
 class TweetService:
     def __init__(
         self,
         tweet_repository: TweetRepository,
         cache_service: CacheService,
         settings: Settings,
+        single_flight: SingleFlight | None = None,
+        recompute_lock: DistributedLock | None = None,
+        refresh_stats: RefreshStats | None = None,
+        missing_users: RotatingBloomFilter | None = None,
+        prewarm: PrewarmScheduler | None = None,
     ) -> None:
         self.tweet_repository = tweet_repository
         self.cache_service = cache_service
         self.settings = settings
+        self.single_flight = single_flight or SingleFlight()
+        self.recompute_lock = recompute_lock
+        self.refresh_stats = refresh_stats or RefreshStats()
+        self.missing_users = missing_users
+        self.prewarm = prewarm
 
     def _normalize_limit(self, limit: int) -> int:
-        return max(1, min(limit, 100)) if limit else 30
+        return max(1, min(limit, self.settings.max_tweet_limit)) if limit else 30
+
+    @property
+    def _storage_ttl(self) -> int:
+        # Entries are kept past their soft TTL (cache_ttl) for as long as any
+        # stale-serving mode may still need them: the stale-while-revalidate window
+        # and the last-known-good window used when the upstream is failing
+        extra = 0
+        if self.settings.cache_swr_enabled:
+            extra = self.settings.cache_stale_ttl
+        if self.settings.cache_stale_if_error_enabled:
+            extra = max(extra, self.settings.cache_stale_if_error_ttl)
+        return self.settings.cache_ttl + extra
+
+    def _entry_ttl(self) -> int:
+        # Entries filled together would otherwise all expire together and re-stampede
+        jitter = self.settings.cache_ttl * self.settings.cache_ttl_jitter
+        return self.settings.cache_ttl - int(random.uniform(0, jitter))
+
+    def _expires_early(self, entry: CacheEntry, now: float) -> bool:
+        # XFetch: refresh ahead of expiry with a probability that rises as expiry
+        # nears, sooner for entries that were expensive to fetch
+        beta = self.settings.cache_early_recompute_beta
+        if beta <= 0 or entry.fetch_cost <= 0:
+            return False
+        gap = -entry.fetch_cost * beta * math.log(1.0 - random.random())
+        return now + gap >= entry.fetched_at + entry.ttl
+
+    @staticmethod
+    def _flight_key(cache_key: str, limit: int, background: bool = False) -> str:
+        # Background recomputes run at prewarm priority, so they get flights of their own:
+        # they may join an interactive flight, but a request must never wait on theirs
+        flight_key = f"{cache_key}:limit:{limit}"
+        return f"{flight_key}:background" if background else flight_key
+
+    def _from_entry(self, entry: CacheEntry, subject: str, limit: int) -> list[Tweet]:
+        if entry.missing:
+            raise TwitterResourceNotFoundError(f"Requested resource not found: {subject}")
+        return entry.tweets[:limit]
 
     async def _get_with_cache(
-        self, cache_key: str, fetch_fn: Callable[..., Awaitable[list[Tweet]]], *args: Any
+        self, cache_key: str, fetch_fn: FetchFn, subject: str, limit: int
     ) -> list[Tweet]:
+        # One entry per subject holds the largest result fetched so far; smaller
+        # limits are answered by slicing it
         cached = await self.cache_service.get(cache_key)
+        fetch_limit = limit
         if cached is not None:
-            return cached
+            fetch_limit = max(limit, cached.limit)
+            if cached.covers(limit):
+                now = time.time()
+                age = now - cached.fetched_at
+                if age < cached.ttl:
+                    if self._expires_early(cached, now) and self._revalidate(
+                        cache_key, fetch_fn, subject, fetch_limit, cached
+                    ):
+                        self.refresh_stats.early += 1
+                    return self._from_entry(cached, subject, limit)
+                if self.settings.cache_swr_enabled and age < cached.ttl + self.settings.cache_stale_ttl:
+                    if self._revalidate(cache_key, fetch_fn, subject, fetch_limit, cached):
+                        self.refresh_stats.expired += 1
+                    return self._from_entry(cached, subject, limit)
+                if not self.single_flight.in_flight(self._flight_key(cache_key, fetch_limit)):
+                    self.refresh_stats.expired += 1
 
-        tweets = await fetch_fn(*args)
-        if tweets:
-            await self.cache_service.set(cache_key, tweets, self.settings.cache_ttl)
+        try:
+            tweets = await self.single_flight.do(
+                self._flight_key(cache_key, fetch_limit),
+                lambda: self._recompute(cache_key, fetch_fn, subject, fetch_limit, cached),
+            )
+        except (TwitterRateLimitError, TwitterServiceUnavailableError) as e:
+            if cached is None or not self.settings.cache_stale_if_error_enabled:
+                raise
+            logger.warning(f"Upstream unavailable ({type(e).__name__}), serving last known good: {cache_key}")
+            mark_served_stale()
+            return self._from_entry(cached, subject, limit)
+        return tweets[:limit]
+
+    async def _recompute(
+        self,
+        cache_key: str,
+        fetch_fn: FetchFn,
+        subject: str,
+        limit: int,
+        previous: CacheEntry | None = None,
+    ) -> list[Tweet]:
+        if self.recompute_lock is None:
+            return await self._fetch_and_cache(cache_key, fetch_fn, subject, limit, previous)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settings.cache_lock_wait_timeout
+
+        while True:
+            try:
+                token = await self.recompute_lock.acquire(cache_key, self.settings.cache_lock_ttl)
+            except CacheError:
+                return await self._fetch_and_cache(cache_key, fetch_fn, subject, limit, previous)
+
+            if token is not None:
+                try:
+                    return await self._fetch_and_cache(cache_key, fetch_fn, subject, limit, previous)
+                finally:
+                    await self.recompute_lock.release(cache_key, token)
+
+            if loop.time() >= deadline:
+                logger.warning(f"Recompute lock wait timed out for key '{cache_key}', fetching directly")
+                return await self._fetch_and_cache(cache_key, fetch_fn, subject, limit, previous)
+
+            # Another worker holds the lease; poll for its result. If it dies, the
+            # lease expires and the next acquire attempt takes over the recompute.
+            await asyncio.sleep(self.settings.cache_lock_poll_interval)
+            cached = await self.cache_service.get(cache_key)
+            if cached is not None and cached.is_fresh(time.time()) and cached.covers(limit):
+                return self._from_entry(cached, subject, limit)
+
+    async def _recompute_in_background(
+        self,
+        cache_key: str,
+        fetch_fn: FetchFn,
+        subject: str,
+        limit: int,
+        previous: CacheEntry | None = None,
+    ) -> list[Tweet]:
+        """Recompute on behalf of no request: below interactive calls and outside any client's share"""
+        with upstream_origin(Priority.PREWARM, client=BACKGROUND_CLIENT):
+            return await self._recompute(cache_key, fetch_fn, subject, limit, previous)
+
+    def _revalidate(
+        self,
+        cache_key: str,
+        fetch_fn: FetchFn,
+        subject: str,
+        limit: int,
+        previous: CacheEntry | None = None,
+    ) -> bool:
+        """Start a background refresh unless one is already running; returns whether one was started"""
+        interactive_key = self._flight_key(cache_key, limit)
+        flight_key = self._flight_key(cache_key, limit, background=True)
+        if self.single_flight.in_flight(interactive_key) or self.single_flight.in_flight(flight_key):
+            return False
+        logger.debug(f"Serving cached entry, revalidating in background: {cache_key}")
+        self.single_flight.start(
+            flight_key,
+            lambda: self._recompute_in_background(cache_key, fetch_fn, subject, limit, previous),
+        )
+        return True
+
+    def _since_id(self, previous: CacheEntry | None, limit: int) -> str | None:
+        # A delta can only refresh an entry already holding the newest `limit` tweets
+        if (
+            not self.settings.cache_incremental_refresh_enabled
+            or previous is None
+            or previous.missing
+            or previous.limit < limit
+        ):
+            return None
+        return previous.newest_id
+
+    async def _fetch_and_cache(
+        self,
+        cache_key: str,
+        fetch_fn: FetchFn,
+        subject: str,
+        limit: int,
+        previous: CacheEntry | None = None,
+    ) -> list[Tweet]:
+        since_id = self._since_id(previous, limit)
+        start = time.perf_counter()
+        try:
+            if since_id is None:
+                tweets = await fetch_fn(subject, limit)
+            else:
+                try:
+                    tweets = await fetch_fn(subject, limit, since_id=since_id)
+                except (TwitterRateLimitError, TwitterResourceNotFoundError, TwitterServiceUnavailableError):
+                    raise
+                except TwitterAPIError as e:
+                    # e.g. a since_id too old for the search window: start over
+                    logger.warning(f"Incremental refresh of '{cache_key}' failed ({e.message}), fetching in full")
+                    since_id = None
+                    tweets = await fetch_fn(subject, limit)
+        except TwitterResourceNotFoundError:
+            await self._store_negative(cache_key, limit, time.perf_counter() - start, missing=True)
+            raise
+
+        if since_id is not None and previous is not None:
+            logger.debug(f"Incremental refresh of '{cache_key}': {len(tweets)} new tweets")
+            tweets = merge_tweets(tweets, previous.tweets, limit)
+
+        if not tweets:
+            await self._store_negative(cache_key, limit, time.perf_counter() - start)
+            return tweets
+
+        if await self._holds_fresh_superset(cache_key, limit):
+            # A concurrent fetch for a larger limit finished first; keep its superset
+            logger.debug(f"Keeping cached superset for key '{cache_key}' over limit {limit}")
+            return tweets
+
+        entry = CacheEntry(
+            tweets=tweets,
+            fetched_at=time.time(),
+            ttl=self._entry_ttl(),
+            limit=limit,
+            fetch_cost=time.perf_counter() - start,
+        )
+        await self._store(cache_key, entry, self._storage_ttl)
         return tweets
 
+    async def _holds_fresh_superset(self, cache_key: str, limit: int) -> bool:
+        try:
+            current = await self.cache_service.get(cache_key)
+        except CacheError:
+            return False
+        return (
+            current is not None
+            and bool(current.tweets)
+            and current.limit > limit
+            and current.is_fresh(time.time())
+        )
+
+    async def _store_negative(
+        self, cache_key: str, limit: int, fetch_cost: float, missing: bool = False
+    ) -> None:
+        # Remember unknown subjects and empty results briefly, without any stale window,
+        # so repeated lookups of them do not each cost an upstream call
+        ttl = self.settings.cache_negative_ttl
+        if ttl <= 0:
+            return
+        entry = CacheEntry(
+            tweets=[], fetched_at=time.time(), ttl=ttl, limit=limit, fetch_cost=fetch_cost, missing=missing
+        )
+        await self._store(cache_key, entry, ttl)
+
+    async def _store(self, cache_key: str, entry: CacheEntry, ttl: int) -> None:
+        try:
+            await self.cache_service.set(cache_key, entry, ttl)
+        except CacheError as e:
+            # The caller already has its data; a failed cache write only costs a future miss
+            logger.warning(f"Cache population failed for key '{cache_key}': {e}")
+
+    def _target(self, kind: str, subject: str) -> tuple[str, FetchFn]:
+        if kind == "hashtag":
+            # Hashtags are case-insensitive on Twitter, so all spellings share one entry
+            return f"hashtag:{subject.casefold()}", self.tweet_repository.get_tweets_by_hashtag
+        return f"user:{subject.casefold()}", self.tweet_repository.get_tweets_by_user
+
+    async def refresh(self, kind: str, subject: str, limit: int) -> None:
+        """Recompute a cache entry ahead of demand, whatever its current freshness"""
+        cache_key, fetch_fn = self._target(kind, subject)
+        cached = await self.cache_service.get(cache_key)
+        if cached is not None:
+            limit = max(limit, cached.limit)
+        flight_key = self._flight_key(cache_key, limit)
+        if not self.single_flight.in_flight(flight_key):
+            flight_key = self._flight_key(cache_key, limit, background=True)
+        await self.single_flight.do(
+            flight_key,
+            lambda: self._recompute_in_background(cache_key, fetch_fn, subject, limit, cached),
+        )
+
     @measure_time
     async def get_tweets_by_hashtag(self, hashtag: str, limit: int = 30) -> list[Tweet]:
         hashtag = hashtag.lstrip("#").strip()
         limit = self._normalize_limit(limit)
-        cache_key = f"hashtag:{hashtag}:limit:{limit}"
-        return await self._get_with_cache(
-            cache_key, self.tweet_repository.get_tweets_by_hashtag, hashtag, limit
-        )
+        cache_key, fetch_fn = self._target("hashtag", hashtag)
+        if self.prewarm is not None:
+            self.prewarm.record(cache_key, "hashtag", hashtag, limit)
+        return await self._get_with_cache(cache_key, fetch_fn, hashtag, limit)
 
     @measure_time
     async def get_tweets_by_user(self, username: str, limit: int = 30) -> list[Tweet]:
         username = username.lstrip("@").strip()
         limit = self._normalize_limit(limit)
-        cache_key = f"user:{username}:limit:{limit}"
-        return await self._get_with_cache(
-            cache_key, self.tweet_repository.get_tweets_by_user, username, limit
-        )
+        cache_key, fetch_fn = self._target("user", username)
+        if self.missing_users is not None and username.casefold() in self.missing_users:
+            self.missing_users.rejected += 1
+            raise TwitterResourceNotFoundError(f"User @{username} not found")
+        if self.prewarm is not None:
+            self.prewarm.record(cache_key, "user", username, limit)
 
+        try:
+            return await self._get_with_cache(cache_key, fetch_fn, username, limit)
+        except TwitterResourceNotFoundError:
+            if self.missing_users is not None:
+                self.missing_users.add(username.casefold())
+            raise
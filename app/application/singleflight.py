@@ -0,0 +1,64 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into one in-flight execution.
+    Every caller awaiting the same key receives the leader's result or exception
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, asyncio.Task[Any]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def start(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task[Any]:
+        task = self._flights.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        self.executions += 1
+        task = asyncio.ensure_future(fn())
+        self._flights[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return task
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        coalesced = key in self._flights
+        task = self.start(key, fn)
+        if coalesced:
+            logger.debug("Single-flight coalesced call for key: %s", key)
+        # Shield so that one cancelled caller does not abort the shared execution
+        return await asyncio.shield(task)
+
+    async def close(self) -> None:
+        tasks = list(self._flights.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _finish(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Mark the exception retrieved; waiters (if any) re-raise it themselves
+            logger.debug("Single-flight execution failed for key '%s': %s", key, task.exception())
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
@@ -7,14 +7,75 @@ class Settings(BaseModel):
     port: int = Field(ge=1, le=65535)
 
     twitter_bearer_token: str
+    twitter_bearer_tokens: str = ""
+    twitter_token_ejection_period: float = Field(default=60.0, ge=0, le=3600)
     twitter_api_base_url: str
     twitter_max_results: int = Field(ge=10, le=100)
     twitter_request_timeout: int = Field(ge=5, le=60)
+    twitter_max_pages: int = Field(default=1, ge=1, le=10)
+    twitter_rate_limit_max_wait: float = Field(default=0.0, ge=0, le=60)
+    twitter_rate_limit_backend: str = "local"
+    twitter_scheduler_reserve: float = Field(default=0.1, ge=0, lt=1)
+    twitter_scheduler_client_weights: str = ""
+    twitter_scheduler_trust_client_id: bool = False
+    twitter_user_id_cache_max_entries: int = Field(default=10000, ge=1)
+    twitter_user_id_cache_ttl: int = Field(default=86400, ge=0, le=2592000)
+    twitter_user_batch_window: float = Field(default=0.0, ge=0, le=1)
+    twitter_search_batch_window: float = Field(default=0.0, ge=0, le=1)
 
     cache_enabled: bool
     cache_ttl: int = Field(ge=0, le=3600)
     redis_url: str
     redis_enabled: bool
+    cache_serializer: str = "json"
+    cache_compression: str = "none"
+    cache_compression_threshold: int = Field(default=1024, ge=0)
+    cache_op_timeout: float = Field(default=0.25, gt=0, le=10)
+    cache_breaker_failure_threshold: int = Field(default=5, ge=1)
+    cache_breaker_slow_call_threshold: float = Field(default=0.1, gt=0, le=10)
+    cache_breaker_reset_timeout: float = Field(default=5.0, gt=0, le=300)
+    cache_breaker_fallback: str = "miss"
+    cache_memory_max_bytes: int = Field(default=64 * 1024 * 1024, ge=1024)
+    cache_memory_policy: str = "lru"
+
+    cache_snapshot_path: str = ""
+
+    cache_l1_enabled: bool = False
+    cache_l1_max_entries: int = Field(default=1024, ge=1)
+    cache_l1_ttl: int = Field(default=10, ge=1, le=3600)
+
+    cache_write_behind_enabled: bool = False
+    cache_write_behind_max_pending: int = Field(default=1000, ge=1)
+    cache_write_behind_batch_size: int = Field(default=50, ge=1, le=1000)
+    cache_write_behind_flush_interval: float = Field(default=0.05, ge=0, le=5)
+
+    cache_ttl_jitter: float = Field(default=0.0, ge=0, lt=1)
+    cache_early_recompute_beta: float = Field(default=0.0, ge=0, le=10)
+
+    cache_negative_ttl: int = Field(default=60, ge=0, le=3600)
+    cache_missing_user_filter_enabled: bool = False
+    cache_missing_user_filter_capacity: int = Field(default=100_000, ge=1000)
+    cache_missing_user_filter_error_rate: float = Field(default=0.01, gt=0, lt=1)
+    cache_missing_user_filter_rotation: int = Field(default=3600, ge=60)
+
+    cache_incremental_refresh_enabled: bool = False
+
+    cache_swr_enabled: bool = False
+    cache_stale_ttl: int = Field(default=600, ge=0, le=86400)
+    cache_stale_if_error_enabled: bool = False
+    cache_stale_if_error_ttl: int = Field(default=86400, ge=0, le=604800)
+
+    cache_lock_enabled: bool = False
+    cache_lock_ttl: int = Field(default=10, ge=1, le=300)
+    cache_lock_wait_timeout: float = Field(default=5.0, gt=0, le=60)
+    cache_lock_poll_interval: float = Field(default=0.1, gt=0, le=5)
+
+    prewarm_enabled: bool = False
+    prewarm_top_n: int = Field(default=100, ge=1, le=10000)
+    prewarm_interval: float = Field(default=15.0, gt=0, le=3600)
+    prewarm_lead_time: float = Field(default=30.0, ge=0, le=3600)
+    prewarm_quota_share: float = Field(default=0.25, gt=0, le=1)
+    prewarm_half_life: float = Field(default=600.0, gt=0)
 
     log_level: str
     log_format: str
@@ -37,6 +98,57 @@ class Settings(BaseModel):
             raise ValueError("log_format must be 'json' or 'console'")
         return v
 
+    @field_validator("twitter_rate_limit_backend")
+    @classmethod
+    def validate_twitter_rate_limit_backend(cls, v: str) -> str:
+        if v not in ["local", "redis"]:
+            raise ValueError("twitter_rate_limit_backend must be 'local' or 'redis'")
+        return v
+
+    @field_validator("twitter_scheduler_client_weights")
+    @classmethod
+    def validate_twitter_scheduler_client_weights(cls, v: str) -> str:
+        for item in filter(None, (part.strip() for part in v.split(","))):
+            client, _, weight = item.partition("=")
+            try:
+                valid = bool(client.strip()) and float(weight) > 0
+            except ValueError:
+                valid = False
+            if not valid:
+                raise ValueError(
+                    "twitter_scheduler_client_weights must be comma-separated client=weight pairs "
+                    "with positive weights"
+                )
+        return v
+
+    @field_validator("cache_serializer")
+    @classmethod
+    def validate_cache_serializer(cls, v: str) -> str:
+        if v not in ["json", "binary"]:
+            raise ValueError("cache_serializer must be 'json' or 'binary'")
+        return v
+
+    @field_validator("cache_compression")
+    @classmethod
+    def validate_cache_compression(cls, v: str) -> str:
+        if v not in ["none", "zlib", "lz4"]:
+            raise ValueError("cache_compression must be 'none', 'zlib' or 'lz4'")
+        return v
+
+    @field_validator("cache_breaker_fallback")
+    @classmethod
+    def validate_cache_breaker_fallback(cls, v: str) -> str:
+        if v not in ["miss", "memory"]:
+            raise ValueError("cache_breaker_fallback must be 'miss' or 'memory'")
+        return v
+
+    @field_validator("cache_memory_policy")
+    @classmethod
+    def validate_cache_memory_policy(cls, v: str) -> str:
+        if v not in ["lru", "tinylfu"]:
+            raise ValueError("cache_memory_policy must be 'lru' or 'tinylfu'")
+        return v
+
     @field_validator("twitter_bearer_token")
     @classmethod
     def validate_bearer_token(cls, v: str) -> str:
@@ -44,6 +156,25 @@ class Settings(BaseModel):
             raise ValueError("twitter_bearer_token seems invalid (too short)")
         return v
 
+    @property
+    def max_tweet_limit(self) -> int:
+        """Largest limit one request can be served: one page of results per followed page"""
+        return self.twitter_max_results * self.twitter_max_pages
+
+    @property
+    def twitter_bearer_tokens_list(self) -> list[str]:
+        tokens = [self.twitter_bearer_token]
+        tokens += [token.strip() for token in self.twitter_bearer_tokens.split(",") if token.strip()]
+        return list(dict.fromkeys(tokens))
+
+    @property
+    def twitter_scheduler_client_weights_map(self) -> dict[str, float]:
+        weights = {}
+        for item in filter(None, (part.strip() for part in self.twitter_scheduler_client_weights.split(","))):
+            client, _, weight = item.partition("=")
+            weights[client.strip()] = float(weight)
+        return weights
+
     @property
     def cors_origins_list(self) -> list[str]:
         if not self.cors_origins or self.cors_origins == "*":
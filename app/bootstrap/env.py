@@ -32,16 +32,68 @@ def load_environment() -> dict[str, Any]:
         "host": os.getenv("HOST", "0.0.0.0"),
         "port": int(os.getenv("PORT", "8000")),
         "twitter_bearer_token": bearer_token,
+        "twitter_bearer_tokens": os.getenv("TWITTER_BEARER_TOKENS", ""),
+        "twitter_token_ejection_period": float(os.getenv("TWITTER_TOKEN_EJECTION_PERIOD", "60.0")),
         "twitter_api_base_url": os.getenv(
             "TWITTER_API_BASE_URL",
             "https://api.twitter.com/2"
         ),
         "twitter_max_results": int(os.getenv("TWITTER_MAX_RESULTS", "100")),
         "twitter_request_timeout": int(os.getenv("TWITTER_REQUEST_TIMEOUT", "30")),
+        "twitter_max_pages": int(os.getenv("TWITTER_MAX_PAGES", "1")),
+        "twitter_rate_limit_max_wait": float(os.getenv("TWITTER_RATE_LIMIT_MAX_WAIT", "0.0")),
+        "twitter_rate_limit_backend": os.getenv("TWITTER_RATE_LIMIT_BACKEND", "local"),
+        "twitter_scheduler_reserve": float(os.getenv("TWITTER_SCHEDULER_RESERVE", "0.1")),
+        "twitter_scheduler_client_weights": os.getenv("TWITTER_SCHEDULER_CLIENT_WEIGHTS", ""),
+        "twitter_scheduler_trust_client_id": os.getenv("TWITTER_SCHEDULER_TRUST_CLIENT_ID", "false").lower() == "true",
+        "twitter_user_id_cache_max_entries": int(os.getenv("TWITTER_USER_ID_CACHE_MAX_ENTRIES", "10000")),
+        "twitter_user_id_cache_ttl": int(os.getenv("TWITTER_USER_ID_CACHE_TTL", "86400")),
+        "twitter_user_batch_window": float(os.getenv("TWITTER_USER_BATCH_WINDOW", "0.0")),
+        "twitter_search_batch_window": float(os.getenv("TWITTER_SEARCH_BATCH_WINDOW", "0.0")),
         "cache_enabled": os.getenv("CACHE_ENABLED", "false").lower() == "true",
         "cache_ttl": int(os.getenv("CACHE_TTL", "300")),
         "redis_url": os.getenv("REDIS_URL", "redis://localhost:6379"),
         "redis_enabled": os.getenv("REDIS_ENABLED", "false").lower() == "true",
+        "cache_serializer": os.getenv("CACHE_SERIALIZER", "json"),
+        "cache_compression": os.getenv("CACHE_COMPRESSION", "none"),
+        "cache_compression_threshold": int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024")),
+        "cache_op_timeout": float(os.getenv("CACHE_OP_TIMEOUT", "0.25")),
+        "cache_breaker_failure_threshold": int(os.getenv("CACHE_BREAKER_FAILURE_THRESHOLD", "5")),
+        "cache_breaker_slow_call_threshold": float(os.getenv("CACHE_BREAKER_SLOW_CALL_THRESHOLD", "0.1")),
+        "cache_breaker_reset_timeout": float(os.getenv("CACHE_BREAKER_RESET_TIMEOUT", "5.0")),
+        "cache_breaker_fallback": os.getenv("CACHE_BREAKER_FALLBACK", "miss"),
+        "cache_memory_max_bytes": int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(64 * 1024 * 1024))),
+        "cache_memory_policy": os.getenv("CACHE_MEMORY_POLICY", "lru"),
+        "cache_snapshot_path": os.getenv("CACHE_SNAPSHOT_PATH", ""),
+        "cache_l1_enabled": os.getenv("CACHE_L1_ENABLED", "false").lower() == "true",
+        "cache_l1_max_entries": int(os.getenv("CACHE_L1_MAX_ENTRIES", "1024")),
+        "cache_l1_ttl": int(os.getenv("CACHE_L1_TTL", "10")),
+        "cache_write_behind_enabled": os.getenv("CACHE_WRITE_BEHIND_ENABLED", "false").lower() == "true",
+        "cache_write_behind_max_pending": int(os.getenv("CACHE_WRITE_BEHIND_MAX_PENDING", "1000")),
+        "cache_write_behind_batch_size": int(os.getenv("CACHE_WRITE_BEHIND_BATCH_SIZE", "50")),
+        "cache_write_behind_flush_interval": float(os.getenv("CACHE_WRITE_BEHIND_FLUSH_INTERVAL", "0.05")),
+        "cache_ttl_jitter": float(os.getenv("CACHE_TTL_JITTER", "0.0")),
+        "cache_early_recompute_beta": float(os.getenv("CACHE_EARLY_RECOMPUTE_BETA", "0.0")),
+        "cache_negative_ttl": int(os.getenv("CACHE_NEGATIVE_TTL", "60")),
+        "cache_missing_user_filter_enabled": os.getenv("CACHE_MISSING_USER_FILTER_ENABLED", "false").lower() == "true",
+        "cache_missing_user_filter_capacity": int(os.getenv("CACHE_MISSING_USER_FILTER_CAPACITY", "100000")),
+        "cache_missing_user_filter_error_rate": float(os.getenv("CACHE_MISSING_USER_FILTER_ERROR_RATE", "0.01")),
+        "cache_missing_user_filter_rotation": int(os.getenv("CACHE_MISSING_USER_FILTER_ROTATION", "3600")),
+        "cache_incremental_refresh_enabled": os.getenv("CACHE_INCREMENTAL_REFRESH_ENABLED", "false").lower() == "true",
+        "cache_swr_enabled": os.getenv("CACHE_SWR_ENABLED", "false").lower() == "true",
+        "cache_stale_ttl": int(os.getenv("CACHE_STALE_TTL", "600")),
+        "cache_stale_if_error_enabled": os.getenv("CACHE_STALE_IF_ERROR_ENABLED", "false").lower() == "true",
+        "cache_stale_if_error_ttl": int(os.getenv("CACHE_STALE_IF_ERROR_TTL", "86400")),
+        "cache_lock_enabled": os.getenv("CACHE_LOCK_ENABLED", "false").lower() == "true",
+        "cache_lock_ttl": int(os.getenv("CACHE_LOCK_TTL", "10")),
+        "cache_lock_wait_timeout": float(os.getenv("CACHE_LOCK_WAIT_TIMEOUT", "5.0")),
+        "cache_lock_poll_interval": float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.1")),
+        "prewarm_enabled": os.getenv("PREWARM_ENABLED", "false").lower() == "true",
+        "prewarm_top_n": int(os.getenv("PREWARM_TOP_N", "100")),
+        "prewarm_interval": float(os.getenv("PREWARM_INTERVAL", "15.0")),
+        "prewarm_lead_time": float(os.getenv("PREWARM_LEAD_TIME", "30.0")),
+        "prewarm_quota_share": float(os.getenv("PREWARM_QUOTA_SHARE", "0.25")),
+        "prewarm_half_life": float(os.getenv("PREWARM_HALF_LIFE", "600.0")),
         "log_level": os.getenv("LOG_LEVEL", "INFO"),
         "log_format": os.getenv("LOG_FORMAT", "json"),
         "cors_origins": os.getenv("CORS_ORIGINS", ""),
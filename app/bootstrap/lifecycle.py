@@ -5,6 +5,9 @@ from typing import Any
 from fastapi import FastAPI
 
 from app import __version__
+from app.bootstrap.config import get_settings
+from app.infrastructure.cache.snapshot import SQLiteCacheSnapshot
+from app.infrastructure.twitter.redis_rate_limiter import RedisRateLimiter
 from app.presentation.api import dependencies
 from app.utils.logger import get_logger
 
@@ -15,14 +18,63 @@ def create_lifespan() -> Any:
     @asynccontextmanager
     async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info(f"Application starting (version: {__version__})")
+        settings = get_settings()
+        snapshot = None
+        if settings.cache_enabled and settings.cache_snapshot_path:
+            snapshot = SQLiteCacheSnapshot(settings.cache_snapshot_path)
+            await snapshot.restore(dependencies.get_cache_service(settings))
+
+        prewarm = dependencies.get_prewarm_scheduler(settings)
+        if prewarm is not None:
+            prewarm.start()
+
         yield
         logger.info("Application shutting down")
 
+        if dependencies._prewarm is not None:
+            await dependencies._prewarm.close()
+            logger.info(f"Prewarm stats: {dependencies._prewarm.stats}")
+
+        if dependencies._single_flight:
+            await dependencies._single_flight.close()
+            logger.info(f"Single-flight stats: {dependencies._single_flight.stats}")
+
+        if dependencies._refresh_stats:
+            logger.info(f"Cache refresh stats: {dependencies._refresh_stats.stats}")
+
+        if dependencies._user_ids is not None:
+            logger.info(f"User ID cache stats: {dependencies._user_ids.stats}")
+
+        if dependencies._missing_users:
+            logger.info(f"Missing-user filter stats: {dependencies._missing_users.stats}")
+
+        if dependencies._user_batcher is not None:
+            await dependencies._user_batcher.close()
+            logger.info(f"User lookup batching stats: {dependencies._user_batcher.stats}")
+
+        if dependencies._search_batcher is not None:
+            await dependencies._search_batcher.close()
+            logger.info(f"Hashtag search batching stats: {dependencies._search_batcher.stats}")
+
+        if dependencies._token_pool is not None:
+            logger.info(f"Bearer token stats: {dependencies._token_pool.stats}")
+
+        if dependencies._upstream_scheduler is not None:
+            logger.info(f"Upstream scheduler stats: {dependencies._upstream_scheduler.stats}")
+
         if dependencies._http_client:
             await dependencies._http_client.aclose()
             logger.info("HTTP client closed")
 
+        if isinstance(dependencies._rate_limiter, RedisRateLimiter):
+            await dependencies._rate_limiter.close()
+
+        if dependencies._recompute_lock:
+            await dependencies._recompute_lock.close()
+
         if dependencies._cache_service:
+            if snapshot is not None:
+                await snapshot.save(dependencies._cache_service)
             await dependencies._cache_service.close()
             logger.info("Cache service closed")
 
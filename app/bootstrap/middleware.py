@@ -8,6 +8,11 @@ from app.presentation.middleware.error_handler import (
     twitter_api_error_handler,
 )
 from app.presentation.middleware.logging import LoggingMiddleware
+from app.presentation.middleware.upstream_context import (
+    CLIENT_ID_HEADER,
+    PRIORITY_HEADER,
+    UpstreamContextMiddleware,
+)
 
 settings = get_settings()
 
@@ -19,10 +24,14 @@ def setup_middleware(app: FastAPI) -> None:
             allow_origins=settings.cors_origins_list,
             allow_credentials=False,
             allow_methods=["GET"],
-            allow_headers=["Accept", "Content-Type"],
+            allow_headers=["Accept", "Content-Type", CLIENT_ID_HEADER, PRIORITY_HEADER],
+            expose_headers=["X-Cache-Status"],
         )
 
 
+    app.add_middleware(
+        UpstreamContextMiddleware, trust_client_id=settings.twitter_scheduler_trust_client_id
+    )
     app.add_middleware(LoggingMiddleware)
     app.add_exception_handler(TwitterAPIError, twitter_api_error_handler)  # type: ignore[arg-type]
     app.add_exception_handler(Exception, global_exception_handler)
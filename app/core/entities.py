@@ -17,3 +17,29 @@ class Tweet:
     replies: int
     retweets: int
     text: str
+    # Snowflake tweet ID; empty when unknown (e.g. entries cached before IDs were kept)
+    id: str = ""
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    tweets: list[Tweet]
+    fetched_at: float
+    ttl: int
+    limit: int = 0
+    # Seconds the upstream fetch that produced this entry took
+    fetch_cost: float = 0.0
+    # Negative entry: the subject itself does not exist upstream (e.g. unknown user)
+    missing: bool = False
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.fetched_at < self.ttl
+
+    @property
+    def newest_id(self) -> str | None:
+        ids = [int(tweet.id) for tweet in self.tweets if tweet.id]
+        return str(max(ids)) if ids else None
+
+    def covers(self, limit: int) -> bool:
+        # A result shorter than the limit it was fetched with holds every available tweet
+        return len(self.tweets) >= limit or len(self.tweets) < self.limit
@@ -1,28 +1,57 @@
 from abc import ABC, abstractmethod
 
-from app.core.entities import Tweet
+from app.core.entities import CacheEntry, Tweet
 
 
 class TweetRepository(ABC):
+    # `since_id` restricts results to tweets newer than that tweet ID
+
     @abstractmethod
-    async def get_tweets_by_hashtag(self, hashtag: str, limit: int = 30) -> list[Tweet]:
+    async def get_tweets_by_hashtag(
+        self, hashtag: str, limit: int = 30, since_id: str | None = None
+    ) -> list[Tweet]:
         pass
 
     @abstractmethod
-    async def get_tweets_by_user(self, username: str, limit: int = 30) -> list[Tweet]:
+    async def get_tweets_by_user(
+        self, username: str, limit: int = 30, since_id: str | None = None
+    ) -> list[Tweet]:
         pass
 
 
 class CacheService(ABC):
     @abstractmethod
-    async def get(self, key: str) -> list[Tweet] | None:
+    async def get(self, key: str) -> CacheEntry | None:
         pass
 
     @abstractmethod
-    async def set(self, key: str, value: list[Tweet], ttl: int) -> None:
+    async def set(self, key: str, value: CacheEntry, ttl: int) -> None:
         pass
 
     @abstractmethod
     async def delete(self, key: str) -> None:
         pass
 
+    async def set_many(self, items: list[tuple[str, CacheEntry, int]]) -> None:
+        for key, value, ttl in items:
+            await self.set(key, value, ttl)
+
+    async def snapshot(self) -> list[tuple[str, CacheEntry, float]]:
+        """Live entries with their remaining TTL; empty for backends that persist on their own"""
+        return []
+
+    async def close(self) -> None:
+        return None
+
+
+class DistributedLock(ABC):
+    @abstractmethod
+    async def acquire(self, key: str, ttl: int) -> str | None:
+        pass
+
+    @abstractmethod
+    async def release(self, key: str, token: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,42 @@
+"""Origin of upstream calls: the priority class and inbound API client they are made for"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+
+ANONYMOUS_CLIENT = "anonymous"
+BACKGROUND_CLIENT = "background"
+
+
+class Priority(IntEnum):
+    """Upstream priority classes; lower values are served first"""
+
+    INTERACTIVE = 0
+    PREWARM = 1
+    BULK = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.INTERACTIVE)
+_client: ContextVar[str] = ContextVar("upstream_client", default=ANONYMOUS_CLIENT)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+def current_client() -> str:
+    return _client.get()
+
+
+@contextmanager
+def upstream_origin(priority: Priority | None = None, client: str | None = None) -> Iterator[None]:
+    """Attribute the upstream calls made within the block to `priority` and `client`"""
+    priority_token = _priority.set(priority) if priority is not None else None
+    client_token = _client.set(client) if client is not None else None
+    try:
+        yield
+    finally:
+        if client_token is not None:
+            _client.reset(client_token)
+        if priority_token is not None:
+            _priority.reset(priority_token)
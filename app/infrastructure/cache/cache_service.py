@@ -1,27 +1,50 @@
-from typing import Any
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
 from urllib.parse import urlparse
 
 from aiocache import Cache
-from aiocache.serializers import JsonSerializer
+from aiocache.serializers import NullSerializer
 
 from app.bootstrap.config import Settings
-from app.core.entities import Account, Tweet
+from app.core.entities import CacheEntry
 from app.core.exceptions import CacheError
 from app.core.interfaces import CacheService
+from app.infrastructure.cache.compression import Compressor
+from app.infrastructure.cache.memory import MemoryCacheService
+from app.infrastructure.cache.serializers import SERIALIZERS, EntrySerializer, decode_entry
+from app.utils.circuit_breaker import CircuitBreaker
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+PROBE_KEY = "__probe__"
+
 
 class RedisCacheService(CacheService):
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
         self.enabled = settings.cache_enabled
         self.ttl = settings.cache_ttl
+        self.serializer: EntrySerializer = SERIALIZERS[settings.cache_serializer]()
+        self.compressor = Compressor(
+            settings.cache_compression, threshold=settings.cache_compression_threshold
+        )
+        self._cache: Cache | None = None
+        self._memory: MemoryCacheService | None = None
+        self._fallback: MemoryCacheService | None = None
+        self._probe: asyncio.Task[None] | None = None
+        self.breaker = CircuitBreaker(
+            "redis-cache",
+            failure_threshold=settings.cache_breaker_failure_threshold,
+            slow_call_threshold=settings.cache_breaker_slow_call_threshold,
+        )
 
         if not self.enabled:
             logger.info("Cache disabled")
-            self._cache: Cache | None = None
             return
 
         if settings.redis_enabled:
@@ -31,99 +54,159 @@ class RedisCacheService(CacheService):
                     Cache.REDIS,
                     endpoint=parsed.hostname or "localhost",
                     port=parsed.port or 6379,
-                    serializer=JsonSerializer(),
+                    # Entries are encoded to bytes by self.serializer before reaching aiocache
+                    serializer=NullSerializer(encoding=None),
                     namespace="twitter_api",
                 )
+                if settings.cache_breaker_fallback == "memory":
+                    self._fallback = self._create_memory_backend()
                 logger.info("Cache initialized with Redis backend")
             except Exception as e:
                 logger.warning(f"Redis connection failed: {e}, falling back to memory cache")
-                self._cache = Cache(Cache.MEMORY, serializer=JsonSerializer())
-                logger.info("Cache initialized with memory backend")
+                self._init_memory_backend()
         else:
-            self._cache = Cache(Cache.MEMORY, serializer=JsonSerializer())
-            logger.info("Cache initialized with memory backend")
-
-    async def get(self, key: str) -> list[Tweet] | None:
+            self._init_memory_backend()
+
+    def _create_memory_backend(self) -> MemoryCacheService:
+        return MemoryCacheService(
+            max_bytes=self.settings.cache_memory_max_bytes,
+            policy=self.settings.cache_memory_policy,
+        )
+
+    def _init_memory_backend(self) -> None:
+        self._memory = self._create_memory_backend()
+        logger.info(
+            f"Cache initialized with memory backend "
+            f"(max_bytes={self.settings.cache_memory_max_bytes}, policy={self.settings.cache_memory_policy})"
+        )
+
+    async def get(self, key: str) -> CacheEntry | None:
+        if self._memory is not None:
+            return await self._memory.get(key)
         if not self.enabled or not self._cache:
             return None
+        if not self.breaker.allow():
+            return await self._fallback.get(key) if self._fallback is not None else None
 
         try:
-            cached_data = await self._cache.get(key)
+            cached_data = await self._call(self._cache.get, key)
             if cached_data:
                 logger.debug(f"Cache hit: {key}")
-                return self._deserialize_tweets(cached_data)
+                return decode_entry(self.compressor.decompress(cached_data), self.ttl)
             logger.debug(f"Cache miss: {key}")
             return None
         except Exception as e:
             logger.error(f"Cache get error for key '{key}': {e}")
             return None
 
-    async def set(self, key: str, value: list[Tweet], ttl: int) -> None:
+    async def set(self, key: str, value: CacheEntry, ttl: int) -> None:
+        if self._memory is not None:
+            return await self._memory.set(key, value, ttl)
         if not self.enabled or not self._cache:
             return
+        if not self.breaker.allow():
+            if self._fallback is not None:
+                await self._fallback.set(key, value, ttl)
+            return
 
         try:
-            serialized = self._serialize_tweets(value)
-            await self._cache.set(key, serialized, ttl=ttl)
-            logger.debug(f"Cache set: {key} (ttl={ttl}s, items={len(value)})")
+            serialized = self.compressor.compress(self.serializer.dumps(value))
+            await self._call(self._cache.set, key, serialized, ttl=ttl)
+            logger.debug(f"Cache set: {key} (ttl={ttl}s, items={len(value.tweets)}, bytes={len(serialized)})")
         except Exception as e:
             logger.error(f"Cache set error for key '{key}': {e}")
             raise CacheError(f"Failed to set cache: {e}") from e
 
+    async def set_many(self, items: list[tuple[str, CacheEntry, int]]) -> None:
+        if self._memory is not None:
+            return await self._memory.set_many(items)
+        if not self.enabled or not self._cache:
+            return
+        if not self.breaker.allow():
+            if self._fallback is not None:
+                await self._fallback.set_many(items)
+            return
+
+        by_ttl: dict[int, list[tuple[str, bytes]]] = {}
+        for key, value, ttl in items:
+            by_ttl.setdefault(ttl, []).append(
+                (key, self.compressor.compress(self.serializer.dumps(value)))
+            )
+
+        try:
+            # aiocache pipelines MSET plus one EXPIRE per key for each TTL group
+            for ttl, pairs in by_ttl.items():
+                await self._call(self._cache.multi_set, pairs, ttl=ttl)
+            logger.debug(f"Cache set_many: {len(items)} entries in {len(by_ttl)} batches")
+        except Exception as e:
+            logger.error(f"Cache set_many error for {len(items)} entries: {e}")
+            raise CacheError(f"Failed to set cache: {e}") from e
+
+    async def snapshot(self) -> list[tuple[str, CacheEntry, float]]:
+        if self._memory is not None:
+            return await self._memory.snapshot()
+        return []
+
     async def delete(self, key: str) -> None:
+        if self._memory is not None:
+            return await self._memory.delete(key)
         if not self.enabled or not self._cache:
             return
+        if self._fallback is not None:
+            await self._fallback.delete(key)
+        if not self.breaker.allow():
+            return
 
         try:
-            await self._cache.delete(key)
+            await self._call(self._cache.delete, key)
             logger.debug(f"Cache deleted: {key}")
         except Exception as e:
             logger.error(f"Cache delete error for key '{key}': {e}")
 
-    def _serialize_tweets(self, tweets: list[Tweet]) -> list[dict[str, Any]]:
-        return [
-            {
-                "account": {
-                    "fullname": tweet.account.fullname,
-                    "href": tweet.account.href,
-                    "id": tweet.account.id,
-                },
-                "date": tweet.date,
-                "hashtags": tweet.hashtags,
-                "likes": tweet.likes,
-                "replies": tweet.replies,
-                "retweets": tweet.retweets,
-                "text": tweet.text,
-            }
-            for tweet in tweets
-        ]
-
-    def _deserialize_tweets(self, data: list[dict[str, Any]]) -> list[Tweet]:
-        tweets = []
-        for item in data:
+    async def _call(self, operation: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Run a Redis operation within the latency budget, feeding the circuit breaker"""
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                operation(*args, **kwargs), timeout=self.settings.cache_op_timeout
+            )
+        except Exception:
+            if self.breaker.record_failure():
+                self._start_probe()
+            raise
+        if self.breaker.record_success(time.perf_counter() - start):
+            self._start_probe()
+        return result
+
+    def _start_probe(self) -> None:
+        if self._probe is None or self._probe.done():
+            self._probe = asyncio.create_task(self._probe_until_recovered())
+
+    async def _probe_until_recovered(self) -> None:
+        while self.breaker.is_open and self._cache:
+            await asyncio.sleep(self.settings.cache_breaker_reset_timeout)
+            start = time.perf_counter()
             try:
-                account_data = item["account"]
-                account = Account(
-                    fullname=account_data["fullname"],
-                    href=account_data["href"],
-                    id=account_data["id"],
+                await asyncio.wait_for(
+                    self._cache.exists(PROBE_KEY), timeout=self.settings.cache_op_timeout
                 )
-                tweet = Tweet(
-                    account=account,
-                    date=item["date"],
-                    hashtags=item["hashtags"],
-                    likes=item["likes"],
-                    replies=item["replies"],
-                    retweets=item["retweets"],
-                    text=item["text"],
-                )
-                tweets.append(tweet)
-            except (KeyError, ValueError) as e:
-                logger.warning(f"Tweet deserialization error: {e}")
+            except Exception as e:
+                logger.debug(f"Cache probe failed: {e}")
                 continue
-        return tweets
+            if time.perf_counter() - start <= self.breaker.slow_call_threshold:
+                self.breaker.close()
+                if self._fallback is not None:
+                    # Entries written while Redis was unreachable may now be outdated
+                    self._fallback = self._create_memory_backend()
 
     async def close(self) -> None:
+        if self._probe:
+            self._probe.cancel()
+            await asyncio.gather(self._probe, return_exceptions=True)
+        if self.breaker.trips:
+            logger.info(f"Cache circuit breaker stats: {self.breaker.stats}")
+        if self.compressor.compressed:
+            logger.info(f"Cache compression stats: {self.compressor.stats}")
         if self._cache:
             await self._cache.close()
             logger.info("Cache closed")
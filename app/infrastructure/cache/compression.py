@@ -0,0 +1,85 @@
+import time
+import zlib
+from types import ModuleType
+
+from app.core.exceptions import CacheError
+from app.utils.logger import get_logger
+
+lz4_frame: ModuleType | None
+try:
+    import lz4.frame
+
+    lz4_frame = lz4.frame
+except ImportError:
+    lz4_frame = None
+
+logger = get_logger(__name__)
+
+# Header byte of compressed values. Uncompressed payloads start with a serializer
+# format byte ("{", "[" or a binary format version), so legacy entries are read as-is.
+ZLIB_HEADER = 0xC1
+LZ4_HEADER = 0xC2
+
+
+class Compressor:
+    """Compresses cache values above a size threshold and tracks ratio and CPU cost"""
+
+    def __init__(self, codec: str = "none", threshold: int = 1024, level: int = 6) -> None:
+        if codec == "lz4" and lz4_frame is None:
+            logger.warning("lz4 is not installed, falling back to zlib compression")
+            codec = "zlib"
+        self.codec = codec
+        self.threshold = threshold
+        self.level = level
+
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_seconds = 0.0
+        self.decompress_seconds = 0.0
+
+    def compress(self, payload: bytes) -> bytes:
+        if self.codec == "none" or len(payload) < self.threshold:
+            return payload
+
+        start = time.perf_counter()
+        if self.codec == "lz4" and lz4_frame is not None:
+            data = bytes([LZ4_HEADER]) + lz4_frame.compress(payload)
+        else:
+            data = bytes([ZLIB_HEADER]) + zlib.compress(payload, self.level)
+        self.compress_seconds += time.perf_counter() - start
+
+        self.compressed += 1
+        self.bytes_in += len(payload)
+        self.bytes_out += len(data)
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        header = data[:1]
+        if header not in (bytes([ZLIB_HEADER]), bytes([LZ4_HEADER])):
+            return data
+
+        start = time.perf_counter()
+        try:
+            if header[0] == ZLIB_HEADER:
+                payload = zlib.decompress(data[1:])
+            elif lz4_frame is not None:
+                payload = lz4_frame.decompress(data[1:])
+            else:
+                raise CacheError("Cache value is lz4-compressed but lz4 is not installed")
+        except (zlib.error, RuntimeError) as e:
+            raise CacheError(f"Failed to decompress cache value: {e}") from e
+        finally:
+            self.decompress_seconds += time.perf_counter() - start
+        return payload
+
+    @property
+    def stats(self) -> dict[str, float]:
+        return {
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_in / self.bytes_out, 2) if self.bytes_out else 0.0,
+            "compress_ms": round(self.compress_seconds * 1000, 2),
+            "decompress_ms": round(self.decompress_seconds * 1000, 2),
+        }
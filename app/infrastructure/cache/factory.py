@@ -0,0 +1,28 @@
+from app.bootstrap.config import Settings
+from app.core.interfaces import CacheService
+from app.infrastructure.cache.cache_service import RedisCacheService
+from app.infrastructure.cache.redis_client import create_redis_client
+from app.infrastructure.cache.tiered import TieredCacheService
+from app.infrastructure.cache.write_behind import WriteBehindCacheService
+
+
+def create_cache_service(settings: Settings) -> CacheService:
+    cache_service: CacheService = RedisCacheService(settings)
+
+    if settings.cache_enabled and settings.redis_enabled and settings.cache_l1_enabled:
+        cache_service = TieredCacheService(
+            cache_service,
+            create_redis_client(settings),
+            max_entries=settings.cache_l1_max_entries,
+            ttl=settings.cache_l1_ttl,
+        )
+
+    if settings.cache_enabled and settings.cache_write_behind_enabled:
+        cache_service = WriteBehindCacheService(
+            cache_service,
+            max_pending=settings.cache_write_behind_max_pending,
+            batch_size=settings.cache_write_behind_batch_size,
+            flush_interval=settings.cache_write_behind_flush_interval,
+        )
+
+    return cache_service
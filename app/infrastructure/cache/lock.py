@@ -0,0 +1,53 @@
+import uuid
+
+from redis.asyncio import Redis
+
+from app.core.exceptions import CacheError
+from app.core.interfaces import DistributedLock
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RedisLock(DistributedLock):
+    """Short-lived Redis lease (SET NX PX) used to elect a single recompute worker"""
+
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then"
+        " return redis.call('del', KEYS[1])"
+        " else"
+        " return 0"
+        " end"
+    )
+
+    def __init__(self, client: Redis, namespace: str = "twitter_api") -> None:
+        self._client = client
+        self._namespace = namespace
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self._namespace}:lock:{key}"
+
+    async def acquire(self, key: str, ttl: int) -> str | None:
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self._client.set(self._lock_key(key), token, nx=True, px=ttl * 1000)
+        except Exception as e:
+            logger.error(f"Lock acquire error for key '{key}': {e}")
+            raise CacheError(f"Failed to acquire lock: {e}") from e
+
+        if acquired:
+            logger.debug(f"Lock acquired: {key} (ttl={ttl}s)")
+            return token
+        return None
+
+    async def release(self, key: str, token: str) -> None:
+        try:
+            await self._client.eval(self.RELEASE_SCRIPT, 1, self._lock_key(key), token)  # type: ignore[misc]
+            logger.debug(f"Lock released: {key}")
+        except Exception as e:
+            # The lease expires on its own; a failed release only delays other workers
+            logger.error(f"Lock release error for key '{key}': {e}")
+
+    async def close(self) -> None:
+        await self._client.aclose()
+        logger.info("Lock client closed")
@@ -0,0 +1,202 @@
+import sys
+import time
+from collections import OrderedDict
+from itertools import islice
+
+from app.core.entities import CacheEntry, Tweet
+from app.core.interfaces import CacheService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Approximate fixed cost of a Tweet/Account pair (instances, dicts, ints, list) on CPython
+_TWEET_OVERHEAD = 600
+_ENTRY_OVERHEAD = 300
+
+
+def estimate_entry_size(key: str, entry: CacheEntry) -> int:
+    return (
+        _ENTRY_OVERHEAD
+        + sys.getsizeof(key)
+        + sum(_estimate_tweet_size(tweet) for tweet in entry.tweets)
+    )
+
+
+def _estimate_tweet_size(tweet: Tweet) -> int:
+    return (
+        _TWEET_OVERHEAD
+        + sys.getsizeof(tweet.id)
+        + sys.getsizeof(tweet.text)
+        + sys.getsizeof(tweet.date)
+        + sys.getsizeof(tweet.account.fullname)
+        + sys.getsizeof(tweet.account.href)
+        + sum(sys.getsizeof(tag) for tag in tweet.hashtags)
+    )
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of key access frequencies with 4-bit saturating counters.
+    Counters are halved every `sample_size` increments so that old popularity decays (TinyLFU)
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int, sample_size: int) -> None:
+        self.width = max(64, width)
+        self.sample_size = max(1, sample_size)
+        self._rows = [bytearray(self.width) for _ in range(self.DEPTH)]
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        # One independently seeded hash per row, so no row collapses onto a single counter
+        return [hash((i, key)) % self.width for i in range(self.DEPTH)]
+
+    def increment(self, key: str) -> None:
+        for row, index in zip(self._rows, self._indexes(key), strict=True):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key), strict=True))
+
+    def _reset(self) -> None:
+        for row in self._rows:
+            for i in range(self.width):
+                row[i] >>= 1
+        self._additions //= 2
+
+
+class MemoryCacheService(CacheService):
+    """
+    In-process cache bounded by an approximate byte budget.
+    Entries are kept in LRU order; with the "tinylfu" policy a new key is only
+    admitted when it is accessed more often than the entries it would evict.
+    Expired entries are dropped lazily on read and by a small sweep on every write.
+    """
+
+    SWEEP_BATCH = 8
+
+    def __init__(self, max_bytes: int, policy: str = "lru") -> None:
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._data: OrderedDict[str, tuple[CacheEntry, float, int]] = OrderedDict()
+        self._size = 0
+        self._sketch: FrequencySketch | None = None
+        if policy == "tinylfu":
+            # Sized for roughly one counter per ~1KB of budget, reset every 10 widths
+            width = max_bytes // 1024
+            self._sketch = FrequencySketch(width=width, sample_size=10 * width)
+        self.evictions = 0
+        self.rejections = 0
+        self.expirations = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        if self._sketch:
+            self._sketch.increment(key)
+
+        item = self._data.get(key)
+        if item is None:
+            logger.debug(f"Cache miss: {key}")
+            return None
+
+        entry, expires_at, _ = item
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            logger.debug(f"Cache miss: {key}")
+            return None
+
+        self._data.move_to_end(key)
+        logger.debug(f"Cache hit: {key}")
+        return entry
+
+    async def set(self, key: str, value: CacheEntry, ttl: int) -> None:
+        self._sweep_expired()
+
+        size = estimate_entry_size(key, value)
+        if size > self.max_bytes:
+            logger.warning(f"Cache entry too large to store: {key} ({size} bytes)")
+            return
+
+        if key in self._data:
+            self._remove(key)
+        elif self._sketch:
+            self._sketch.increment(key)
+            if not self._admit(self._sketch, key, size):
+                self.rejections += 1
+                logger.debug(f"Cache admission rejected: {key}")
+                return
+
+        self._evict_until_fits(size)
+        self._data[key] = (value, time.monotonic() + ttl, size)
+        self._size += size
+        logger.debug(f"Cache set: {key} (ttl={ttl}s, items={len(value.tweets)}, bytes={size})")
+
+    async def delete(self, key: str) -> None:
+        if key in self._data:
+            self._remove(key)
+            logger.debug(f"Cache deleted: {key}")
+
+    async def snapshot(self) -> list[tuple[str, CacheEntry, float]]:
+        now = time.monotonic()
+        return [
+            (key, entry, expires_at - now)
+            for key, (entry, expires_at, _) in self._data.items()
+            if expires_at > now
+        ]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "bytes": self._size,
+            "evictions": self.evictions,
+            "rejections": self.rejections,
+            "expirations": self.expirations,
+        }
+
+    def _admit(self, sketch: FrequencySketch, key: str, size: int) -> bool:
+        candidate_frequency = sketch.estimate(key)
+        freed = self.max_bytes - self._size
+        for victim in self._data:
+            if freed >= size:
+                break
+            if sketch.estimate(victim) >= candidate_frequency:
+                return False
+            freed += self._data[victim][2]
+        return True
+
+    def _evict_until_fits(self, size: int) -> None:
+        while self._data and self._size + size > self.max_bytes:
+            key, (_, _, victim_size) = self._data.popitem(last=False)
+            self._size -= victim_size
+            self.evictions += 1
+            logger.debug(f"Cache evicted: {key}")
+
+    def _sweep_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (_, expires_at, _) in islice(self._data.items(), self.SWEEP_BATCH)
+            if expires_at <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._size -= size
@@ -0,0 +1,12 @@
+"""Redis client utilities"""
+from redis.asyncio import Redis
+
+from app.bootstrap.config import Settings
+
+
+def create_redis_client(settings: Settings) -> Redis:
+    return Redis.from_url(
+        settings.redis_url,
+        socket_connect_timeout=5.0,
+        socket_timeout=5.0,
+    )
@@ -0,0 +1,271 @@
+import json
+import struct
+from abc import ABC, abstractmethod
+from typing import Any
+
+from app.core.entities import Account, CacheEntry, Tweet
+from app.core.exceptions import CacheError
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# First byte of every binary payload. JSON payloads always start with "{" or "[",
+# so the two formats can be told apart without any extra framing.
+BINARY_FORMAT_V1 = 0x01
+BINARY_FORMAT_V2 = 0x02  # adds the limit the entry was fetched with
+BINARY_FORMAT_V3 = 0x03  # adds the fetch cost
+BINARY_FORMAT_V4 = 0x04  # adds a flags byte
+BINARY_FORMAT_V5 = 0x05  # adds tweet IDs (same header as v4)
+
+FLAG_MISSING = 0x01
+
+_HEADERS = {
+    # version, fetched_at, ttl, [limit,] [fetch_cost,] [flags,] string count, blob byte length
+    BINARY_FORMAT_V1: struct.Struct("<BdIII"),
+    BINARY_FORMAT_V2: struct.Struct("<BdIIII"),
+    BINARY_FORMAT_V3: struct.Struct("<BdIIdII"),
+    BINARY_FORMAT_V4: struct.Struct("<BdIIdBII"),
+    BINARY_FORMAT_V5: struct.Struct("<BdIIdBII"),
+}
+_COUNT = struct.Struct("<I")
+_TWEET_FIELDS = 8  # fullname, href, date, text, likes, replies, retweets, hashtag count
+
+
+class EntrySerializer(ABC):
+    name: str
+
+    @abstractmethod
+    def dumps(self, entry: CacheEntry) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> CacheEntry:
+        pass
+
+
+class JsonEntrySerializer(EntrySerializer):
+    name = "json"
+
+    def __init__(self, default_ttl: int = 0) -> None:
+        self.default_ttl = default_ttl
+
+    def dumps(self, entry: CacheEntry) -> bytes:
+        payload = {
+            "fetched_at": entry.fetched_at,
+            "ttl": entry.ttl,
+            "limit": entry.limit,
+            "fetch_cost": entry.fetch_cost,
+            "missing": entry.missing,
+            "tweets": [
+                {
+                    "account": {
+                        "fullname": tweet.account.fullname,
+                        "href": tweet.account.href,
+                        "id": tweet.account.id,
+                    },
+                    "date": tweet.date,
+                    "hashtags": tweet.hashtags,
+                    "likes": tweet.likes,
+                    "replies": tweet.replies,
+                    "retweets": tweet.retweets,
+                    "text": tweet.text,
+                    "id": tweet.id,
+                }
+                for tweet in entry.tweets
+            ],
+        }
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> CacheEntry:
+        payload: dict[str, Any] | list[dict[str, Any]] = json.loads(data)
+        if isinstance(payload, list):
+            # Legacy payload written before entries carried metadata; treat it as already stale
+            return CacheEntry(tweets=self._load_tweets(payload), fetched_at=0.0, ttl=self.default_ttl)
+        return CacheEntry(
+            tweets=self._load_tweets(payload["tweets"]),
+            fetched_at=float(payload["fetched_at"]),
+            ttl=int(payload["ttl"]),
+            limit=int(payload.get("limit", 0)),
+            fetch_cost=float(payload.get("fetch_cost", 0.0)),
+            missing=bool(payload.get("missing", False)),
+        )
+
+    def _load_tweets(self, data: list[dict[str, Any]]) -> list[Tweet]:
+        tweets = []
+        for item in data:
+            try:
+                account_data = item["account"]
+                account = Account(
+                    fullname=account_data["fullname"],
+                    href=account_data["href"],
+                    id=account_data["id"],
+                )
+                tweet = Tweet(
+                    account=account,
+                    date=item["date"],
+                    hashtags=item["hashtags"],
+                    likes=item["likes"],
+                    replies=item["replies"],
+                    retweets=item["retweets"],
+                    text=item["text"],
+                    id=item.get("id", ""),
+                )
+                tweets.append(tweet)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Tweet deserialization error: {e}")
+                continue
+        return tweets
+
+
+class BinaryEntrySerializer(EntrySerializer):
+    """
+    Struct-packed layout with a string table, so repeated account names, hrefs
+    and hashtags are stored once per entry:
+
+        header       version, fetched_at, ttl, limit, fetch_cost, flags, string count,
+                     blob byte length
+        lengths      <uint32> character length of every table string
+        blob         all table strings concatenated, UTF-8
+        account ids  <uint32 count> + <uint64> per tweet
+        tweet ids    <uint64> per tweet, 0 when unknown
+        fields       <uint32> table indexes and counters per tweet, followed
+                     by the table indexes of that tweet's hashtags
+    """
+
+    name = "binary"
+
+    def dumps(self, entry: CacheEntry) -> bytes:
+        table: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            index = table.get(value)
+            if index is None:
+                index = table[value] = len(table)
+            return index
+
+        account_ids = []
+        tweet_ids = []
+        fields: list[int] = []
+        for tweet in entry.tweets:
+            account_ids.append(tweet.account.id)
+            tweet_ids.append(int(tweet.id) if tweet.id else 0)
+            fields += (
+                intern(tweet.account.fullname),
+                intern(tweet.account.href),
+                intern(tweet.date),
+                intern(tweet.text),
+                tweet.likes,
+                tweet.replies,
+                tweet.retweets,
+                len(tweet.hashtags),
+            )
+            fields += [intern(tag) for tag in tweet.hashtags]
+
+        strings = list(table)
+        blob = "".join(strings).encode()
+        count = len(account_ids)
+        return b"".join(
+            (
+                _HEADERS[BINARY_FORMAT_V5].pack(
+                    BINARY_FORMAT_V5,
+                    entry.fetched_at,
+                    entry.ttl,
+                    entry.limit,
+                    entry.fetch_cost,
+                    FLAG_MISSING if entry.missing else 0,
+                    len(strings),
+                    len(blob),
+                ),
+                struct.pack(f"<{len(strings)}I", *map(len, strings)),
+                blob,
+                _COUNT.pack(count),
+                struct.pack(f"<{count}Q", *account_ids),
+                struct.pack(f"<{count}Q", *tweet_ids),
+                struct.pack(f"<{len(fields)}I", *fields),
+            )
+        )
+
+    def loads(self, data: bytes) -> CacheEntry:
+        try:
+            header = _HEADERS.get(data[0])
+            if header is None:
+                raise CacheError(f"Unsupported binary cache format version: {data[0]}")
+
+            limit = 0
+            fetch_cost = 0.0
+            flags = 0
+            if data[0] == BINARY_FORMAT_V1:
+                _, fetched_at, ttl, string_count, blob_length = header.unpack_from(data)
+            elif data[0] == BINARY_FORMAT_V2:
+                _, fetched_at, ttl, limit, string_count, blob_length = header.unpack_from(data)
+            elif data[0] == BINARY_FORMAT_V3:
+                _, fetched_at, ttl, limit, fetch_cost, string_count, blob_length = header.unpack_from(data)
+            else:
+                (
+                    _, fetched_at, ttl, limit, fetch_cost, flags, string_count, blob_length
+                ) = header.unpack_from(data)
+
+            offset = header.size
+            lengths = struct.unpack_from(f"<{string_count}I", data, offset)
+            offset += 4 * string_count
+            text = data[offset : offset + blob_length].decode()
+            offset += blob_length
+
+            strings = []
+            position = 0
+            for length in lengths:
+                strings.append(text[position : position + length])
+                position += length
+
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            account_ids = struct.unpack_from(f"<{count}Q", data, offset)
+            offset += 8 * count
+            tweet_ids: tuple[int, ...] = (0,) * count
+            if data[0] >= BINARY_FORMAT_V5:
+                tweet_ids = struct.unpack_from(f"<{count}Q", data, offset)
+                offset += 8 * count
+            fields = struct.unpack_from(f"<{(len(data) - offset) // 4}I", data, offset)
+        except (struct.error, UnicodeDecodeError, IndexError) as e:
+            raise CacheError(f"Corrupt binary cache payload: {e}") from e
+
+        tweets = []
+        i = 0
+        for account_id, tweet_id in zip(account_ids, tweet_ids, strict=True):
+            fullname, href, date, body, likes, replies, retweets, tag_count = fields[i : i + _TWEET_FIELDS]
+            i += _TWEET_FIELDS
+            tweets.append(
+                Tweet(
+                    account=Account(fullname=strings[fullname], href=strings[href], id=account_id),
+                    date=strings[date],
+                    hashtags=[strings[tag] for tag in fields[i : i + tag_count]],
+                    likes=likes,
+                    replies=replies,
+                    retweets=retweets,
+                    text=strings[body],
+                    id=str(tweet_id) if tweet_id else "",
+                )
+            )
+            i += tag_count
+
+        return CacheEntry(
+            tweets=tweets,
+            fetched_at=fetched_at,
+            ttl=ttl,
+            limit=limit,
+            fetch_cost=fetch_cost,
+            missing=bool(flags & FLAG_MISSING),
+        )
+
+
+SERIALIZERS: dict[str, type[EntrySerializer]] = {
+    JsonEntrySerializer.name: JsonEntrySerializer,
+    BinaryEntrySerializer.name: BinaryEntrySerializer,
+}
+
+
+def decode_entry(data: bytes, default_ttl: int = 0) -> CacheEntry:
+    """Decode a payload written by any known serializer, regardless of the configured one"""
+    if data[:1] and data[0] in _HEADERS:
+        return BinaryEntrySerializer().loads(data)
+    return JsonEntrySerializer(default_ttl).loads(data)
@@ -0,0 +1,91 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+
+from app.core.entities import CacheEntry
+from app.core.exceptions import CacheError
+from app.core.interfaces import CacheService
+from app.infrastructure.cache.serializers import BinaryEntrySerializer, decode_entry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteCacheSnapshot:
+    """
+    On-disk snapshot of an in-process cache, written at shutdown and reloaded at startup.
+    Expiry is stored as wall-clock time, so time spent down counts against each entry's TTL
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.serializer = BinaryEntrySerializer()
+
+    async def save(self, cache_service: CacheService) -> int:
+        items = await cache_service.snapshot()
+        now = time.time()
+        rows = [
+            (key, self.serializer.dumps(entry), now + remaining)
+            for key, entry, remaining in items
+        ]
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Cache snapshot save failed ({self.path}): {e}")
+            return 0
+        logger.info(f"Cache snapshot saved: {len(rows)} entries to {self.path}")
+        return len(rows)
+
+    async def restore(self, cache_service: CacheService) -> int:
+        if not self.path.exists():
+            return 0
+
+        try:
+            rows = await asyncio.to_thread(self._read)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Cache snapshot load failed ({self.path}): {e}")
+            return 0
+
+        now = time.time()
+        items: list[tuple[str, CacheEntry, int]] = []
+        for key, value, expires_at in rows:
+            remaining = int(expires_at - now)
+            if remaining <= 0:
+                continue
+            try:
+                items.append((key, decode_entry(value), remaining))
+            except CacheError as e:
+                logger.warning(f"Skipping unreadable snapshot entry '{key}': {e}")
+
+        await cache_service.set_many(items)
+        # The backend may still reject entries, e.g. ones larger than its byte budget
+        restored = {key for key, _, _ in items}
+        stored = sum(1 for key, _, _ in await cache_service.snapshot() if key in restored)
+        logger.info(f"Cache snapshot restored: {stored} of {len(rows)} entries from {self.path}")
+        return stored
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        return connection
+
+    def _write(self, rows: list[tuple[str, bytes, float]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM entries")
+                connection.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+        finally:
+            connection.close()
+
+    def _read(self) -> list[tuple[str, bytes, float]]:
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT key, value, expires_at FROM entries").fetchall()
+        finally:
+            connection.close()
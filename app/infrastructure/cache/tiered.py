@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+
+from redis.asyncio import Redis
+
+from app.core.entities import CacheEntry
+from app.core.interfaces import CacheService
+from app.infrastructure.cache.lru import LRUCache
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TieredCacheService(CacheService):
+    """
+    Read-through/write-through in-process L1 in front of a shared L2 backend.
+    Writes and deletes are broadcast over Redis pub/sub so other workers evict their L1 copy
+    """
+
+    CHANNEL = "twitter_api:invalidate"
+
+    def __init__(
+        self,
+        l2: CacheService,
+        redis_client: Redis,
+        max_entries: int,
+        ttl: int,
+    ) -> None:
+        self.l2 = l2
+        self.l1: LRUCache[CacheEntry] = LRUCache(max_entries, ttl)
+        self._redis = redis_client
+        self._instance_id = uuid.uuid4().hex
+        self._subscriber: asyncio.Task[None] | None = None
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> CacheEntry | None:
+        self._ensure_subscribed()
+
+        entry = self.l1.get(key)
+        if entry is not None:
+            self.l1_hits += 1
+            logger.debug(f"L1 cache hit: {key}")
+            return entry
+
+        entry = await self.l2.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.l2_hits += 1
+        self.l1.set(key, entry)
+        return entry
+
+    async def set(self, key: str, value: CacheEntry, ttl: int) -> None:
+        self._ensure_subscribed()
+        await self.l2.set(key, value, ttl)
+        self.l1.set(key, value, ttl)
+        await self._publish_invalidation(key)
+
+    async def set_many(self, items: list[tuple[str, CacheEntry, int]]) -> None:
+        self._ensure_subscribed()
+        await self.l2.set_many(items)
+        for key, value, ttl in items:
+            self.l1.set(key, value, ttl)
+            await self._publish_invalidation(key)
+
+    async def delete(self, key: str) -> None:
+        self._ensure_subscribed()
+        self.l1.delete(key)
+        await self.l2.delete(key)
+        await self._publish_invalidation(key)
+
+    async def close(self) -> None:
+        if self._subscriber:
+            self._subscriber.cancel()
+            await asyncio.gather(self._subscriber, return_exceptions=True)
+        logger.info(f"Tiered cache stats: {self.stats}")
+        await self._redis.aclose()
+        await self.l2.close()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_size": len(self.l1),
+        }
+
+    def _ensure_subscribed(self) -> None:
+        if self._subscriber is None or self._subscriber.done():
+            self._subscriber = asyncio.create_task(self._listen())
+
+    async def _publish_invalidation(self, key: str) -> None:
+        try:
+            await self._redis.publish(self.CHANNEL, f"{self._instance_id}|{key}")
+        except Exception as e:
+            # Other workers' L1 copies still expire after the (short) L1 TTL
+            logger.error(f"Cache invalidation publish error for key '{key}': {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    # Invalidations may have been missed while disconnected
+                    self.l1.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation subscriber error: {e}, reconnecting")
+                self.l1.clear()
+                await asyncio.sleep(1.0)
+
+    def _handle_invalidation(self, data: bytes | str) -> None:
+        message = data.decode() if isinstance(data, bytes) else data
+        instance_id, _, key = message.partition("|")
+        if instance_id != self._instance_id:
+            self.l1.delete(key)
+            logger.debug(f"L1 cache invalidated: {key}")
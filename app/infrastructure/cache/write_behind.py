@@ -0,0 +1,122 @@
+import asyncio
+from itertools import islice
+
+from app.core.entities import CacheEntry
+from app.core.interfaces import CacheService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WriteBehindCacheService(CacheService):
+    """
+    Makes cache population asynchronous: `set` only records the write and returns,
+    and a background worker flushes pending writes to the wrapped backend in batches.
+    Pending writes are keyed, so repeated writes to a key coalesce, and reads see
+    them until the backend has stored them.
+    When `max_pending` keys are waiting, new writes are dropped.
+    """
+
+    def __init__(
+        self,
+        backend: CacheService,
+        max_pending: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self.backend = backend
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: dict[str, tuple[CacheEntry, int]] = {}
+        self._wakeup = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._worker: asyncio.Task[None] | None = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    async def get(self, key: str) -> CacheEntry | None:
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending[0]
+        return await self.backend.get(key)
+
+    async def set(self, key: str, value: CacheEntry, ttl: int) -> None:
+        if key not in self._pending and len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f"Write-behind queue full, dropping cache write: {key}")
+            return
+
+        self._pending[key] = (value, ttl)
+        self._ensure_worker()
+        self._wakeup.set()
+
+    async def set_many(self, items: list[tuple[str, CacheEntry, int]]) -> None:
+        # Bulk loads (e.g. snapshot restores) are not on a request path: write them
+        # straight through rather than overflowing the pending queue
+        for key, _, _ in items:
+            self._pending.pop(key, None)
+        await self.backend.set_many(items)
+        self.written += len(items)
+
+    async def delete(self, key: str) -> None:
+        self._pending.pop(key, None)
+        await self.backend.delete(key)
+
+    async def snapshot(self) -> list[tuple[str, CacheEntry, float]]:
+        await self.flush()
+        return await self.backend.snapshot()
+
+    async def flush(self) -> None:
+        while self._pending:
+            await self._write_batch()
+
+    async def close(self) -> None:
+        if self._worker:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+        await self.flush()
+        logger.info(f"Write-behind stats: {self.stats}")
+        await self.backend.close()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Give concurrent requests a moment to add to the batch
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            while self._pending:
+                await self._write_batch()
+
+    async def _write_batch(self) -> None:
+        # Entries stay readable in `_pending` while the write is in flight, and only the
+        # entries actually written are removed: a newer `set` may have replaced one.
+        # The worker and `flush` take turns so they never write the same entries twice.
+        async with self._write_lock:
+            batch = list(islice(self._pending.items(), self.batch_size))
+            if not batch:
+                return
+            try:
+                await self.backend.set_many([(key, entry, ttl) for key, (entry, ttl) in batch])
+                self.written += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"Write-behind flush of {len(batch)} entries failed: {e}")
+            finally:
+                for key, pending in batch:
+                    if self._pending.get(key) is pending:
+                        del self._pending[key]
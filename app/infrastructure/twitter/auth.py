@@ -13,8 +13,8 @@ class TwitterAuthenticator:
                 "Twitter Bearer Token is not configured"
             )
 
-    def get_headers(self) -> dict[str, str]:
+    def get_headers(self, token: str | None = None) -> dict[str, str]:
         return {
-            "Authorization": f"Bearer {self.settings.twitter_bearer_token}",
+            "Authorization": f"Bearer {token or self.settings.twitter_bearer_token}",
             "Content-Type": "application/json"
         }
@@ -1,3 +1,5 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import suppress
 from typing import Any
 
@@ -13,87 +15,339 @@ from app.core.exceptions import (
     TwitterServiceUnavailableError,
 )
 from app.core.interfaces import TweetRepository
+from app.core.scheduling import Priority, current_priority
 from app.infrastructure.twitter.auth import TwitterAuthenticator
 from app.infrastructure.twitter.mapper import map_tweet
 from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.infrastructure.twitter.scheduler import UpstreamScheduler
+from app.infrastructure.twitter.token_pool import BearerToken, TokenPool
+from app.infrastructure.twitter.user_ids import UserIdCache
+from app.utils.batching import MicroBatcher
 from app.utils.decorators import measure_time, retry_on_exception
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Maximum usernames per /users/by request
+MAX_USERS_PER_LOOKUP = 100
+# Recent search limits: query length in characters and max_results per request
+MAX_SEARCH_QUERY_LENGTH = 512
+MAX_SEARCH_RESULTS = 100
+
+# Smallest max_results accepted by the search and timeline endpoints
+MIN_PAGE_RESULTS = 10
+
+# (hashtag, limit) pair submitted to the search batcher
+HashtagSearch = tuple[str, int]
+# Fetches one raw page given max_results and the pagination token of the previous page
+PageFetcher = Callable[[int, str | None], Awaitable[dict[str, Any]]]
+
 
 class TwitterClient(TweetRepository):
     def __init__(
         self,
         settings: Settings,
         http_client: httpx.AsyncClient,
-        rate_limiter: RateLimiter | None = None
+        rate_limiter: RateLimiter | None = None,
+        user_ids: UserIdCache | None = None,
+        user_batcher: MicroBatcher[str, str] | None = None,
+        search_batcher: MicroBatcher[HashtagSearch, list[Tweet]] | None = None,
+        scheduler: UpstreamScheduler | None = None,
+        tokens: TokenPool | None = None,
     ):
         self.settings = settings
         self.http_client = http_client
         self.authenticator = TwitterAuthenticator(settings)
         self.rate_limiter = rate_limiter or RateLimiter()
+        self.scheduler = scheduler or UpstreamScheduler(self.rate_limiter)
+        self.tokens = tokens or TokenPool(
+            settings.twitter_bearer_tokens_list,
+            self.rate_limiter,
+            ejection_period=settings.twitter_token_ejection_period,
+        )
+        self.user_ids = user_ids or UserIdCache(
+            max_entries=settings.twitter_user_id_cache_max_entries,
+            ttl=settings.twitter_user_id_cache_ttl,
+        )
+        self.user_batcher = user_batcher or MicroBatcher(
+            self.lookup_user_ids,
+            max_batch_size=MAX_USERS_PER_LOOKUP,
+            window=settings.twitter_user_batch_window,
+        )
+        self.search_batcher = search_batcher or MicroBatcher(
+            self.search_hashtags,
+            max_batch_size=MAX_SEARCH_RESULTS,
+            window=settings.twitter_search_batch_window,
+        )
         self.base_url = settings.twitter_api_base_url
 
+    @property
+    def max_limit(self) -> int:
+        return self.settings.max_tweet_limit
+
+    async def _acquire(self, key: str) -> BearerToken:
+        """Pick the token with the most quota left for `key` and wait for its turn"""
+        token = self.tokens.select(key)
+        await self.scheduler.acquire(token.limiter_key(key))
+        return token
+
+    def _batching_enabled(self, window: float) -> bool:
+        # A batch runs with the origin of the call that opened it, so only interactive
+        # calls are batched: they must never wait at a lower priority
+        return window > 0 and current_priority() is Priority.INTERACTIVE
+
     @measure_time
-    async def get_tweets_by_hashtag(self, hashtag: str, limit: int = 30) -> list[Tweet]:
+    async def get_tweets_by_hashtag(
+        self, hashtag: str, limit: int = 30, since_id: str | None = None
+    ) -> list[Tweet]:
         hashtag = hashtag.lstrip("#")
-        limit = min(limit, self.settings.twitter_max_results)
-        logger.info(f"Fetching tweets by hashtag: {hashtag}, limit: {limit}")
-
-        query = f"#{hashtag}"
-        tweets = await self._search_tweets(query, limit)
+        limit = min(limit, self.max_limit)
+        logger.info(f"Fetching tweets by hashtag: {hashtag}, limit: {limit}, since_id: {since_id}")
+
+        if since_id:
+            tweets = await self._search_tweets(f"#{hashtag}", limit, since_id)
+        elif self._batching_enabled(self.settings.twitter_search_batch_window):
+            # Concurrent searches for different hashtags share one OR query
+            tweets = await self.search_batcher.submit((hashtag, limit)) or []
+        else:
+            tweets = await self._search_tweets(f"#{hashtag}", limit)
 
         logger.info(f"Tweets fetched for hashtag '{hashtag}': {len(tweets)} tweets")
         return tweets
 
     @measure_time
-    async def get_tweets_by_user(self, username: str, limit: int = 30) -> list[Tweet]:
+    async def get_tweets_by_user(
+        self, username: str, limit: int = 30, since_id: str | None = None
+    ) -> list[Tweet]:
         username = username.lstrip("@")
-        limit = min(limit, self.settings.twitter_max_results)
-        logger.info(f"Fetching tweets by user: {username}, limit: {limit}")
+        limit = min(limit, self.max_limit)
+        logger.info(f"Fetching tweets by user: {username}, limit: {limit}, since_id: {since_id}")
 
-        user_id = await self._get_user_id(username)
-        tweets = await self._get_user_timeline(user_id, limit)
+        user_id = self.user_ids.get(username) or await self._resolve_user_id(username)
+        tweets = await self._get_user_timeline(user_id, limit, since_id)
 
         logger.info(f"Tweets fetched for user '{username}': {len(tweets)} tweets")
         return tweets
 
+    async def search_hashtags(self, searches: list[HashtagSearch]) -> dict[HashtagSearch, list[Tweet]]:
+        """Serve several hashtag searches with as few combined OR queries as the API limits allow"""
+        # casefolded hashtag -> (hashtag as requested, largest requested limit)
+        wanted: dict[str, tuple[str, int]] = {}
+        for hashtag, limit in searches:
+            key = hashtag.casefold()
+            wanted[key] = (hashtag, max(limit, wanted.get(key, (hashtag, 0))[1]))
+
+        buckets: dict[str, list[Tweet]] = {}
+        for group_buckets in await asyncio.gather(
+            *(self._search_hashtag_group(group) for group in self._group_hashtags(wanted))
+        ):
+            buckets.update(group_buckets)
+
+        return {(hashtag, limit): buckets[hashtag.casefold()][:limit] for hashtag, limit in searches}
+
+    def _group_hashtags(self, wanted: dict[str, tuple[str, int]]) -> list[dict[str, tuple[str, int]]]:
+        groups: list[dict[str, tuple[str, int]]] = []
+        group: dict[str, tuple[str, int]] = {}
+        query_length = total = 0
+        for key, (hashtag, limit) in wanted.items():
+            term_length = len(hashtag) + 1 + (len(" OR ") if group else 0)
+            if group and (
+                query_length + term_length > MAX_SEARCH_QUERY_LENGTH or total + limit > MAX_SEARCH_RESULTS
+            ):
+                groups.append(group)
+                group = {}
+                query_length = total = 0
+                term_length = len(hashtag) + 1
+            group[key] = (hashtag, limit)
+            query_length += term_length
+            total += limit
+        if group:
+            groups.append(group)
+        return groups
+
+    async def _search_hashtag_group(self, group: dict[str, tuple[str, int]]) -> dict[str, list[Tweet]]:
+        if len(group) == 1:
+            ((key, (hashtag, limit)),) = group.items()
+            return {key: await self._search_tweets(f"#{hashtag}", limit)}
+
+        # The search endpoint rejects max_results below MIN_PAGE_RESULTS
+        total = max(sum(limit for _, limit in group.values()), MIN_PAGE_RESULTS)
+        query = " OR ".join(f"#{hashtag}" for hashtag, _ in group.values())
+        tweets, truncated = await self._collect(
+            lambda max_results, next_token: self._search_page(query, max_results, next_token),
+            total,
+        )
+
+        # Demultiplex by the hashtags each tweet actually carries
+        buckets: dict[str, list[Tweet]] = {key: [] for key in group}
+        for tweet in tweets:
+            for tag in {tag.lstrip("#").casefold() for tag in tweet.hashtags}:
+                if tag in buckets:
+                    buckets[tag].append(tweet)
+
+        if truncated:
+            # The combined query was cut off, so a short bucket may have more tweets
+            # available; fetch those hashtags on their own
+            underfilled = [key for key, (_, limit) in group.items() if len(buckets[key]) < limit]
+            refills = await asyncio.gather(
+                *(self._search_tweets(f"#{group[key][0]}", group[key][1]) for key in underfilled)
+            )
+            buckets.update(zip(underfilled, refills, strict=True))
+            logger.info(f"Combined search '{query}' refilled {len(underfilled)} underfilled hashtags")
+
+        return buckets
+
+    async def _paginate(
+        self, fetch_page: PageFetcher, limit: int
+    ) -> AsyncIterator[tuple[list[Tweet], bool]]:
+        """
+        Yield mapped pages, each with whether Twitter has more results after it, until
+        `limit` tweets, the last page or the page cap is reached. The next page is
+        requested before the current one is mapped and consumed
+        """
+        per_page = self.settings.twitter_max_results
+        remaining = limit
+        pages = 1
+        pending: asyncio.Future[dict[str, Any]] | None = asyncio.ensure_future(
+            fetch_page(max(min(remaining, per_page), MIN_PAGE_RESULTS), None)
+        )
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                remaining -= len(data.get("data") or [])
+                next_token = (data.get("meta") or {}).get("next_token")
+                if next_token and remaining > 0 and pages < self.settings.twitter_max_pages:
+                    pages += 1
+                    page_size = max(min(remaining, per_page), MIN_PAGE_RESULTS)
+                    pending = asyncio.ensure_future(fetch_page(page_size, next_token))
+                yield self._parse_tweets_response(data), bool(next_token)
+        finally:
+            # The consumer may stop early; do not leave a prefetch running
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+
+    async def _collect(self, fetch_page: PageFetcher, limit: int) -> tuple[list[Tweet], bool]:
+        """Up to `limit` tweets, and whether more were available than were returned"""
+        tweets: list[Tweet] = []
+        has_more = False
+        async for page, page_has_more in self._paginate(fetch_page, limit):
+            tweets.extend(page)
+            has_more = page_has_more
+            if len(tweets) >= limit:
+                break
+        # Decided from the API's pagination, not the mapped count: tweets without an
+        # author are dropped by the mapper and must not make a result look complete
+        return tweets[:limit], has_more or len(tweets) > limit
+
+    async def _search_tweets(self, query: str, limit: int, since_id: str | None = None) -> list[Tweet]:
+        tweets, _ = await self._collect(
+            lambda max_results, next_token: self._search_page(query, max_results, next_token, since_id),
+            limit,
+        )
+        return tweets
+
     @retry_on_exception(
         max_retries=3,
         delay=1.0,
         backoff=2.0,
         exceptions=(httpx.HTTPError, TwitterServiceUnavailableError),
     )
-    async def _search_tweets(self, query: str, limit: int) -> list[Tweet]:
-        await self.rate_limiter.acquire("search_tweets")
+    async def _search_page(
+        self, query: str, max_results: int, next_token: str | None = None, since_id: str | None = None
+    ) -> dict[str, Any]:
+        token = await self._acquire("search_tweets")
 
         url = f"{self.base_url}/tweets/search/recent"
         params = {
             "query": query,
-            "max_results": limit,
+            "max_results": max_results,
             "tweet.fields": "created_at,public_metrics,entities,author_id",
             "expansions": "author_id",
             "user.fields": "id,name,username"
         }
+        if next_token:
+            params["next_token"] = next_token
+        if since_id:
+            params["since_id"] = since_id
 
         try:
             response = await self.http_client.get(
                 url,
                 params=params,  # type: ignore[arg-type]
-                headers=self.authenticator.get_headers(),
+                headers=self.authenticator.get_headers(token.value),
                 timeout=self.settings.twitter_request_timeout,
             )
 
+            self.tokens.record(token, "search_tweets", response.status_code, response.headers)
             self._handle_response_errors(response)
 
-            data = response.json()
-            return self._parse_tweets_response(data)
+            data: dict[str, Any] = response.json()
+            return data
 
         except httpx.HTTPError as e:
             logger.error(f"Twitter API HTTP error for query '{query}': {e}")
             raise TwitterServiceUnavailableError(f"Twitter API request failed: {e}") from e
 
+    async def _resolve_user_id(self, username: str) -> str:
+        if not self._batching_enabled(self.settings.twitter_user_batch_window):
+            return await self._get_user_id(username)
+
+        # Concurrent lookups are coalesced into one /users/by request
+        user_id = await self.user_batcher.submit(username.casefold())
+        if user_id is None:
+            raise TwitterResourceNotFoundError(f"User @{username} not found")
+        return user_id
+
+    async def lookup_user_ids(self, usernames: list[str]) -> dict[str, str]:
+        """Resolve casefolded usernames to IDs; unknown usernames are absent from the result"""
+        if len(usernames) == 1:
+            # A batch of one costs the same quota through the single-user endpoint
+            try:
+                return {usernames[0]: await self._get_user_id(usernames[0])}
+            except TwitterResourceNotFoundError:
+                return {}
+        return await self._get_user_ids(usernames)
+
+    @retry_on_exception(
+        max_retries=3,
+        delay=1.0,
+        backoff=2.0,
+        exceptions=(httpx.HTTPError, TwitterServiceUnavailableError),
+    )
+    async def _get_user_ids(self, usernames: list[str]) -> dict[str, str]:
+        token = await self._acquire("get_user")
+
+        url = f"{self.base_url}/users/by"
+
+        try:
+            response = await self.http_client.get(
+                url,
+                params={"usernames": ",".join(usernames), "user.fields": "id,name,username"},
+                headers=self.authenticator.get_headers(token.value),
+                timeout=self.settings.twitter_request_timeout,
+            )
+
+            self.tokens.record(token, "get_user", response.status_code, response.headers)
+            self._handle_response_errors(response)
+
+            # Unknown usernames are reported under "errors" and simply left out here
+            data = response.json()
+            resolved = {}
+            for user in data.get("data", []):
+                if user.get("username") and user.get("id"):
+                    user_id = str(user["id"])
+                    self.user_ids.set(user["username"], user_id)
+                    resolved[user["username"].casefold()] = user_id
+
+            logger.info(f"Resolved {len(resolved)} of {len(usernames)} usernames in one lookup")
+            return resolved
+
+        except httpx.HTTPError as e:
+            logger.error(f"Twitter API HTTP error for {len(usernames)} usernames: {e}")
+            raise TwitterServiceUnavailableError(f"Twitter API request failed: {e}") from e
+
     @retry_on_exception(
         max_retries=3,
         delay=1.0,
@@ -101,7 +355,7 @@ class TwitterClient(TweetRepository):
         exceptions=(httpx.HTTPError, TwitterServiceUnavailableError),
     )
     async def _get_user_id(self, username: str) -> str:
-        await self.rate_limiter.acquire("get_user")
+        token = await self._acquire("get_user")
 
         url = f"{self.base_url}/users/by/username/{username}"
 
@@ -109,10 +363,11 @@ class TwitterClient(TweetRepository):
             response = await self.http_client.get(
                 url,
                 params={"user.fields": "id,name,username"},
-                headers=self.authenticator.get_headers(),
+                headers=self.authenticator.get_headers(token.value),
                 timeout=self.settings.twitter_request_timeout,
             )
 
+            self.tokens.record(token, "get_user", response.status_code, response.headers)
             self._handle_response_errors(response)
 
             data = response.json()
@@ -121,41 +376,63 @@ class TwitterClient(TweetRepository):
             if not user_data or "id" not in user_data:
                 raise TwitterResourceNotFoundError(f"User @{username} not found")
 
-            return str(user_data["id"])
+            user_id = str(user_data["id"])
+            self.user_ids.set(username, user_id)
+            return user_id
 
         except httpx.HTTPError as e:
             logger.error(f"Twitter API HTTP error for username '{username}': {e}")
             raise TwitterServiceUnavailableError(f"Twitter API request failed: {e}") from e
 
+    async def _get_user_timeline(
+        self, user_id: str, limit: int, since_id: str | None = None
+    ) -> list[Tweet]:
+        tweets, _ = await self._collect(
+            lambda max_results, token: self._timeline_page(user_id, max_results, token, since_id),
+            limit,
+        )
+        return tweets
+
     @retry_on_exception(
         max_retries=3,
         delay=1.0,
         backoff=2.0,
         exceptions=(httpx.HTTPError, TwitterServiceUnavailableError),
     )
-    async def _get_user_timeline(self, user_id: str, limit: int) -> list[Tweet]:
-        await self.rate_limiter.acquire("user_timeline")
+    async def _timeline_page(
+        self,
+        user_id: str,
+        max_results: int,
+        pagination_token: str | None = None,
+        since_id: str | None = None,
+    ) -> dict[str, Any]:
+        token = await self._acquire("user_timeline")
 
         url = f"{self.base_url}/users/{user_id}/tweets"
         params = {
-            "max_results": limit,
+            "max_results": max_results,
             "tweet.fields": "created_at,author_id,public_metrics,entities",
             "expansions": "author_id",
             "user.fields": "id,name,username"
         }
+        if pagination_token:
+            params["pagination_token"] = pagination_token
+        if since_id:
+            params["since_id"] = since_id
 
         try:
             response = await self.http_client.get(
                 url,
                 params=params,  # type: ignore[arg-type]
-                headers=self.authenticator.get_headers(),
+                headers=self.authenticator.get_headers(token.value),
                 timeout=self.settings.twitter_request_timeout,
             )
 
+            self.tokens.record(token, "user_timeline", response.status_code, response.headers)
             self._handle_response_errors(response)
 
-            data = response.json()
-            return self._parse_tweets_response(data)
+            data: dict[str, Any] = response.json()
+            return data
 
         except httpx.HTTPError as e:
             logger.error(f"Twitter API HTTP error for user_id '{user_id}': {e}")
@@ -198,6 +475,8 @@ class TwitterClient(TweetRepository):
     def _parse_tweets_response(self, data: dict[str, Any]) -> list[Tweet]:
         tweets_data = data.get("data", [])
         includes = data.get("includes", {})
+        # Every expanded author is a free username -> ID resolution
+        self.user_ids.update_from_includes(includes)
 
         if not tweets_data:
             logger.warning("No tweets in response")
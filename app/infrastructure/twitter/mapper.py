@@ -32,7 +32,8 @@ def map_tweet(tweet_data: dict[str, Any], includes: dict[str, Any]) -> Tweet | N
             likes=metrics.get("like_count", 0),
             replies=metrics.get("reply_count", 0),
             retweets=metrics.get("retweet_count", 0),
-            text=tweet_data.get("text", "")
+            text=tweet_data.get("text", ""),
+            id=str(tweet_data.get("id", "")),
         )
 
     except (ValueError, KeyError, TypeError) as e:
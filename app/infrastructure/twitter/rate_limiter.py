@@ -1,58 +1,186 @@
 import asyncio
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from dataclasses import dataclass
 
 from app.core.exceptions import TwitterRateLimitError
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+RATE_LIMIT_HEADERS = ("x-rate-limit-limit", "x-rate-limit-remaining", "x-rate-limit-reset")
+
+
+@dataclass
+class UpstreamBudget:
+    """Quota reported by Twitter for one endpoint, valid until `reset_at` (epoch seconds)"""
+
+    limit: int
+    remaining: int
+    reset_at: float
+
 
 class RateLimiter:
+    """
+    Sliding-window limiter. Each key keeps a deque of the request times inside its
+    window, so an acquire only drops expired timestamps from the left and appends
+    one on the right. Keys have independent locks: one exhausted endpoint never
+    delays another. With `max_wait` > 0, callers over the limit queue (FIFO per key)
+    for the next free slot for up to that many seconds instead of failing at once.
+
+    Once Twitter has reported a key's quota through its x-rate-limit-* headers, that
+    budget replaces the static window until it resets: requests spend it down and,
+    when it is exhausted, wait exactly until the reported reset time.
+    """
+
     LIMITS = {
         "search_tweets": (12, 60),
         "get_user": (20, 60),
         "user_timeline": (100, 60),
     }
 
-    def __init__(self) -> None:
-        self._buckets: dict[str, list[float]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+    def __init__(self, max_wait: float = 0.0) -> None:
+        self.max_wait = max_wait
+        self._buckets: dict[str, deque[float]] = defaultdict(deque)
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._budgets: dict[str, UpstreamBudget] = {}
 
     def _get_limits(self, key: str) -> tuple[int, int]:
-        return self.LIMITS.get(key, (100, 60))
+        # Keys may be scoped to a bearer token as "<endpoint>:<token label>"
+        return self.LIMITS.get(key.partition(":")[0], (100, 60))
 
-    async def acquire(self, key: str = "default") -> None:
-        requests_per_window, window_seconds = self._get_limits(key)
+    def _prune(self, key: str, now: float) -> deque[float]:
+        _, window_seconds = self._get_limits(key)
+        bucket = self._buckets[key]
+        cutoff = now - window_seconds
+        while bucket and bucket[0] <= cutoff:
+            bucket.popleft()
+        return bucket
+
+    def update_from_headers(self, key: str, headers: Mapping[str, str]) -> None:
+        """Adopt the quota reported in a response's x-rate-limit-* headers"""
+        values = [headers.get(name) for name in RATE_LIMIT_HEADERS]
+        if None in values:
+            return
+        try:
+            limit, remaining, reset_at = (int(value) for value in values)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return
+        if reset_at <= time.time():
+            return
 
-        async with self._lock:
-            now = time.time()
-            bucket = self._buckets[key]
+        budget = self._budgets.get(key)
+        if budget is not None and budget.reset_at == reset_at:
+            # Responses to concurrent requests arrive out of order, and requests still
+            # in flight are not counted by Twitter yet: keep the lowest count seen
+            budget.remaining = min(budget.remaining, remaining)
+        else:
+            self._budgets[key] = UpstreamBudget(limit, remaining, reset_at)
+        logger.debug(
+            "Twitter reports %d/%d requests left for '%s', reset in %.0fs",
+            self._budgets[key].remaining,
+            limit,
+            key,
+            reset_at - time.time()
+        )
 
-            cutoff = now - window_seconds
-            self._buckets[key] = [ts for ts in bucket if ts > cutoff]
+    def _budget(self, key: str) -> UpstreamBudget | None:
+        budget = self._budgets.get(key)
+        if budget is not None and budget.reset_at <= time.time():
+            del self._budgets[key]
+            return None
+        return budget
 
-            if len(self._buckets[key]) >= requests_per_window:
-                oldest = min(self._buckets[key])
-                reset_time = int(oldest + window_seconds)
-                wait_time = reset_time - now
+    async def _spend_budget(self, key: str, deadline: float) -> bool:
+        """Take one request from the reported budget; False when no budget is known"""
+        budget = await self._await_budget(key, deadline)
+        if budget is None:
+            return False
+        budget.remaining -= 1
+        return True
 
+    async def _await_budget(self, key: str, deadline: float) -> UpstreamBudget | None:
+        """Wait until the reported budget has a request left; None when no budget is known"""
+        while (budget := self._budget(key)) is not None:
+            if budget.remaining > 0:
+                return budget
+
+            wait_time = budget.reset_at - time.time()
+            if time.monotonic() + wait_time > deadline:
                 logger.warning(
-                    "Rate limit exceeded for '%s': %d/%d requests. Reset in %.1fs",
+                    "Twitter quota exhausted for '%s': 0/%d requests left. Reset in %.1fs",
                     key,
-                    len(self._buckets[key]),
-                    requests_per_window,
+                    budget.limit,
                     wait_time
                 )
-
                 raise TwitterRateLimitError(
-                    f"Rate limit exceeded. Try again in {int(wait_time)} seconds."
+                    f"Rate limit exceeded. Try again in {int(wait_time)} seconds.",
+                    reset_time=int(budget.reset_at),
                 )
 
-            self._buckets[key].append(now)
-            logger.debug(
-                "Rate limit acquired for '%s': %d/%d requests used",
-                key,
-                len(self._buckets[key]),
-                requests_per_window
-            )
+            logger.debug("Twitter quota exhausted for '%s', waiting %.2fs for reset", key, wait_time)
+            await asyncio.sleep(wait_time)
+        return None
+
+    async def acquire(self, key: str = "default", max_wait: float | None = None) -> None:
+        requests_per_window, window_seconds = self._get_limits(key)
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        lock = self._locks[key]
+
+        if max_wait > 0:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=max_wait)
+            except TimeoutError:
+                raise TwitterRateLimitError(
+                    f"Rate limit exceeded. No slot for '{key}' within {max_wait:.1f} seconds."
+                ) from None
+        else:
+            await lock.acquire()
+
+        try:
+            if await self._spend_budget(key, deadline):
+                return
+
+            while True:
+                now = time.monotonic()
+                bucket = self._prune(key, now)
+                if len(bucket) < requests_per_window:
+                    bucket.append(now)
+                    logger.debug(
+                        "Rate limit acquired for '%s': %d/%d requests used",
+                        key,
+                        len(bucket),
+                        requests_per_window
+                    )
+                    return
+
+                wait_time = bucket[0] + window_seconds - now
+                if now + wait_time > deadline:
+                    logger.warning(
+                        "Rate limit exceeded for '%s': %d/%d requests. Reset in %.1fs",
+                        key,
+                        len(bucket),
+                        requests_per_window,
+                        wait_time
+                    )
+                    raise TwitterRateLimitError(
+                        f"Rate limit exceeded. Try again in {int(wait_time)} seconds."
+                    )
+
+                logger.debug("Rate limit reached for '%s', waiting %.2fs for a slot", key, wait_time)
+                await asyncio.sleep(wait_time)
+        finally:
+            lock.release()
+
+    def capacity(self, key: str = "default") -> int:
+        budget = self._budget(key)
+        return budget.limit if budget is not None else self._get_limits(key)[0]
+
+    def remaining(self, key: str = "default") -> int:
+        budget = self._budget(key)
+        if budget is not None:
+            return budget.remaining
+        requests_per_window, _ = self._get_limits(key)
+        return max(0, requests_per_window - len(self._prune(key, time.monotonic())))
@@ -0,0 +1,129 @@
+import asyncio
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+from app.core.exceptions import TwitterRateLimitError
+from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Sliding-window limiter shared by every worker and replica through one Redis
+    sorted set per key. A Lua script prunes, counts and records atomically, using
+    the Redis clock so hosts with skewed clocks still agree on the window. The quota
+    Twitter reports in response headers is applied as an extra cap on top of the
+    shared window, never in place of it. While
+    Redis is unreachable, the in-process limiter of the base class takes over for
+    `fallback_period` seconds before Redis is tried again.
+    """
+
+    # Returns {allowed, milliseconds until a slot frees up, requests in the window}
+    ACQUIRE_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local window_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now_ms - window_ms)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now_ms, now_ms .. '-' .. ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window_ms)
+    return {1, 0, count + 1}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window_ms - now_ms, count}
+"""
+
+    def __init__(
+        self,
+        client: Redis,
+        namespace: str = "twitter_api",
+        max_wait: float = 0.0,
+        fallback_period: float = 5.0,
+    ) -> None:
+        super().__init__(max_wait=max_wait)
+        self._client = client
+        self._namespace = namespace
+        self._script = client.register_script(self.ACQUIRE_SCRIPT)
+        self.fallback_period = fallback_period
+        self._fallback_until = 0.0
+        # Requests in the window as last reported by Redis, and when (monotonic) it was
+        self._used: dict[str, tuple[int, float]] = {}
+        self.fallbacks = 0
+
+    def _limit_key(self, key: str) -> str:
+        return f"{self._namespace}:ratelimit:{key}"
+
+    async def acquire(self, key: str = "default", max_wait: float | None = None) -> None:
+        if time.monotonic() < self._fallback_until:
+            return await super().acquire(key, max_wait)
+
+        requests_per_window, window_seconds = self._get_limits(key)
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        member = uuid.uuid4().hex
+
+        while True:
+            # Reported budgets are per worker, as each sees only its own responses;
+            # the shared window keeps every worker within the app's quota
+            await self._await_budget(key, deadline)
+            try:
+                allowed, wait_ms, used = await self._script(
+                    keys=[self._limit_key(key)],
+                    args=[int(window_seconds * 1000), requests_per_window, member],
+                )
+            except Exception as e:
+                logger.warning("Distributed rate limiter unavailable, using local limits: %s", e)
+                self.fallbacks += 1
+                self._fallback_until = time.monotonic() + self.fallback_period
+                return await super().acquire(key, max_wait)
+
+            self._used[key] = (int(used), time.monotonic())
+            if allowed:
+                budget = self._budget(key)
+                if budget is not None:
+                    budget.remaining = max(0, budget.remaining - 1)
+                return
+
+            wait_time = int(wait_ms) / 1000
+            if time.monotonic() + wait_time > deadline:
+                logger.warning(
+                    "Rate limit exceeded for '%s': %d/%d requests across workers. Reset in %.1fs",
+                    key,
+                    used,
+                    requests_per_window,
+                    wait_time
+                )
+                raise TwitterRateLimitError(
+                    f"Rate limit exceeded. Try again in {int(wait_time)} seconds."
+                )
+            logger.debug("Rate limit reached for '%s', waiting %.2fs for a slot", key, wait_time)
+            await asyncio.sleep(wait_time)
+
+    def capacity(self, key: str = "default") -> int:
+        requests_per_window = self._get_limits(key)[0]
+        budget = self._budget(key)
+        return min(requests_per_window, budget.limit) if budget is not None else requests_per_window
+
+    def remaining(self, key: str = "default") -> int:
+        # Last count reported by Redis, until every request it covered has left the
+        # window; local usage only while falling back
+        if time.monotonic() < self._fallback_until:
+            return super().remaining(key)
+        requests_per_window, window_seconds = self._get_limits(key)
+        observed = self._used.get(key)
+        if observed is None or time.monotonic() - observed[1] >= window_seconds:
+            self._used.pop(key, None)
+            return super().remaining(key)
+        left = max(0, requests_per_window - observed[0])
+        budget = self._budget(key)
+        return min(left, budget.remaining) if budget is not None else left
+
+    async def close(self) -> None:
+        await self._client.aclose()
+        logger.info("Rate limiter client closed (fallbacks=%d)", self.fallbacks)
@@ -0,0 +1,111 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter, defaultdict
+
+from app.core.exceptions import TwitterRateLimitError
+from app.core.scheduling import Priority, current_client, current_priority
+from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UpstreamScheduler:
+    """
+    Orders the callers waiting for a rate limiter key, instead of letting them race
+    for its lock. Waiters are served by priority class first (interactive > prewarm
+    > bulk) and, within a class, by weighted fair queuing across inbound API clients:
+    each waiter gets a virtual finish tag of max(virtual time, the client's previous
+    tag) + 1 / weight, so a client with many queued calls cannot delay another
+    client's first one. Calls below the interactive class are also refused while no
+    more than `reserve` of the key's capacity is left.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        reserve: float = 0.0,
+        weights: dict[str, float] | None = None,
+    ) -> None:
+        self.rate_limiter = rate_limiter
+        self.reserve = reserve
+        self.weights = weights or {}
+        self._queues: dict[str, list[tuple[Priority, float, int, asyncio.Future[None]]]] = defaultdict(list)
+        self._busy: set[str] = set()
+        self._virtual: dict[str, float] = defaultdict(float)
+        self._finish: dict[str, dict[str, float]] = defaultdict(dict)
+        self._sequence = itertools.count()
+        self.granted: Counter[str] = Counter()
+        self.queued = 0
+        self.reserved = 0
+
+    def _enqueue(self, key: str, priority: Priority, client: str) -> asyncio.Future[None]:
+        finish = max(self._virtual[key], self._finish[key].get(client, 0.0))
+        finish += 1 / self.weights.get(client, 1.0)
+        self._finish[key][client] = finish
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queues[key], (priority, finish, next(self._sequence), future))
+        return future
+
+    def _release(self, key: str) -> None:
+        queue = self._queues[key]
+        while queue:
+            _, finish, _, future = heapq.heappop(queue)
+            if not future.done():
+                self._virtual[key] = finish
+                future.set_result(None)
+                return
+        # Idle: every backlog has been served, so fairness starts over
+        self._busy.discard(key)
+        self._virtual.pop(key, None)
+        self._finish.pop(key, None)
+
+    async def _wait_turn(self, key: str, priority: Priority, client: str, max_wait: float) -> None:
+        if key not in self._busy:
+            self._busy.add(key)
+            return
+
+        self.queued += 1
+        future = self._enqueue(key, priority, client)
+        try:
+            if max_wait > 0:
+                await asyncio.wait_for(asyncio.shield(future), timeout=max_wait)
+            else:
+                await asyncio.shield(future)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # The turn was handed over just as we gave up: pass it on
+                self._release(key)
+            future.cancel()
+            if isinstance(e, TimeoutError):
+                raise TwitterRateLimitError(
+                    f"Rate limit exceeded. No slot for '{key}' within {max_wait:.1f} seconds."
+                ) from None
+            raise
+
+    async def acquire(self, key: str = "default", max_wait: float | None = None) -> None:
+        priority, client = current_priority(), current_client()
+        max_wait = self.rate_limiter.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+
+        await self._wait_turn(key, priority, client, max_wait)
+        try:
+            if (
+                priority is not Priority.INTERACTIVE
+                and self.rate_limiter.remaining(key) <= self.reserve * self.rate_limiter.capacity(key)
+            ):
+                self.reserved += 1
+                logger.debug("Quota for '%s' is reserved for interactive calls, refusing %s", key, priority.name)
+                raise TwitterRateLimitError(
+                    f"Rate limit exceeded. Remaining quota for '{key}' is reserved for interactive requests."
+                )
+            await self.rate_limiter.acquire(key, max(0.0, deadline - time.monotonic()))
+            self.granted[priority.name.lower()] += 1
+        finally:
+            self._release(key)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {**self.granted, "queued": self.queued, "reserved": self.reserved}
@@ -0,0 +1,105 @@
+import hashlib
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BearerToken:
+    value: str
+    # Stable across processes, so distributed limiter keys agree; safe to log
+    label: str
+    ejected_until: float = 0.0
+    requests: int = 0
+    auth_failures: int = 0
+    rate_limited: int = 0
+    ejections: int = 0
+
+    def limiter_key(self, key: str) -> str:
+        return f"{key}:{self.label}"
+
+    def is_healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class TokenPool:
+    """
+    Bearer tokens of several Twitter apps, each with its own rate limiter keys. Every
+    upstream call goes out with the healthy token that has the most quota left for
+    its endpoint. Tokens answered with 401/403 are ejected for `ejection_period`
+    seconds, and tokens answered with 429 until the reported reset. While every token
+    is ejected, all of them are tried again rather than failing without a request.
+    """
+
+    def __init__(self, tokens: list[str], rate_limiter: RateLimiter, ejection_period: float = 60.0) -> None:
+        self.tokens = [
+            BearerToken(value=token, label=hashlib.sha256(token.encode()).hexdigest()[:8])
+            for token in tokens
+        ]
+        self.rate_limiter = rate_limiter
+        self.ejection_period = ejection_period
+
+    def _candidates(self) -> list[BearerToken]:
+        now = time.time()
+        return [token for token in self.tokens if token.is_healthy(now)] or self.tokens
+
+    def select(self, key: str) -> BearerToken:
+        token = max(self._candidates(), key=lambda t: self.rate_limiter.remaining(t.limiter_key(key)))
+        token.requests += 1
+        return token
+
+    def record(self, token: BearerToken, key: str, status_code: int, headers: Mapping[str, str]) -> None:
+        """Feed a response's quota headers to the token's limiter key and eject it on failure"""
+        self.rate_limiter.update_from_headers(token.limiter_key(key), headers)
+
+        if status_code in (401, 403):
+            token.auth_failures += 1
+            self._eject(token, time.time() + self.ejection_period, f"status {status_code}")
+        elif status_code == 429:
+            token.rate_limited += 1
+            reset = headers.get("x-rate-limit-reset")
+            try:
+                until = float(reset) if reset is not None else time.time() + self.ejection_period
+            except ValueError:
+                until = time.time() + self.ejection_period
+            self._eject(token, until, f"rate limited on '{key}'")
+
+    def _eject(self, token: BearerToken, until: float, reason: str) -> None:
+        if len(self.tokens) == 1:
+            # A lone token has nothing to fail over to
+            return
+        token.ejections += 1
+        token.ejected_until = max(token.ejected_until, until)
+        logger.warning(
+            "Bearer token %s ejected for %.0fs: %s", token.label, until - time.time(), reason
+        )
+
+    def capacity(self, key: str) -> int:
+        return sum(self.rate_limiter.capacity(token.limiter_key(key)) for token in self.tokens)
+
+    def remaining(self, key: str) -> int:
+        now = time.time()
+        return sum(
+            self.rate_limiter.remaining(token.limiter_key(key))
+            for token in self.tokens
+            if token.is_healthy(now)
+        )
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        now = time.time()
+        return {
+            token.label: {
+                "requests": token.requests,
+                "auth_failures": token.auth_failures,
+                "rate_limited": token.rate_limited,
+                "ejections": token.ejections,
+                "healthy": int(token.is_healthy(now)),
+            }
+            for token in self.tokens
+        }
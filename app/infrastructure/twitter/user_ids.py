@@ -0,0 +1,44 @@
+from typing import Any
+
+from app.infrastructure.cache.lru import LRUCache
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UserIdCache:
+    """
+    Case-insensitive username -> user ID map. IDs never change for an account,
+    so entries are long-lived; the TTL only bounds how long a renamed or
+    re-registered username can resolve to its previous owner
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400) -> None:
+        self._ids: LRUCache[str] = LRUCache(max_entries, ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, username: str) -> str | None:
+        user_id = self._ids.get(username.casefold())
+        if user_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return user_id
+
+    def set(self, username: str, user_id: str) -> None:
+        self._ids.set(username.casefold(), user_id)
+
+    def update_from_includes(self, includes: dict[str, Any]) -> None:
+        for user in includes.get("users", []):
+            username = user.get("username")
+            user_id = user.get("id")
+            if username and user_id:
+                self.set(username, str(user_id))
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._ids)}
@@ -2,16 +2,44 @@ from typing import Annotated, Any
 
 from fastapi import Depends
 
+from app.application.freshness import RefreshStats
+from app.application.prewarm import PrewarmScheduler
 from app.application.services import TweetService
+from app.application.singleflight import SingleFlight
 from app.bootstrap.config import Settings, get_settings
-from app.infrastructure.cache.cache_service import RedisCacheService
+from app.core.entities import Tweet
+from app.core.interfaces import CacheService, DistributedLock
+from app.infrastructure.cache.factory import create_cache_service
+from app.infrastructure.cache.lock import RedisLock
+from app.infrastructure.cache.redis_client import create_redis_client
 from app.infrastructure.http.client import create_http_client
-from app.infrastructure.twitter.client import TwitterClient
+from app.infrastructure.twitter.client import (
+    MAX_SEARCH_RESULTS,
+    MAX_USERS_PER_LOOKUP,
+    HashtagSearch,
+    TwitterClient,
+)
 from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.infrastructure.twitter.redis_rate_limiter import RedisRateLimiter
+from app.infrastructure.twitter.scheduler import UpstreamScheduler
+from app.infrastructure.twitter.token_pool import TokenPool
+from app.infrastructure.twitter.user_ids import UserIdCache
+from app.utils.batching import MicroBatcher
+from app.utils.bloom import RotatingBloomFilter
 
 _http_client = None
-_rate_limiter = None
+_rate_limiter: RateLimiter | None = None
 _cache_service = None
+_single_flight = None
+_recompute_lock = None
+_refresh_stats = None
+_missing_users = None
+_user_ids = None
+_user_batcher = None
+_search_batcher = None
+_prewarm = None
+_upstream_scheduler = None
+_token_pool = None
 
 
 def get_http_client(settings: Annotated[Settings, Depends(get_settings)]) -> Any:
@@ -21,33 +49,236 @@ def get_http_client(settings: Annotated[Settings, Depends(get_settings)]) -> Any
     return _http_client
 
 
-def get_rate_limiter() -> RateLimiter:
+def get_rate_limiter(settings: Annotated[Settings, Depends(get_settings)]) -> RateLimiter:
     global _rate_limiter
     if _rate_limiter is None:
-        _rate_limiter = RateLimiter()
+        if settings.twitter_rate_limit_backend == "redis" and settings.redis_enabled:
+            _rate_limiter = RedisRateLimiter(
+                create_redis_client(settings), max_wait=settings.twitter_rate_limit_max_wait
+            )
+        else:
+            _rate_limiter = RateLimiter(max_wait=settings.twitter_rate_limit_max_wait)
     return _rate_limiter
 
 
-def get_cache_service(settings: Annotated[Settings, Depends(get_settings)]) -> RedisCacheService:
+def get_upstream_scheduler(
+    settings: Annotated[Settings, Depends(get_settings)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+) -> UpstreamScheduler:
+    global _upstream_scheduler
+    if _upstream_scheduler is None:
+        _upstream_scheduler = UpstreamScheduler(
+            rate_limiter,
+            reserve=settings.twitter_scheduler_reserve,
+            weights=settings.twitter_scheduler_client_weights_map,
+        )
+    return _upstream_scheduler
+
+
+def get_token_pool(
+    settings: Annotated[Settings, Depends(get_settings)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+) -> TokenPool:
+    global _token_pool
+    if _token_pool is None:
+        _token_pool = TokenPool(
+            settings.twitter_bearer_tokens_list,
+            rate_limiter,
+            ejection_period=settings.twitter_token_ejection_period,
+        )
+    return _token_pool
+
+
+def get_cache_service(settings: Annotated[Settings, Depends(get_settings)]) -> CacheService:
     global _cache_service
     if _cache_service is None:
-        _cache_service = RedisCacheService(settings)
+        _cache_service = create_cache_service(settings)
     return _cache_service
 
 
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+def get_recompute_lock(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> DistributedLock | None:
+    global _recompute_lock
+    if not (settings.cache_enabled and settings.redis_enabled and settings.cache_lock_enabled):
+        return None
+    if _recompute_lock is None:
+        _recompute_lock = RedisLock(create_redis_client(settings))
+    return _recompute_lock
+
+
+def get_user_id_cache(settings: Annotated[Settings, Depends(get_settings)]) -> UserIdCache:
+    global _user_ids
+    if _user_ids is None:
+        _user_ids = UserIdCache(
+            max_entries=settings.twitter_user_id_cache_max_entries,
+            ttl=settings.twitter_user_id_cache_ttl,
+        )
+    return _user_ids
+
+
+def get_user_batcher(
+    settings: Annotated[Settings, Depends(get_settings)],
+    http_client: Annotated[Any, Depends(get_http_client)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    user_ids: Annotated[UserIdCache, Depends(get_user_id_cache)],
+    scheduler: Annotated[UpstreamScheduler, Depends(get_upstream_scheduler)],
+    tokens: Annotated[TokenPool, Depends(get_token_pool)],
+) -> MicroBatcher[str, str]:
+    global _user_batcher
+    if _user_batcher is None:
+        # Shared across requests, so lookups from concurrent requests land in one batch
+        lookup_client = TwitterClient(
+            settings, http_client, rate_limiter, user_ids, scheduler=scheduler, tokens=tokens
+        )
+        _user_batcher = MicroBatcher(
+            lookup_client.lookup_user_ids,
+            max_batch_size=MAX_USERS_PER_LOOKUP,
+            window=settings.twitter_user_batch_window,
+        )
+    return _user_batcher
+
+
+def get_search_batcher(
+    settings: Annotated[Settings, Depends(get_settings)],
+    http_client: Annotated[Any, Depends(get_http_client)],
+    rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    user_ids: Annotated[UserIdCache, Depends(get_user_id_cache)],
+    scheduler: Annotated[UpstreamScheduler, Depends(get_upstream_scheduler)],
+    tokens: Annotated[TokenPool, Depends(get_token_pool)],
+) -> MicroBatcher[HashtagSearch, list[Tweet]]:
+    global _search_batcher
+    if _search_batcher is None:
+        search_client = TwitterClient(
+            settings, http_client, rate_limiter, user_ids, scheduler=scheduler, tokens=tokens
+        )
+        _search_batcher = MicroBatcher(
+            search_client.search_hashtags,
+            max_batch_size=MAX_SEARCH_RESULTS,
+            window=settings.twitter_search_batch_window,
+        )
+    return _search_batcher
+
+
 def get_twitter_client(
     settings: Annotated[Settings, Depends(get_settings)],
     http_client: Annotated[Any, Depends(get_http_client)],
     rate_limiter: Annotated[RateLimiter, Depends(get_rate_limiter)],
+    user_ids: Annotated[UserIdCache, Depends(get_user_id_cache)],
+    user_batcher: Annotated[MicroBatcher[str, str], Depends(get_user_batcher)],
+    search_batcher: Annotated[MicroBatcher[HashtagSearch, list[Tweet]], Depends(get_search_batcher)],
+    scheduler: Annotated[UpstreamScheduler, Depends(get_upstream_scheduler)],
+    tokens: Annotated[TokenPool, Depends(get_token_pool)],
 ) -> TwitterClient:
-    return TwitterClient(settings, http_client, rate_limiter)
+    return TwitterClient(
+        settings,
+        http_client,
+        rate_limiter,
+        user_ids,
+        user_batcher,
+        search_batcher,
+        scheduler,
+        tokens,
+    )
+
+
+def get_refresh_stats() -> RefreshStats:
+    global _refresh_stats
+    if _refresh_stats is None:
+        _refresh_stats = RefreshStats()
+    return _refresh_stats
+
+
+def get_missing_user_filter(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> RotatingBloomFilter | None:
+    global _missing_users
+    if not (settings.cache_enabled and settings.cache_missing_user_filter_enabled):
+        return None
+    if _missing_users is None:
+        _missing_users = RotatingBloomFilter(
+            capacity=settings.cache_missing_user_filter_capacity,
+            error_rate=settings.cache_missing_user_filter_error_rate,
+            rotation_interval=settings.cache_missing_user_filter_rotation,
+        )
+    return _missing_users
+
+
+def get_prewarm_scheduler(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> PrewarmScheduler | None:
+    global _prewarm
+    if not (settings.cache_enabled and settings.prewarm_enabled):
+        return None
+    if _prewarm is None:
+        _prewarm = PrewarmScheduler(
+            lambda: create_background_tweet_service(settings),
+            # Quota summed over the healthy tokens of the pool
+            get_token_pool(settings, get_rate_limiter(settings)),
+            top_n=settings.prewarm_top_n,
+            interval=settings.prewarm_interval,
+            lead_time=settings.prewarm_lead_time,
+            quota_share=settings.prewarm_quota_share,
+            half_life=settings.prewarm_half_life,
+        )
+    return _prewarm
 
 
 def get_tweet_service(
     twitter_client: Annotated[TwitterClient, Depends(get_twitter_client)],
-    cache_service: Annotated[RedisCacheService, Depends(get_cache_service)],
+    cache_service: Annotated[CacheService, Depends(get_cache_service)],
     settings: Annotated[Settings, Depends(get_settings)],
+    single_flight: Annotated[SingleFlight, Depends(get_single_flight)],
+    recompute_lock: Annotated[DistributedLock | None, Depends(get_recompute_lock)],
+    refresh_stats: Annotated[RefreshStats, Depends(get_refresh_stats)],
+    missing_users: Annotated[RotatingBloomFilter | None, Depends(get_missing_user_filter)],
+    prewarm: Annotated[PrewarmScheduler | None, Depends(get_prewarm_scheduler)],
 ) -> TweetService:
-    return TweetService(twitter_client, cache_service, settings)
+    return TweetService(
+        twitter_client,
+        cache_service,
+        settings,
+        single_flight,
+        recompute_lock,
+        refresh_stats,
+        missing_users,
+        prewarm,
+    )
+
+
+def create_background_tweet_service(settings: Settings) -> TweetService:
+    """A TweetService wired like a request's, for work outside of requests (e.g. prewarming)"""
+    http_client = get_http_client(settings)
+    rate_limiter = get_rate_limiter(settings)
+    user_ids = get_user_id_cache(settings)
+    scheduler = get_upstream_scheduler(settings, rate_limiter)
+    tokens = get_token_pool(settings, rate_limiter)
+    twitter_client = get_twitter_client(
+        settings,
+        http_client,
+        rate_limiter,
+        user_ids,
+        get_user_batcher(settings, http_client, rate_limiter, user_ids, scheduler, tokens),
+        get_search_batcher(settings, http_client, rate_limiter, user_ids, scheduler, tokens),
+        scheduler,
+        tokens,
+    )
+    # No scheduler: background refreshes must not count towards popularity
+    return TweetService(
+        twitter_client,
+        get_cache_service(settings),
+        settings,
+        get_single_flight(),
+        get_recompute_lock(settings),
+        get_refresh_stats(),
+        get_missing_user_filter(settings),
+    )
 
 
@@ -1,21 +1,29 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Response
 
+from app.application.freshness import served_stale
 from app.application.services import TweetService
+from app.bootstrap.config import get_settings
 from app.presentation.api.dependencies import get_tweet_service
 from app.presentation.schemas.tweet import TweetSchema
 
+# TWITTER_MAX_RESULTS x TWITTER_MAX_PAGES; larger limits are rejected, not silently capped
+MAX_LIMIT = get_settings().max_tweet_limit
+
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/{username}", response_model=list[TweetSchema])
 async def get_tweets_by_user(
     username: Annotated[str, Path(min_length=4, max_length=15)],
-    limit: Annotated[int, Query(ge=1, le=100)] = 30,
+    response: Response,
+    limit: Annotated[int, Query(ge=1, le=MAX_LIMIT)] = 30,
     tweet_service: TweetService = Depends(get_tweet_service),
 ) -> list[TweetSchema]:
     tweets = await tweet_service.get_tweets_by_user(username, limit)
+    if served_stale():
+        response.headers["X-Cache-Status"] = "STALE"
     return [TweetSchema.from_entity(tweet) for tweet in tweets]
 
 
@@ -0,0 +1,32 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from app.core.scheduling import ANONYMOUS_CLIENT, Priority, upstream_origin
+
+CLIENT_ID_HEADER = "X-Client-ID"
+PRIORITY_HEADER = "X-Request-Priority"
+
+
+class UpstreamContextMiddleware(BaseHTTPMiddleware):
+    """
+    Attributes the Twitter calls a request makes to its API client and priority class.
+    Clients are identified by address; the unauthenticated `X-Client-ID` header is
+    only honoured with `trust_client_id`, i.e. behind a gateway that sets it.
+    """
+
+    def __init__(self, app: ASGIApp, trust_client_id: bool = False) -> None:
+        super().__init__(app)
+        self.trust_client_id = trust_client_id
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        client = request.client.host if request.client else ANONYMOUS_CLIENT
+        if self.trust_client_id:
+            client = request.headers.get(CLIENT_ID_HEADER) or client
+        # Clients may only lower their own priority, e.g. for batch jobs
+        bulk = request.headers.get(PRIORITY_HEADER, "").lower() == "bulk"
+        priority = Priority.BULK if bulk else Priority.INTERACTIVE
+
+        with upstream_origin(priority, client):
+            return await call_next(request)
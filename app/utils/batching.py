@@ -0,0 +1,86 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MicroBatcher[K: Hashable, V]:
+    """
+    Collects keys submitted within `window` seconds and resolves them with a single
+    `batch_fn` call of at most `max_batch_size` keys. Concurrent submissions of the
+    same key share one slot; keys absent from the batch result resolve to None
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]],
+        max_batch_size: int = 100,
+        window: float = 0.01,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: dict[K, asyncio.Future[V | None]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task[None]] = set()
+        self.submitted = 0
+        self.batches = 0
+
+    async def submit(self, key: K) -> V | None:
+        self.submitted += 1
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+        # Shield so that one cancelled caller does not cancel the slot it shares with others
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._run(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future[V | None]]) -> None:
+        self.batches += 1
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            logger.debug("Micro-batch of %d keys failed: %s", len(batch), e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        tasks = list(self._batches)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"submitted": self.submitted, "batches": self.batches}
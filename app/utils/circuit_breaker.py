@@ -0,0 +1,66 @@
+import time
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. Calls slower than `slow_call_threshold`
+    count as failures too; after `failure_threshold` of them in a row the circuit
+    opens and stays open until `close()` is called (e.g. by a successful probe)
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, slow_call_threshold: float = 0.1) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self._failures = 0
+        self._opened_at: float | None = None
+        self.short_circuited = 0
+        self.trips = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self, duration: float) -> bool:
+        """Returns True if this call opened the circuit"""
+        if duration > self.slow_call_threshold:
+            logger.warning(f"Slow call through circuit '{self.name}': {duration * 1000:.1f} ms")
+            return self.record_failure()
+        self._failures = 0
+        return False
+
+    def record_failure(self) -> bool:
+        """Returns True if this call opened the circuit"""
+        self._failures += 1
+        if self._opened_at is None and self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            logger.error(f"Circuit '{self.name}' opened after {self._failures} consecutive failures")
+            return True
+        return False
+
+    def close(self) -> None:
+        if self._opened_at is not None:
+            logger.info(
+                f"Circuit '{self.name}' closed after {time.monotonic() - self._opened_at:.1f}s open"
+            )
+        self._opened_at = None
+        self._failures = 0
+
+    @property
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "open": self.is_open,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+        }
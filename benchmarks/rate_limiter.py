@@ -0,0 +1,75 @@
+"""
+Measure acquire latency of the rate limiters under contention. The Redis limiter is
+included when REDIS_URL (default redis://localhost:6379) is reachable.
+
+    python -m benchmarks.rate_limiter
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from redis.asyncio import Redis
+
+from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.infrastructure.twitter.redis_rate_limiter import RedisRateLimiter
+
+KEY = "benchmark"
+REQUESTS = 2000
+
+
+async def measure(limiter: RateLimiter, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            start = time.perf_counter()
+            await limiter.acquire(KEY)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker(REQUESTS // concurrency) for _ in range(concurrency)))
+    return latencies
+
+
+async def limiters() -> list[tuple[str, RateLimiter]]:
+    result: list[tuple[str, RateLimiter]] = [("local", RateLimiter())]
+    client = Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
+    try:
+        await client.ping()
+    except Exception as e:
+        print(f"Redis unreachable, skipping the redis limiter: {e}")
+        await client.aclose()
+        return result
+    result.append(("redis", RedisRateLimiter(client, namespace="benchmark")))
+    return result
+
+
+async def run() -> None:
+    candidates = await limiters()
+    print(f"{'limiter':>7} {'tasks':>6} {'p50 us':>9} {'p99 us':>9} {'acquires/s':>11}")
+    for name, limiter in candidates:
+        # Never the bottleneck: only the cost of acquiring is measured
+        limiter.LIMITS = {KEY: (REQUESTS * 10, 60)}
+        for concurrency in (1, 10, 100):
+            if isinstance(limiter, RedisRateLimiter):
+                await limiter._client.delete(limiter._limit_key(KEY))
+            limiter._buckets.clear()
+            start = time.perf_counter()
+            latencies = sorted(await measure(limiter, concurrency))
+            elapsed = time.perf_counter() - start
+            p50 = statistics.median(latencies)
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(
+                f"{name:>7} {concurrency:>6} {p50 * 1e6:>9.1f} {p99 * 1e6:>9.1f} "
+                f"{len(latencies) / elapsed:>11.0f}"
+            )
+        if isinstance(limiter, RedisRateLimiter):
+            await limiter.close()
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare encode/decode cost and payload size of the cache entry serializers.
+
+    python -m benchmarks.serialization
+"""
+import random
+import string
+import time
+import timeit
+
+from app.core.entities import Account, CacheEntry, Tweet
+from app.infrastructure.cache.serializers import SERIALIZERS
+
+
+def make_entry(count: int, authors: int = 20) -> CacheEntry:
+    rng = random.Random(42)
+    accounts = [
+        Account(fullname=f"User {i}", href=f"/user_{i}", id=rng.randrange(10**17, 10**18))
+        for i in range(authors)
+    ]
+    tags = [f"#{word}" for word in ("python", "coding", "asyncio", "fastapi", "redis")]
+    tweets = [
+        Tweet(
+            account=rng.choice(accounts),
+            date="12:57 PM - 7 Mar 2018",
+            hashtags=rng.sample(tags, k=rng.randint(0, 3)),
+            likes=rng.randint(0, 10_000),
+            replies=rng.randint(0, 1_000),
+            retweets=rng.randint(0, 5_000),
+            text=" ".join(
+                "".join(rng.choices(string.ascii_letters, k=rng.randint(2, 10)))
+                for _ in range(rng.randint(5, 40))
+            ),
+        )
+        for _ in range(count)
+    ]
+    return CacheEntry(tweets=tweets, fetched_at=time.time(), ttl=300)
+
+
+def main() -> None:
+    print(f"{'tweets':>6} {'format':>7} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for count in (10, 30, 100):
+        entry = make_entry(count)
+        for name, serializer_cls in SERIALIZERS.items():
+            serializer = serializer_cls()
+            payload = serializer.dumps(entry)
+            assert serializer.loads(payload) == entry
+
+            runs = 2000
+            encode = timeit.timeit(lambda s=serializer: s.dumps(entry), number=runs) / runs
+            decode = timeit.timeit(lambda s=serializer, p=payload: s.loads(p), number=runs) / runs
+            print(f"{count:>6} {name:>7} {len(payload):>8} {encode * 1e6:>10.1f} {decode * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 from unittest.mock import AsyncMock
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app.application.freshness import mark_served_stale
 from app.core.entities import Account, Tweet
+from app.core.scheduling import current_client
 from app.main import app
 from app.presentation.api.dependencies import get_tweet_service
+from app.presentation.middleware.upstream_context import UpstreamContextMiddleware
 
 
 @pytest.fixture
@@ -66,11 +70,38 @@ class TestHashtagEndpoint:
         assert len(response.json()) == 1
         mock_tweet_service.get_tweets_by_hashtag.assert_called_once_with("Python", 30)
 
+    def test_get_tweets_by_hashtag_stale_header(self, client, mock_tweet_service, mock_tweets):
+        async def serve_stale(*_args):
+            mark_served_stale()
+            return mock_tweets
+
+        mock_tweet_service.get_tweets_by_hashtag.side_effect = serve_stale
+
+        response = client.get("/api/v1/hashtags/Python")
+
+        assert response.status_code == 200
+        assert response.headers["X-Cache-Status"] == "STALE"
+
+    def test_get_tweets_by_hashtag_fresh_has_no_stale_header(
+        self, client, mock_tweet_service, mock_tweets
+    ):
+        mock_tweet_service.get_tweets_by_hashtag.return_value = mock_tweets
+
+        response = client.get("/api/v1/hashtags/Python")
+
+        assert "X-Cache-Status" not in response.headers
+
     def test_get_tweets_by_hashtag_invalid_limit(self, client):
         response = client.get("/api/v1/hashtags/Python?limit=0")
 
         assert response.status_code == 422  # Validation error
 
+    def test_get_tweets_by_hashtag_limit_above_page_capacity(self, client):
+        # TWITTER_MAX_RESULTS=100 with a single page
+        response = client.get("/api/v1/hashtags/Python?limit=101")
+
+        assert response.status_code == 422
+
     def test_get_tweets_by_hashtag_empty_hashtag(self, client):
         response = client.get("/api/v1/hashtags/?limit=30")
 
@@ -101,6 +132,35 @@ class TestUserEndpoint:
         mock_tweet_service.get_tweets_by_user.assert_called_once_with("twitter", 30)
 
 
+class TestUpstreamContext:
+    """Tests for the client identity upstream calls are attributed to."""
+
+    def test_client_id_header_is_ignored_by_default(self, client, mock_tweet_service, mock_tweets):
+        clients = []
+
+        async def get_tweets(*_args):
+            clients.append(current_client())
+            return mock_tweets
+
+        mock_tweet_service.get_tweets_by_user.side_effect = get_tweets
+
+        client.get("/api/v1/users/twitter", headers={"X-Client-ID": "fresh-id"})
+
+        assert clients == ["testclient"]
+
+    def test_client_id_header_is_honoured_when_trusted(self):
+        trusted = FastAPI()
+        trusted.add_middleware(UpstreamContextMiddleware, trust_client_id=True)
+
+        @trusted.get("/")
+        async def whoami() -> str:
+            return current_client()
+
+        response = TestClient(trusted).get("/", headers={"X-Client-ID": "dashboard"})
+
+        assert response.json() == "dashboard"
+
+
 class TestHealthEndpoint:
     def test_health_check(self, client):
         response = client.get("/health")
@@ -37,3 +37,10 @@ class TestTwitterAuthenticator:
         assert "Authorization" in headers
         assert "Content-Type" in headers
 
+
+    def test_get_headers_with_pool_token(self, test_settings: Settings):
+        auth = TwitterAuthenticator(test_settings)
+
+        headers = auth.get_headers("pooled_bearer_token")
+
+        assert headers["Authorization"] == "Bearer pooled_bearer_token"
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.utils.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_keys_share_one_batch(self):
+        calls: list[list[str]] = []
+
+        async def batch_fn(keys: list[str]) -> dict[str, str]:
+            calls.append(keys)
+            return {key: key.upper() for key in keys if key != "missing"}
+
+        batcher = MicroBatcher(batch_fn, window=0.01)
+
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), batcher.submit("a"), batcher.submit("missing")
+        )
+
+        assert results == ["A", "B", "A", None]
+        assert calls == [["a", "b", "missing"]]
+        assert batcher.stats == {"submitted": 4, "batches": 1}
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_flushed_without_waiting(self):
+        calls: list[list[int]] = []
+
+        async def batch_fn(keys: list[int]) -> dict[int, int]:
+            calls.append(keys)
+            return {key: key for key in keys}
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, window=60)
+
+        results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(4))), 1)
+
+        assert results == [0, 1, 2, 3]
+        assert calls == [[0, 1], [2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        async def batch_fn(_keys: list[str]) -> dict[str, str]:
+            raise RuntimeError("upstream down")
+
+        batcher = MicroBatcher(batch_fn, window=0.01)
+
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
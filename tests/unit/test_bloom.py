@@ -0,0 +1,33 @@
+from app.utils.bloom import BloomFilter, RotatingBloomFilter
+
+
+class TestBloomFilter:
+    def test_added_items_are_members(self):
+        bloom = BloomFilter(capacity=1000)
+        for i in range(1000):
+            bloom.add(f"user{i}")
+
+        assert all(f"user{i}" in bloom for i in range(1000))
+
+    def test_false_positive_rate_is_near_target(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"user{i}")
+
+        false_positives = sum(f"other{i}" in bloom for i in range(10000))
+
+        assert false_positives < 300
+
+
+class TestRotatingBloomFilter:
+    def test_items_are_forgotten_after_two_rotations(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.bloom.time.monotonic", lambda: now[0])
+        bloom = RotatingBloomFilter(capacity=1000, rotation_interval=60)
+        bloom.add("ghost")
+
+        now[0] += 61
+        assert "ghost" in bloom
+
+        now[0] += 61
+        assert "ghost" not in bloom
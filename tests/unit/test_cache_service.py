@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+
+from app.bootstrap.config import Settings
+from app.core.entities import Account, CacheEntry, Tweet
+from app.infrastructure.cache.cache_service import RedisCacheService
+
+
+@pytest.fixture
+def memory_cache(test_settings: Settings) -> RedisCacheService:
+    return RedisCacheService(test_settings.model_copy(update={"cache_enabled": True}))
+
+
+@pytest.fixture
+def entry() -> CacheEntry:
+    tweet = Tweet(
+        account=Account(fullname="Raymond Hettinger", href="/raymondh", id=14159138),
+        date="12:57 PM - 7 Mar 2018",
+        hashtags=["#python"],
+        likes=169,
+        replies=13,
+        retweets=27,
+        text="Historically, bash filename pattern matching was known as globbing.",
+    )
+    return CacheEntry(tweets=[tweet], fetched_at=time.time(), ttl=300)
+
+
+class TestRedisCacheService:
+    @pytest.mark.asyncio
+    async def test_set_and_get_round_trip(self, memory_cache: RedisCacheService, entry: CacheEntry):
+        await memory_cache.set("key", entry, 300)
+
+        assert await memory_cache.get("key") == entry
+
+    @pytest.mark.asyncio
+    async def test_get_missing_key(self, memory_cache: RedisCacheService):
+        assert await memory_cache.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_delete(self, memory_cache: RedisCacheService, entry: CacheEntry):
+        await memory_cache.set("key", entry, 300)
+        await memory_cache.delete("key")
+
+        assert await memory_cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_is_noop(self, cache_service: RedisCacheService, entry: CacheEntry):
+        await cache_service.set("key", entry, 300)
+
+        assert await cache_service.get("key") is None
+
+
+class FakeRedisBackend:
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int | None] = {}
+        self.calls = 0
+        self.down = False
+        self.delay = 0.0
+
+    async def _maybe_fail(self) -> None:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.down:
+            raise ConnectionError("redis down")
+
+    async def get(self, key):
+        await self._maybe_fail()
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        await self._maybe_fail()
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, key):
+        await self._maybe_fail()
+        self.data.pop(key, None)
+
+    async def exists(self, _key):
+        await self._maybe_fail()
+        return False
+
+    async def close(self):
+        pass
+
+
+class TestCacheCircuitBreaker:
+    @pytest.fixture
+    def redis_settings(self, test_settings: Settings) -> Settings:
+        return test_settings.model_copy(
+            update={
+                "cache_enabled": True,
+                "redis_enabled": True,
+                "cache_op_timeout": 0.05,
+                "cache_breaker_failure_threshold": 2,
+                "cache_breaker_slow_call_threshold": 0.02,
+                "cache_breaker_reset_timeout": 0.01,
+            }
+        )
+
+    @pytest.fixture
+    def backend(self) -> FakeRedisBackend:
+        return FakeRedisBackend()
+
+    def make_cache(self, settings: Settings, backend: FakeRedisBackend) -> RedisCacheService:
+        cache = RedisCacheService(settings)
+        cache._cache = backend
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_failures_open_circuit_and_short_circuit_to_miss(
+        self, redis_settings: Settings, backend: FakeRedisBackend
+    ):
+        cache = self.make_cache(
+            redis_settings.model_copy(update={"cache_breaker_reset_timeout": 60}), backend
+        )
+        backend.down = True
+
+        assert await cache.get("key") is None
+        assert await cache.get("key") is None
+        calls = backend.calls
+        assert await cache.get("key") is None
+
+        assert backend.calls == calls
+        assert cache.breaker.stats["short_circuited"] == 1
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_calls_time_out_and_trip_breaker(
+        self, redis_settings: Settings, backend: FakeRedisBackend, entry: CacheEntry
+    ):
+        cache = self.make_cache(
+            redis_settings.model_copy(update={"cache_breaker_reset_timeout": 60}), backend
+        )
+        backend.delay = 1.0
+
+        start = time.perf_counter()
+        assert await cache.get("key") is None
+        assert await cache.get("key") is None
+        await cache.set("key", entry, 300)
+
+        assert time.perf_counter() - start < 0.5
+        assert cache.breaker.is_open
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_memory_fallback_while_open(
+        self, redis_settings: Settings, backend: FakeRedisBackend, entry: CacheEntry
+    ):
+        cache = self.make_cache(
+            redis_settings.model_copy(
+                update={"cache_breaker_fallback": "memory", "cache_breaker_reset_timeout": 60}
+            ),
+            backend,
+        )
+        backend.down = True
+        await cache.get("a")
+        await cache.get("b")
+
+        await cache.set("key", entry, 300)
+
+        assert await cache.get("key") == entry
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_background_probe_closes_circuit_on_recovery(
+        self, redis_settings: Settings, backend: FakeRedisBackend, entry: CacheEntry
+    ):
+        cache = self.make_cache(redis_settings, backend)
+        backend.down = True
+        await cache.get("a")
+        await cache.get("b")
+        assert cache.breaker.is_open
+
+        backend.down = False
+        await asyncio.sleep(0.05)
+
+        assert not cache.breaker.is_open
+        await cache.set("key", entry, 300)
+        assert await cache.get("key") == entry
+        assert backend.ttls["key"] == 300
+        await cache.close()
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from app.core.entities import Account, CacheEntry, Tweet
+from app.infrastructure.cache.memory import MemoryCacheService
+from app.infrastructure.cache.snapshot import SQLiteCacheSnapshot
+from app.infrastructure.cache.write_behind import WriteBehindCacheService
+
+
+def make_entry(text: str = "Test tweet") -> CacheEntry:
+    tweet = Tweet(
+        account=Account(fullname="Test", href="/test", id=1),
+        date="1 Jan 2024",
+        hashtags=["#test"],
+        likes=0,
+        replies=0,
+        retweets=0,
+        text=text,
+    )
+    return CacheEntry(tweets=[tweet], fetched_at=time.time(), ttl=300, limit=30)
+
+
+class TestSQLiteCacheSnapshot:
+    @pytest.mark.asyncio
+    async def test_round_trip_restores_entries_with_remaining_ttl(self, tmp_path):
+        snapshot = SQLiteCacheSnapshot(str(tmp_path / "cache.db"))
+        source = MemoryCacheService(max_bytes=1024 * 1024)
+        await source.set("hashtag:python", make_entry("python"), 300)
+        await source.set("user:elonmusk", make_entry("elon"), 60)
+
+        assert await snapshot.save(source) == 2
+
+        target = MemoryCacheService(max_bytes=1024 * 1024)
+        assert await snapshot.restore(target) == 2
+
+        restored = await target.get("hashtag:python")
+        assert restored is not None
+        assert restored.tweets[0].text == "python"
+        assert restored.limit == 30
+        remaining = {key: ttl for key, _, ttl in await target.snapshot()}
+        assert 50 < remaining["user:elonmusk"] <= 60
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_restored(self, tmp_path):
+        snapshot = SQLiteCacheSnapshot(str(tmp_path / "cache.db"))
+        snapshot._write([("user:gone", b"", time.time() - 1)])
+
+        target = MemoryCacheService(max_bytes=1024 * 1024)
+        assert await snapshot.restore(target) == 0
+        assert len(target) == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_file_restores_nothing(self, tmp_path):
+        snapshot = SQLiteCacheSnapshot(str(tmp_path / "missing.db"))
+        target = MemoryCacheService(max_bytes=1024 * 1024)
+
+        assert await snapshot.restore(target) == 0
+        assert not (tmp_path / "missing.db").exists()
+
+    @pytest.mark.asyncio
+    async def test_restore_through_write_behind_is_not_bounded_by_queue(self, tmp_path):
+        snapshot = SQLiteCacheSnapshot(str(tmp_path / "cache.db"))
+        source = MemoryCacheService(max_bytes=64 * 1024 * 1024)
+        for i in range(15):
+            await source.set(f"user:{i}", make_entry(str(i)), 300)
+        await snapshot.save(source)
+
+        backend = MemoryCacheService(max_bytes=64 * 1024 * 1024)
+        target = WriteBehindCacheService(backend, max_pending=10)
+
+        assert await snapshot.restore(target) == 15
+        assert len(backend) == 15
+        assert target.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_restore_counts_only_entries_the_backend_kept(self, tmp_path):
+        snapshot = SQLiteCacheSnapshot(str(tmp_path / "cache.db"))
+        source = MemoryCacheService(max_bytes=1024 * 1024)
+        await source.set("hashtag:python", make_entry("python"), 300)
+        await source.set("hashtag:huge", make_entry("x" * 4096), 300)
+        await snapshot.save(source)
+
+        target = MemoryCacheService(max_bytes=2048)
+        assert await snapshot.restore(target) == 1
@@ -0,0 +1,50 @@
+import pytest
+
+from app.core.exceptions import CacheError
+from app.infrastructure.cache.compression import ZLIB_HEADER, Compressor
+
+
+class TestCompressor:
+    def test_small_values_are_stored_uncompressed(self):
+        compressor = Compressor("zlib", threshold=1024)
+        payload = b'{"tweets":[]}'
+
+        assert compressor.compress(payload) == payload
+        assert compressor.compressed == 0
+
+    def test_large_values_round_trip_with_header(self):
+        compressor = Compressor("zlib", threshold=64)
+        payload = b'{"text":"repetitive tweet text"}' * 100
+
+        data = compressor.compress(payload)
+
+        assert data[0] == ZLIB_HEADER
+        assert len(data) < len(payload)
+        assert compressor.decompress(data) == payload
+        assert compressor.stats["ratio"] > 1
+
+    def test_uncompressed_legacy_values_are_read_as_is(self):
+        compressor = Compressor("zlib", threshold=0)
+        legacy = b'[{"text":"legacy"}]'
+
+        assert compressor.decompress(legacy) == legacy
+
+    def test_compressed_values_readable_when_compression_disabled(self):
+        payload = b"x" * 2048
+        data = Compressor("zlib", threshold=0).compress(payload)
+
+        assert Compressor("none").decompress(data) == payload
+
+    def test_lz4_falls_back_to_zlib_when_unavailable(self, monkeypatch):
+        monkeypatch.setattr("app.infrastructure.cache.compression.lz4_frame", None)
+
+        compressor = Compressor("lz4", threshold=0)
+
+        assert compressor.codec == "zlib"
+
+    def test_corrupt_value_raises_cache_error(self):
+        with pytest.raises(CacheError):
+            Compressor().decompress(bytes([ZLIB_HEADER]) + b"not zlib")
+
+    def test_header_does_not_collide_with_serializer_formats(self):
+        assert ZLIB_HEADER not in (ord("{"), ord("["), 0x01)
@@ -0,0 +1,134 @@
+import time
+from dataclasses import replace
+
+import pytest
+
+from app.core.entities import Account, CacheEntry, Tweet
+from app.infrastructure.cache.memory import (
+    FrequencySketch,
+    MemoryCacheService,
+    estimate_entry_size,
+)
+
+
+def make_entry(text: str = "Test tweet", count: int = 1) -> CacheEntry:
+    tweet = Tweet(
+        account=Account(fullname="Test", href="/test", id=1),
+        date="1 Jan 2024",
+        hashtags=["#test"],
+        likes=0,
+        replies=0,
+        retweets=0,
+        text=text,
+    )
+    return CacheEntry(tweets=[tweet] * count, fetched_at=time.time(), ttl=300)
+
+
+class TestMemoryCacheService:
+    @pytest.mark.asyncio
+    async def test_set_and_get(self):
+        cache = MemoryCacheService(max_bytes=1024 * 1024)
+        entry = make_entry()
+
+        await cache.set("key", entry, 300)
+
+        assert await cache.get("key") is entry
+        assert cache.size == estimate_entry_size("key", entry)
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_removed_on_read(self):
+        cache = MemoryCacheService(max_bytes=1024 * 1024)
+        await cache.set("key", make_entry(), 0)
+
+        assert await cache.get("key") is None
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    @pytest.mark.asyncio
+    async def test_write_sweeps_expired_entries(self):
+        cache = MemoryCacheService(max_bytes=1024 * 1024)
+        await cache.set("old", make_entry(), 0)
+
+        await cache.set("new", make_entry(), 300)
+
+        assert len(cache) == 1
+        assert cache.stats["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_keeps_memory_within_budget(self):
+        entry_size = estimate_entry_size("key-00", make_entry())
+        cache = MemoryCacheService(max_bytes=entry_size * 3)
+
+        for i in range(10):
+            await cache.set(f"key-{i:02d}", make_entry(), 300)
+
+        assert len(cache) == 3
+        assert cache.size <= cache.max_bytes
+        assert await cache.get("key-00") is None
+        assert await cache.get("key-09") is not None
+        assert cache.stats["evictions"] == 7
+
+    @pytest.mark.asyncio
+    async def test_recently_read_entry_survives_eviction(self):
+        entry_size = estimate_entry_size("a", make_entry())
+        cache = MemoryCacheService(max_bytes=entry_size * 2)
+        await cache.set("a", make_entry(), 300)
+        await cache.set("b", make_entry(), 300)
+        await cache.get("a")
+
+        await cache.set("c", make_entry(), 300)
+
+        assert await cache.get("a") is not None
+        assert await cache.get("b") is None
+
+    def test_size_estimate_counts_tweet_id(self):
+        entry = make_entry()
+        with_id = CacheEntry(
+            tweets=[replace(entry.tweets[0], id="1234567890123456789")],
+            fetched_at=entry.fetched_at,
+            ttl=entry.ttl,
+        )
+
+        assert estimate_entry_size("key", with_id) > estimate_entry_size("key", entry)
+
+    @pytest.mark.asyncio
+    async def test_oversized_entry_is_not_stored(self):
+        cache = MemoryCacheService(max_bytes=1024)
+
+        await cache.set("key", make_entry(count=100), 300)
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_tinylfu_rejects_one_hit_wonders(self):
+        entry_size = estimate_entry_size("hot-0", make_entry())
+        cache = MemoryCacheService(max_bytes=entry_size * 2, policy="tinylfu")
+        for key in ("hot-0", "hot-1"):
+            await cache.set(key, make_entry(), 300)
+            for _ in range(5):
+                await cache.get(key)
+
+        for i in range(20):
+            await cache.set(f"scan-{i}", make_entry(), 300)
+
+        assert await cache.get("hot-0") is not None
+        assert await cache.get("hot-1") is not None
+        assert cache.stats["rejections"] == 20
+
+
+class TestFrequencySketch:
+    def test_estimates_and_decays(self):
+        sketch = FrequencySketch(width=128, sample_size=1000)
+        for _ in range(6):
+            sketch.increment("key")
+
+        assert sketch.estimate("key") >= 6
+        sketch._reset()
+        assert sketch.estimate("key") >= 3
+
+    def test_every_row_spreads_keys(self):
+        sketch = FrequencySketch(width=128, sample_size=1000)
+        indexes = [sketch._indexes(f"key-{i}") for i in range(32)]
+
+        for row in range(FrequencySketch.DEPTH):
+            assert len({key_indexes[row] for key_indexes in indexes}) > 1
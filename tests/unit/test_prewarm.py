@@ -0,0 +1,103 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.application.prewarm import PrewarmScheduler
+from app.core.entities import Account, CacheEntry, Tweet
+from app.infrastructure.twitter.rate_limiter import RateLimiter
+
+TWEET = Tweet(
+    account=Account(fullname="Test", href="/test", id=1),
+    date="1 Jan 2024",
+    hashtags=[],
+    likes=0,
+    replies=0,
+    retweets=0,
+    text="Test tweet",
+)
+
+
+def make_scheduler(entries: dict[str, CacheEntry], rate_limiter: RateLimiter, **kwargs) -> PrewarmScheduler:
+    service = MagicMock()
+    service.cache_service.get = AsyncMock(side_effect=entries.get)
+    service.refresh = AsyncMock()
+    return PrewarmScheduler(lambda: service, rate_limiter, **kwargs)
+
+
+class TestPrewarmScheduler:
+    def test_top_ranks_by_decayed_popularity(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.application.prewarm.time.monotonic", lambda: now[0])
+        scheduler = make_scheduler({}, RateLimiter(), top_n=2, half_life=60)
+
+        for _ in range(4):
+            scheduler.record("hashtag:old", "hashtag", "old", 30)
+        now[0] += 180  # three half-lives: 4 requests now weigh 0.5
+        scheduler.record("hashtag:new", "hashtag", "new", 30)
+        scheduler.record("user:other", "user", "other", 30)
+        scheduler.record("user:other", "user", "other", 30)
+
+        assert scheduler.top() == ["user:other", "hashtag:new"]
+
+    @pytest.mark.asyncio
+    async def test_refreshes_only_keys_close_to_expiry(self):
+        entries = {
+            "hashtag:soon": CacheEntry(tweets=[TWEET], fetched_at=time.time() - 290, ttl=300),
+            "hashtag:fresh": CacheEntry(tweets=[TWEET], fetched_at=time.time(), ttl=300),
+        }
+        scheduler = make_scheduler(entries, RateLimiter(), lead_time=30)
+        scheduler.record("hashtag:soon", "hashtag", "Soon", 50)
+        scheduler.record("hashtag:fresh", "hashtag", "fresh", 30)
+        scheduler.record("hashtag:absent", "hashtag", "absent", 30)
+
+        await scheduler.run_once()
+
+        service = scheduler.service_factory()
+        refreshed = [call.args for call in service.refresh.call_args_list]
+        assert sorted(refreshed) == [("hashtag", "Soon", 50), ("hashtag", "absent", 30)]
+        assert scheduler.stats["refreshed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_entries_are_not_prewarmed(self):
+        entries = {
+            "hashtag:empty": CacheEntry(tweets=[], fetched_at=time.time() - 50, ttl=60),
+            "user:ghost": CacheEntry(tweets=[], fetched_at=time.time() - 50, ttl=60, missing=True),
+        }
+        scheduler = make_scheduler(entries, RateLimiter(), lead_time=30)
+        scheduler.record("hashtag:empty", "hashtag", "empty", 30)
+        scheduler.record("user:ghost", "user", "ghost", 30)
+
+        await scheduler.run_once()
+
+        scheduler.service_factory().refresh.assert_not_called()
+        assert scheduler.stats["tracked"] == 0
+
+    @pytest.mark.asyncio
+    async def test_user_refresh_needs_user_lookup_quota(self):
+        rate_limiter = RateLimiter()
+        for _ in range(10):
+            await rate_limiter.acquire("get_user")
+        scheduler = make_scheduler({}, rate_limiter, quota_share=0.25)
+        scheduler.record("user:jack", "user", "jack", 30)
+
+        await scheduler.run_once()
+
+        scheduler.service_factory().refresh.assert_not_called()
+        assert scheduler.stats["skipped_quota"] == 1
+
+    @pytest.mark.asyncio
+    async def test_leaves_reserved_quota_for_on_demand_traffic(self):
+        rate_limiter = RateLimiter()
+        for _ in range(3):
+            await rate_limiter.acquire("search_tweets")
+        # 9 of 12 search requests left; a 25% share may only spend down to 9
+        scheduler = make_scheduler({}, rate_limiter, quota_share=0.25)
+        scheduler.record("hashtag:python", "hashtag", "python", 30)
+        scheduler.record("user:jack", "user", "jack", 30)
+
+        await scheduler.run_once()
+
+        service = scheduler.service_factory()
+        service.refresh.assert_called_once_with("user", "jack", 30)
+        assert scheduler.stats["skipped_quota"] == 1
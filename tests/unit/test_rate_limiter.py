@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import pytest
 
@@ -47,4 +48,114 @@ class TestRateLimiter:
         await limiter.acquire("get_user")
         await limiter.acquire("user_timeline")
 
+    @pytest.mark.asyncio
+    async def test_remaining_reflects_window_usage(self):
+        limiter = RateLimiter()
+
+        for _ in range(5):
+            await limiter.acquire("get_user")
+
+        assert limiter.capacity("get_user") == 20
+        assert limiter.remaining("get_user") == 15
+        assert limiter.remaining("search_tweets") == 12
+
+    @pytest.mark.asyncio
+    async def test_bounded_wait_queues_for_next_slot(self, monkeypatch):
+        monkeypatch.setitem(RateLimiter.LIMITS, "tiny", (2, 0.2))
+        limiter = RateLimiter(max_wait=1.0)
+
+        await limiter.acquire("tiny")
+        await limiter.acquire("tiny")
+        start = time.monotonic()
+        await limiter.acquire("tiny")
+
+        assert 0.1 < time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_bounded_wait_fails_past_deadline(self):
+        limiter = RateLimiter(max_wait=0.1)
+
+        for _ in range(12):
+            await limiter.acquire("search_tweets")
+
+        with pytest.raises(TwitterRateLimitError):
+            await limiter.acquire("search_tweets")
+
+    @pytest.mark.asyncio
+    async def test_waiting_key_does_not_block_other_keys(self, monkeypatch):
+        monkeypatch.setitem(RateLimiter.LIMITS, "tiny", (1, 0.3))
+        limiter = RateLimiter(max_wait=1.0)
+        await limiter.acquire("tiny")
+
+        waiter = asyncio.create_task(limiter.acquire("tiny"))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(limiter.acquire("user_timeline"), timeout=0.05)
+
+        assert not waiter.done()
+        await waiter
+
+
+    @pytest.mark.asyncio
+    async def test_reported_budget_replaces_static_window(self):
+        limiter = RateLimiter()
+        limiter.update_from_headers(
+            "search_tweets",
+            {
+                "x-rate-limit-limit": "450",
+                "x-rate-limit-remaining": "20",
+                "x-rate-limit-reset": str(int(time.time()) + 900),
+            },
+        )
+
+        for _ in range(20):
+            await limiter.acquire("search_tweets")
+
+        assert limiter.capacity("search_tweets") == 450
+        assert limiter.remaining("search_tweets") == 0
+        with pytest.raises(TwitterRateLimitError) as exc_info:
+            await limiter.acquire("search_tweets")
+        assert exc_info.value.reset_time is not None
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_waits_until_reset(self, monkeypatch):
+        limiter = RateLimiter(max_wait=5.0)
+        now = time.time()
+        limiter.update_from_headers(
+            "user_timeline",
+            {
+                "x-rate-limit-limit": "900",
+                "x-rate-limit-remaining": "0",
+                "x-rate-limit-reset": str(int(now) + 2),
+            },
+        )
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            monkeypatch.setattr(time, "time", lambda: now + 3)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+        await limiter.acquire("user_timeline")
+
+        assert len(sleeps) == 1 and 0 < sleeps[0] <= 2
+        # After the reset the static window applies again
+        assert limiter.capacity("user_timeline") == 100
+
+    def test_out_of_order_headers_keep_lowest_remaining(self):
+        limiter = RateLimiter()
+        reset = str(int(time.time()) + 900)
+
+        for remaining in ("10", "12"):
+            limiter.update_from_headers(
+                "get_user",
+                {"x-rate-limit-limit": "300", "x-rate-limit-remaining": remaining, "x-rate-limit-reset": reset},
+            )
+
+        assert limiter.remaining("get_user") == 10
+
+    def test_incomplete_headers_are_ignored(self):
+        limiter = RateLimiter()
+        limiter.update_from_headers("get_user", {"x-rate-limit-reset": "1234567890"})
 
+        assert limiter.capacity("get_user") == 20
@@ -0,0 +1,163 @@
+import time
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.exceptions import TwitterRateLimitError
+from app.infrastructure.twitter.redis_rate_limiter import RedisRateLimiter
+
+
+class FakeScript:
+    """Evaluates the acquire script's sliding window in Python, shared like a Redis ZSET"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def __call__(self, keys, args):
+        if self.client.down:
+            raise RedisConnectionError("Connection refused")
+        window_ms, limit, member = args
+        now_ms = int(time.time() * 1000)
+        entries = [
+            (score, m) for score, m in self.client.sets.get(keys[0], []) if score > now_ms - window_ms
+        ]
+        if len(entries) < limit:
+            entries.append((now_ms, member))
+            self.client.sets[keys[0]] = entries
+            return [1, 0, len(entries)]
+        self.client.sets[keys[0]] = entries
+        return [0, entries[0][0] + window_ms - now_ms, len(entries)]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.sets = {}
+        self.scripts = []
+        self.down = False
+        self.closed = False
+
+    def register_script(self, script):
+        self.scripts.append(script)
+        return FakeScript(self)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestRedisRateLimiter:
+    @pytest.mark.asyncio
+    async def test_limits_are_shared_between_instances(self):
+        client = FakeRedis()
+        first, second = RedisRateLimiter(client), RedisRateLimiter(client)
+
+        for _ in range(6):
+            await first.acquire("search_tweets")
+            await second.acquire("search_tweets")
+
+        with pytest.raises(TwitterRateLimitError):
+            await first.acquire("search_tweets")
+        assert second.remaining("search_tweets") == 0
+        assert client.sets.keys() == {"twitter_api:ratelimit:search_tweets"}
+
+    @pytest.mark.asyncio
+    async def test_reported_usage_expires_with_the_window(self, monkeypatch):
+        limiter = RedisRateLimiter(FakeRedis())
+        for _ in range(12):
+            await limiter.acquire("search_tweets")
+        assert limiter.remaining("search_tweets") == 0
+
+        later = time.monotonic() + 3600
+        monkeypatch.setattr(time, "monotonic", lambda: later)
+
+        assert limiter.remaining("search_tweets") == 12
+
+    @pytest.mark.asyncio
+    async def test_bounded_wait_sleeps_until_slot_frees(self):
+        limiter = RedisRateLimiter(FakeRedis(), max_wait=5.0)
+        limiter.LIMITS = {"test": (1, 1)}
+        await limiter.acquire("test")
+
+        start = time.monotonic()
+        await limiter.acquire("test")
+
+        assert time.monotonic() - start >= 0.5
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_limits_when_redis_is_down(self):
+        client = FakeRedis()
+        client.down = True
+        limiter = RedisRateLimiter(client)
+
+        for _ in range(12):
+            await limiter.acquire("search_tweets")
+        with pytest.raises(TwitterRateLimitError):
+            await limiter.acquire("search_tweets")
+
+        assert limiter.fallbacks == 1
+        assert limiter.remaining("search_tweets") == 0
+
+    @pytest.mark.asyncio
+    async def test_retries_redis_after_fallback_period(self):
+        client = FakeRedis()
+        client.down = True
+        limiter = RedisRateLimiter(client, fallback_period=0.0)
+        await limiter.acquire("user_timeline")
+
+        client.down = False
+        await limiter.acquire("user_timeline")
+
+        assert len(client.sets["twitter_api:ratelimit:user_timeline"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_close_closes_client(self):
+        client = FakeRedis()
+        await RedisRateLimiter(client).close()
+
+        assert client.closed
+
+
+class TestRedisRateLimiterScript:
+    """Runs the real Lua script, through fakeredis' embedded Lua interpreter"""
+
+    @pytest.fixture
+    def client(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        return fakeredis.FakeAsyncRedis()
+
+    @pytest.mark.asyncio
+    async def test_window_is_shared_between_instances(self, client):
+        first, second = RedisRateLimiter(client), RedisRateLimiter(client)
+
+        for _ in range(6):
+            await first.acquire("search_tweets")
+            await second.acquire("search_tweets")
+
+        with pytest.raises(TwitterRateLimitError):
+            await second.acquire("search_tweets")
+        assert await client.zcard("twitter_api:ratelimit:search_tweets") == 12
+        assert 0 < await client.pttl("twitter_api:ratelimit:search_tweets") <= 60_000
+        assert first.fallbacks == second.fallbacks == 0
+
+    @pytest.mark.asyncio
+    async def test_reported_budget_caps_without_replacing_window(self, client):
+        limiter = RedisRateLimiter(client)
+        limiter.update_from_headers(
+            "search_tweets",
+            {
+                "x-rate-limit-limit": "450",
+                "x-rate-limit-remaining": "3",
+                "x-rate-limit-reset": str(int(time.time()) + 900),
+            },
+        )
+
+        for _ in range(3):
+            await limiter.acquire("search_tweets")
+        with pytest.raises(TwitterRateLimitError) as exc_info:
+            await limiter.acquire("search_tweets")
+
+        # Every call was still recorded in the shared window
+        assert await client.zcard("twitter_api:ratelimit:search_tweets") == 3
+        assert exc_info.value.reset_time is not None
+        assert limiter.remaining("search_tweets") == 0
+        assert limiter.capacity("search_tweets") == 12
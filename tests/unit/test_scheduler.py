@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.core.exceptions import TwitterRateLimitError
+from app.core.scheduling import Priority, current_client, upstream_origin
+from app.infrastructure.twitter.scheduler import UpstreamScheduler
+
+
+class FakeRateLimiter:
+    """Records callers in order; the first acquire blocks until `gate` is set"""
+
+    def __init__(self, max_wait=5.0, remaining=100):
+        self.max_wait = max_wait
+        self._remaining = remaining
+        self.gate = asyncio.Event()
+        self.calls = []
+
+    async def acquire(self, _key="default", _max_wait=None):
+        self.calls.append(current_client())
+        if len(self.calls) == 1:
+            await self.gate.wait()
+
+    def capacity(self, _key="default"):
+        return 100
+
+    def remaining(self, _key="default"):
+        return self._remaining
+
+
+async def call(scheduler, client, priority=Priority.INTERACTIVE):
+    with upstream_origin(priority, client):
+        await scheduler.acquire("search_tweets")
+
+
+class TestUpstreamScheduler:
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_by_priority_class(self):
+        limiter = FakeRateLimiter()
+        scheduler = UpstreamScheduler(limiter)
+        holder = asyncio.create_task(call(scheduler, "holder"))
+        await asyncio.sleep(0)
+
+        waiters = [
+            asyncio.create_task(call(scheduler, "bulk", Priority.BULK)),
+            asyncio.create_task(call(scheduler, "prewarm", Priority.PREWARM)),
+            asyncio.create_task(call(scheduler, "interactive")),
+        ]
+        await asyncio.sleep(0)
+        limiter.gate.set()
+        await asyncio.gather(holder, *waiters)
+
+        assert limiter.calls == ["holder", "interactive", "prewarm", "bulk"]
+        assert scheduler.stats["queued"] == 3
+
+    @pytest.mark.asyncio
+    async def test_heavy_client_does_not_starve_others(self):
+        limiter = FakeRateLimiter()
+        scheduler = UpstreamScheduler(limiter, weights={"light": 2.0})
+        holder = asyncio.create_task(call(scheduler, "holder"))
+        await asyncio.sleep(0)
+
+        waiters = [asyncio.create_task(call(scheduler, "heavy")) for _ in range(4)]
+        await asyncio.sleep(0)
+        waiters += [asyncio.create_task(call(scheduler, "light")) for _ in range(2)]
+        await asyncio.sleep(0)
+        limiter.gate.set()
+        await asyncio.gather(holder, *waiters)
+
+        assert limiter.calls[1:] == ["light", "heavy", "light", "heavy", "heavy", "heavy"]
+
+    @pytest.mark.asyncio
+    async def test_reserve_refuses_background_calls_only(self):
+        limiter = FakeRateLimiter(remaining=10)
+        limiter.gate.set()
+        scheduler = UpstreamScheduler(limiter, reserve=0.1)
+
+        with pytest.raises(TwitterRateLimitError):
+            await call(scheduler, "prewarm", Priority.PREWARM)
+        await call(scheduler, "user")
+
+        assert limiter.calls == ["user"]
+        assert scheduler.stats == {"interactive": 1, "queued": 0, "reserved": 1}
+
+    @pytest.mark.asyncio
+    async def test_queued_call_times_out_and_passes_turn_on(self):
+        limiter = FakeRateLimiter(max_wait=0.05)
+        scheduler = UpstreamScheduler(limiter)
+        holder = asyncio.create_task(call(scheduler, "holder"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(TwitterRateLimitError):
+            await call(scheduler, "late")
+
+        limiter.gate.set()
+        await holder
+        await call(scheduler, "next")
+        assert limiter.calls == ["holder", "next"]
@@ -0,0 +1,150 @@
+import json
+import struct
+import time
+from dataclasses import replace
+
+import pytest
+
+from app.core.entities import Account, CacheEntry, Tweet
+from app.core.exceptions import CacheError
+from app.infrastructure.cache.serializers import (
+    _HEADERS,
+    BINARY_FORMAT_V1,
+    BINARY_FORMAT_V2,
+    BINARY_FORMAT_V3,
+    BINARY_FORMAT_V4,
+    BinaryEntrySerializer,
+    JsonEntrySerializer,
+    decode_entry,
+)
+
+
+@pytest.fixture
+def entry() -> CacheEntry:
+    account = Account(fullname="Raymond Hettinger", href="/raymondh", id=14159138)
+    tweets = [
+        Tweet(
+            account=account,
+            date="12:57 PM - 7 Mar 2018",
+            hashtags=["#python", "#bash"],
+            likes=169,
+            replies=13,
+            retweets=27,
+            text="Historically, bash filename pattern matching was known as globbing. 🐍",
+        ),
+        Tweet(
+            account=Account(fullname="Jane Doe", href="/janedoe", id=2**63),
+            date="1:30 PM - 8 Mar 2024",
+            hashtags=[],
+            likes=0,
+            replies=0,
+            retweets=0,
+            text="",
+        ),
+    ]
+    return CacheEntry(tweets=tweets, fetched_at=1709906040.25, ttl=300, limit=30, fetch_cost=0.42)
+
+
+def without_tweet_ids(payload: bytes) -> bytes:
+    """Strip the tweet ID block that v5 added after the account IDs"""
+    header = _HEADERS[payload[0]]
+    *_, string_count, blob_length = header.unpack_from(payload)
+    count_offset = header.size + 4 * string_count + blob_length
+    (count,) = struct.unpack_from("<I", payload, count_offset)
+    ids_offset = count_offset + 4 + 8 * count
+    return payload[:ids_offset] + payload[ids_offset + 8 * count :]
+
+
+class TestEntrySerializers:
+    @pytest.mark.parametrize("serializer", [JsonEntrySerializer(), BinaryEntrySerializer()])
+    def test_round_trip(self, serializer, entry: CacheEntry):
+        assert serializer.loads(serializer.dumps(entry)) == entry
+
+    @pytest.mark.parametrize("serializer", [JsonEntrySerializer(), BinaryEntrySerializer()])
+    def test_decode_entry_detects_format(self, serializer, entry: CacheEntry):
+        assert decode_entry(serializer.dumps(entry)) == entry
+
+    def test_binary_is_smaller_than_json(self, entry: CacheEntry):
+        many = CacheEntry(tweets=entry.tweets * 50, fetched_at=entry.fetched_at, ttl=entry.ttl)
+
+        binary = BinaryEntrySerializer().dumps(many)
+        text = JsonEntrySerializer().dumps(many)
+
+        assert len(binary) < len(text) / 2
+
+    def test_legacy_list_payload_is_read_as_stale_entry(self, entry: CacheEntry):
+        legacy = json.loads(JsonEntrySerializer().dumps(entry))["tweets"]
+
+        restored = decode_entry(json.dumps(legacy).encode(), default_ttl=300)
+
+        assert restored.tweets == entry.tweets
+        assert restored.ttl == 300
+        assert not restored.is_fresh(time.time())
+
+    def test_binary_v1_payload_is_still_readable(self, entry: CacheEntry):
+        payload = without_tweet_ids(BinaryEntrySerializer().dumps(entry))
+        # v1 had no limit, fetch cost or flags in the header: drop them and patch the version byte
+        v1 = bytes([BINARY_FORMAT_V1]) + payload[1:13] + payload[26:]
+
+        restored = decode_entry(v1)
+
+        assert restored.tweets == entry.tweets
+        assert restored.limit == 0
+        assert restored.fetch_cost == 0.0
+
+    def test_binary_v2_payload_is_still_readable(self, entry: CacheEntry):
+        payload = without_tweet_ids(BinaryEntrySerializer().dumps(entry))
+        v2 = bytes([BINARY_FORMAT_V2]) + payload[1:17] + payload[26:]
+
+        restored = decode_entry(v2)
+
+        assert restored.tweets == entry.tweets
+        assert restored.limit == 30
+        assert restored.fetch_cost == 0.0
+
+    def test_binary_v3_payload_is_still_readable(self, entry: CacheEntry):
+        payload = without_tweet_ids(BinaryEntrySerializer().dumps(entry))
+        v3 = bytes([BINARY_FORMAT_V3]) + payload[1:25] + payload[26:]
+
+        restored = decode_entry(v3)
+
+        assert restored.tweets == entry.tweets
+        assert restored.fetch_cost == 0.42
+        assert not restored.missing
+
+    def test_binary_v4_payload_reads_without_tweet_ids(self, entry: CacheEntry):
+        tweets = [replace(tweet, id=str(1764000000000000000 + i)) for i, tweet in enumerate(entry.tweets)]
+        payload = without_tweet_ids(BinaryEntrySerializer().dumps(replace(entry, tweets=tweets)))
+        v4 = bytes([BINARY_FORMAT_V4]) + payload[1:]
+
+        restored = decode_entry(v4)
+
+        assert restored.tweets == entry.tweets
+        assert restored.newest_id is None
+
+    @pytest.mark.parametrize("serializer", [JsonEntrySerializer(), BinaryEntrySerializer()])
+    def test_tweet_ids_round_trip(self, serializer, entry: CacheEntry):
+        tweets = [replace(tweet, id=str(1764000000000000000 + i)) for i, tweet in enumerate(entry.tweets)]
+        with_ids = replace(entry, tweets=tweets)
+
+        restored = serializer.loads(serializer.dumps(with_ids))
+
+        assert restored == with_ids
+        assert restored.newest_id == "1764000000000000001"
+
+    @pytest.mark.parametrize("serializer", [JsonEntrySerializer(), BinaryEntrySerializer()])
+    def test_negative_entry_round_trip(self, serializer):
+        negative = CacheEntry(tweets=[], fetched_at=1709906040.25, ttl=60, limit=30, missing=True)
+
+        assert serializer.loads(serializer.dumps(negative)) == negative
+
+    def test_unknown_binary_version_is_rejected(self, entry: CacheEntry):
+        payload = bytearray(BinaryEntrySerializer().dumps(entry))
+        payload[0] = 0x7F
+
+        with pytest.raises(CacheError):
+            BinaryEntrySerializer().loads(bytes(payload))
+
+    def test_truncated_binary_payload_is_rejected(self, entry: CacheEntry):
+        with pytest.raises(CacheError):
+            BinaryEntrySerializer().loads(BinaryEntrySerializer().dumps(entry)[:10])
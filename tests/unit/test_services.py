@@ -1,9 +1,31 @@
-from unittest.mock import AsyncMock
+import asyncio
+import time
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.application.freshness import served_stale
 from app.application.services import TweetService
-from app.core.entities import Account, Tweet
+from app.bootstrap.config import Settings
+from app.core.entities import Account, CacheEntry, Tweet
+from app.core.exceptions import (
+    CacheError,
+    TwitterAPIError,
+    TwitterRateLimitError,
+    TwitterResourceNotFoundError,
+    TwitterServiceUnavailableError,
+)
+from app.core.interfaces import DistributedLock
+from app.core.scheduling import (
+    BACKGROUND_CLIENT,
+    Priority,
+    current_client,
+    current_priority,
+    upstream_origin,
+)
+from app.infrastructure.cache.cache_service import RedisCacheService
+from app.utils.bloom import RotatingBloomFilter
 
 
 class TestTweetService:
@@ -53,7 +75,9 @@ class TestTweetService:
                 text="Cached tweet",
             )
         ]
-        tweet_service.cache_service.get = AsyncMock(return_value=cached_tweets)
+        tweet_service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=cached_tweets, fetched_at=time.time(), ttl=300, limit=30)
+        )
         tweet_service.tweet_repository.get_tweets_by_hashtag = AsyncMock()
 
         result = await tweet_service.get_tweets_by_hashtag("test")
@@ -112,3 +136,708 @@ class TestTweetService:
         # limit=0 is falsy, so default 30 is used
         tweet_service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 30)
 
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cache_misses_are_coalesced(
+        self, tweet_service: TweetService
+    ):
+        tweet_service.cache_service.get = AsyncMock(return_value=None)
+        tweet_service.cache_service.set = AsyncMock()
+
+        async def slow_fetch(*_args):
+            await asyncio.sleep(0.01)
+            return []
+
+        tweet_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(side_effect=slow_fetch)
+
+        await asyncio.gather(*(tweet_service.get_tweets_by_hashtag("test") for _ in range(10)))
+
+        tweet_service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 30)
+        assert tweet_service.single_flight.coalesced == 9
+
+    @pytest.mark.asyncio
+    async def test_smaller_concurrent_fetch_keeps_cached_superset(self, tweet_service: TweetService):
+        tweets = [
+            Tweet(
+                account=Account(fullname="Test", href="/test", id=1),
+                date="1 Jan 2024",
+                hashtags=[],
+                likes=0,
+                replies=0,
+                retweets=0,
+                text=f"Tweet {i}",
+                id=str(i),
+            )
+            for i in range(100)
+        ]
+        store: dict[str, CacheEntry] = {}
+
+        async def cache_set(key, entry, _ttl):
+            store[key] = entry
+
+        tweet_service.cache_service.get = AsyncMock(side_effect=lambda key: store.get(key))
+        tweet_service.cache_service.set = AsyncMock(side_effect=cache_set)
+
+        async def fetch(_subject, limit, **_kwargs):
+            # The smaller request finishes last
+            await asyncio.sleep(0.02 if limit < 100 else 0.01)
+            return tweets[:limit]
+
+        tweet_service.tweet_repository.get_tweets_by_hashtag = fetch
+
+        large, small = await asyncio.gather(
+            tweet_service.get_tweets_by_hashtag("test", 100), tweet_service.get_tweets_by_hashtag("test", 30)
+        )
+
+        assert (len(large), len(small)) == (100, 30)
+        assert store["hashtag:test"].limit == 100
+        assert len(store["hashtag:test"].tweets) == 100
+
+    @pytest.mark.asyncio
+    async def test_limit_is_clamped_to_page_cap(self, twitter_client, cache_service, test_settings: Settings):
+        settings = test_settings.model_copy(update={"twitter_max_pages": 5})
+        service = TweetService(twitter_client, cache_service, settings)
+        service.cache_service.get = AsyncMock(return_value=None)
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        await service.get_tweets_by_hashtag("test", limit=450)
+        await service.get_tweets_by_hashtag("test", limit=5000)
+
+        limits = [call.args[1] for call in service.tweet_repository.get_tweets_by_hashtag.call_args_list]
+        assert limits == [450, 500]
+
+
+class FakeLock(DistributedLock):
+    def __init__(self, held: bool = False) -> None:
+        self.held = held
+        self.released: list[str] = []
+
+    async def acquire(self, _key: str, _ttl: int) -> str | None:
+        if self.held:
+            return None
+        self.held = True
+        return "token"
+
+    async def release(self, key: str, _token: str) -> None:
+        self.held = False
+        self.released.append(key)
+
+
+class TestRecomputeLock:
+    @pytest.fixture
+    def lock_settings(self, test_settings: Settings) -> Settings:
+        return test_settings.model_copy(
+            update={"cache_lock_wait_timeout": 0.05, "cache_lock_poll_interval": 0.01}
+        )
+
+    @pytest.mark.asyncio
+    async def test_lock_holder_fetches_and_releases(
+        self, twitter_client, cache_service, lock_settings: Settings
+    ):
+        lock = FakeLock()
+        service = TweetService(twitter_client, cache_service, lock_settings, recompute_lock=lock)
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        await service.get_tweets_by_hashtag("test")
+
+        service.tweet_repository.get_tweets_by_hashtag.assert_called_once()
+        assert lock.released == ["hashtag:test"]
+
+    @pytest.mark.asyncio
+    async def test_waiter_reads_cache_filled_by_lock_holder(
+        self, twitter_client, cache_service, lock_settings: Settings
+    ):
+        service = TweetService(
+            twitter_client, cache_service, lock_settings, recompute_lock=FakeLock(held=True)
+        )
+        cached_tweets = [
+            Tweet(
+                account=Account(fullname="Cached", href="/cached", id=1),
+                date="1 Jan 2024",
+                hashtags=[],
+                likes=0,
+                replies=0,
+                retweets=0,
+                text="Filled by another worker",
+            )
+        ]
+        service.cache_service.get = AsyncMock(
+            side_effect=[None, CacheEntry(tweets=cached_tweets, fetched_at=time.time(), ttl=300, limit=30)]
+        )
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock()
+
+        result = await service.get_tweets_by_hashtag("test")
+
+        assert result == cached_tweets
+        service.tweet_repository.get_tweets_by_hashtag.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_waiter_falls_back_to_direct_fetch_after_timeout(
+        self, twitter_client, cache_service, lock_settings: Settings
+    ):
+        service = TweetService(
+            twitter_client, cache_service, lock_settings, recompute_lock=FakeLock(held=True)
+        )
+        service.cache_service.get = AsyncMock(return_value=None)
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        await service.get_tweets_by_hashtag("test")
+
+        service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 30)
+
+
+class TestStaleWhileRevalidate:
+    @pytest.fixture
+    def swr_service(self, twitter_client, cache_service, test_settings: Settings) -> TweetService:
+        settings = test_settings.model_copy(
+            update={"cache_swr_enabled": True, "cache_ttl": 60, "cache_stale_ttl": 600}
+        )
+        return TweetService(twitter_client, cache_service, settings)
+
+    @pytest.fixture
+    def stale_tweets(self) -> list[Tweet]:
+        return [
+            Tweet(
+                account=Account(fullname="Stale", href="/stale", id=1),
+                date="1 Jan 2024",
+                hashtags=[],
+                likes=0,
+                replies=0,
+                retweets=0,
+                text="Old tweet",
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed_in_background(
+        self, swr_service: TweetService, stale_tweets: list[Tweet]
+    ):
+        fresh_tweets = [replace(stale_tweets[0], text="New tweet")]
+        swr_service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=stale_tweets, fetched_at=time.time() - 120, ttl=60, limit=30)
+        )
+        swr_service.cache_service.set = AsyncMock()
+        swr_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=fresh_tweets)
+
+        result = await swr_service.get_tweets_by_hashtag("test")
+        assert result == stale_tweets
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        swr_service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 30)
+        key, entry, ttl = swr_service.cache_service.set.call_args.args
+        assert key == "hashtag:test"
+        assert entry.tweets == fresh_tweets
+        assert ttl == 660
+
+    @pytest.mark.asyncio
+    async def test_revalidation_runs_at_background_priority(
+        self, swr_service: TweetService, stale_tweets: list[Tweet]
+    ):
+        origins = []
+
+        async def fetch(*_args, **_kwargs):
+            origins.append((current_priority(), current_client()))
+            return stale_tweets
+
+        swr_service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=stale_tweets, fetched_at=time.time() - 120, ttl=60, limit=30)
+        )
+        swr_service.cache_service.set = AsyncMock()
+        swr_service.tweet_repository.get_tweets_by_hashtag = fetch
+
+        with upstream_origin(Priority.INTERACTIVE, client="alice"):
+            await swr_service.get_tweets_by_hashtag("test")
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert origins == [(Priority.PREWARM, BACKGROUND_CLIENT)]
+
+    @pytest.mark.asyncio
+    async def test_request_does_not_join_background_refresh(
+        self, swr_service: TweetService, stale_tweets: list[Tweet]
+    ):
+        priorities = []
+        release = asyncio.Event()
+
+        async def fetch(*_args, **_kwargs):
+            priorities.append(current_priority())
+            await release.wait()
+            return stale_tweets
+
+        swr_service.cache_service.get = AsyncMock(return_value=None)
+        swr_service.cache_service.set = AsyncMock()
+        swr_service.tweet_repository.get_tweets_by_hashtag = fetch
+
+        refresh = asyncio.create_task(swr_service.refresh("hashtag", "test", 30))
+        await asyncio.sleep(0)
+        request = asyncio.create_task(swr_service.get_tweets_by_hashtag("test", 30))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await request == stale_tweets
+        await refresh
+        assert priorities == [Priority.PREWARM, Priority.INTERACTIVE]
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_joins_request_in_flight(
+        self, swr_service: TweetService, stale_tweets: list[Tweet]
+    ):
+        swr_service.cache_service.get = AsyncMock(return_value=None)
+        swr_service.cache_service.set = AsyncMock()
+
+        async def slow_fetch(*_args, **_kwargs):
+            await asyncio.sleep(0.01)
+            return stale_tweets
+
+        swr_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(side_effect=slow_fetch)
+
+        await asyncio.gather(
+            swr_service.get_tweets_by_hashtag("test", 30), swr_service.refresh("hashtag", "test", 30)
+        )
+
+        swr_service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 30)
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_does_not_trigger_refresh(
+        self, swr_service: TweetService, stale_tweets: list[Tweet]
+    ):
+        swr_service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=stale_tweets, fetched_at=time.time(), ttl=60, limit=30)
+        )
+        swr_service.tweet_repository.get_tweets_by_hashtag = AsyncMock()
+
+        await swr_service.get_tweets_by_hashtag("test")
+        await asyncio.sleep(0)
+
+        swr_service.tweet_repository.get_tweets_by_hashtag.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hard_expired_entry_fetches_synchronously(
+        self, swr_service: TweetService, stale_tweets: list[Tweet]
+    ):
+        swr_service.cache_service.get = AsyncMock(return_value=None)
+        swr_service.cache_service.set = AsyncMock()
+        swr_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=stale_tweets)
+
+        result = await swr_service.get_tweets_by_hashtag("test")
+
+        assert result == stale_tweets
+        swr_service.cache_service.set.assert_called_once()
+
+
+class TestStaleIfError:
+    @pytest.fixture
+    def degraded_service(self, twitter_client, cache_service, test_settings: Settings) -> TweetService:
+        settings = test_settings.model_copy(
+            update={"cache_stale_if_error_enabled": True, "cache_ttl": 60}
+        )
+        return TweetService(twitter_client, cache_service, settings)
+
+    @pytest.fixture
+    def expired_entry(self) -> CacheEntry:
+        tweet = Tweet(
+            account=Account(fullname="Known", href="/known", id=1),
+            date="1 Jan 2024",
+            hashtags=[],
+            likes=0,
+            replies=0,
+            retweets=0,
+            text="Last known good",
+        )
+        return CacheEntry(tweets=[tweet], fetched_at=time.time() - 3600, ttl=60, limit=30)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [TwitterRateLimitError(), TwitterServiceUnavailableError()])
+    async def test_serves_last_known_good_on_upstream_failure(
+        self, degraded_service: TweetService, expired_entry: CacheEntry, error: Exception
+    ):
+        degraded_service.cache_service.get = AsyncMock(return_value=expired_entry)
+        degraded_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(side_effect=error)
+
+        async def request() -> tuple[list[Tweet], bool]:
+            tweets = await degraded_service.get_tweets_by_hashtag("test")
+            return tweets, served_stale()
+
+        result, stale = await asyncio.create_task(request())
+
+        assert result == expired_entry.tweets
+        assert stale is True
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched_when_upstream_healthy(
+        self, degraded_service: TweetService, expired_entry: CacheEntry
+    ):
+        degraded_service.cache_service.get = AsyncMock(return_value=expired_entry)
+        degraded_service.cache_service.set = AsyncMock()
+        degraded_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        result = await degraded_service.get_tweets_by_hashtag("test")
+
+        assert result == []
+        assert served_stale() is False
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_without_cached_copy(self, degraded_service: TweetService):
+        degraded_service.cache_service.get = AsyncMock(return_value=None)
+        degraded_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(
+            side_effect=TwitterRateLimitError()
+        )
+
+        with pytest.raises(TwitterRateLimitError):
+            await degraded_service.get_tweets_by_hashtag("test")
+
+    @pytest.mark.asyncio
+    async def test_storage_ttl_covers_last_known_good_window(self, degraded_service: TweetService):
+        assert degraded_service._storage_ttl == 60 + 86400
+
+
+class TestLimitSupersetCache:
+    @pytest.fixture
+    def tweets(self) -> list[Tweet]:
+        return [
+            Tweet(
+                account=Account(fullname="Test", href="/test", id=1),
+                date="1 Jan 2024",
+                hashtags=["#Python"],
+                likes=0,
+                replies=0,
+                retweets=0,
+                text=f"Tweet {i}",
+            )
+            for i in range(100)
+        ]
+
+    @pytest.fixture
+    def memory_service(self, twitter_client, test_settings: Settings) -> TweetService:
+        settings = test_settings.model_copy(update={"cache_enabled": True})
+        return TweetService(twitter_client, RedisCacheService(settings), settings)
+
+    @pytest.mark.asyncio
+    async def test_smaller_limit_is_sliced_from_larger_entry(
+        self, memory_service: TweetService, tweets: list[Tweet]
+    ):
+        memory_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=tweets)
+
+        await memory_service.get_tweets_by_hashtag("Python", limit=100)
+        result = await memory_service.get_tweets_by_hashtag("#python", limit=30)
+
+        assert result == tweets[:30]
+        memory_service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("Python", 100)
+
+    @pytest.mark.asyncio
+    async def test_larger_limit_goes_upstream_and_replaces_entry(
+        self, memory_service: TweetService, tweets: list[Tweet]
+    ):
+        memory_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(
+            side_effect=lambda _hashtag, limit: tweets[:limit]
+        )
+
+        await memory_service.get_tweets_by_hashtag("python", limit=30)
+        result = await memory_service.get_tweets_by_hashtag("python", limit=31)
+        await memory_service.get_tweets_by_hashtag("python", limit=10)
+
+        assert len(result) == 31
+        assert memory_service.tweet_repository.get_tweets_by_hashtag.call_count == 2
+        entry = await memory_service.cache_service.get("hashtag:python")
+        assert entry.limit == 31
+
+    @pytest.mark.asyncio
+    async def test_exhausted_result_covers_any_limit(
+        self, memory_service: TweetService, tweets: list[Tweet]
+    ):
+        memory_service.tweet_repository.get_tweets_by_user = AsyncMock(return_value=tweets[:5])
+
+        await memory_service.get_tweets_by_user("User", limit=30)
+        result = await memory_service.get_tweets_by_user("user", limit=100)
+
+        assert result == tweets[:5]
+        memory_service.tweet_repository.get_tweets_by_user.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_write_failure_does_not_fail_request(
+        self, memory_service: TweetService, tweets: list[Tweet]
+    ):
+        memory_service.cache_service.set = AsyncMock(side_effect=CacheError("redis down"))
+        memory_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=tweets)
+
+        result = await memory_service.get_tweets_by_hashtag("python", limit=10)
+
+        assert result == tweets[:10]
+
+
+class TestEarlyRecompute:
+    @pytest.fixture
+    def tweets(self) -> list[Tweet]:
+        return [
+            Tweet(
+                account=Account(fullname="Test", href="/test", id=1),
+                date="1 Jan 2024",
+                hashtags=[],
+                likes=0,
+                replies=0,
+                retweets=0,
+                text="Cached tweet",
+            )
+        ]
+
+    def make_service(self, twitter_client, cache_service, test_settings: Settings, **update) -> TweetService:
+        settings = test_settings.model_copy(update={"cache_ttl": 60, **update})
+        return TweetService(twitter_client, cache_service, settings)
+
+    @pytest.mark.asyncio
+    async def test_expensive_entry_near_expiry_is_refreshed_early(
+        self, twitter_client, cache_service, test_settings: Settings, tweets: list[Tweet]
+    ):
+        service = self.make_service(
+            twitter_client, cache_service, test_settings, cache_early_recompute_beta=10.0
+        )
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(
+                tweets=tweets, fetched_at=time.time() - 59, ttl=60, limit=30, fetch_cost=100.0
+            )
+        )
+        service.cache_service.set = AsyncMock()
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=tweets)
+
+        result = await service.get_tweets_by_hashtag("test")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert result == tweets
+        service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 30)
+        assert service.refresh_stats.stats == {"early": 1, "expired": 0}
+        entry = service.cache_service.set.call_args.args[1]
+        assert entry.fetch_cost > 0
+
+    @pytest.mark.asyncio
+    async def test_early_recompute_disabled_by_default(
+        self, twitter_client, cache_service, test_settings: Settings, tweets: list[Tweet]
+    ):
+        service = self.make_service(twitter_client, cache_service, test_settings)
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(
+                tweets=tweets, fetched_at=time.time() - 59, ttl=60, limit=30, fetch_cost=100.0
+            )
+        )
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock()
+
+        await service.get_tweets_by_hashtag("test")
+        await asyncio.sleep(0)
+
+        service.tweet_repository.get_tweets_by_hashtag.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_expired_refresh_is_counted(
+        self, twitter_client, cache_service, test_settings: Settings, tweets: list[Tweet]
+    ):
+        service = self.make_service(twitter_client, cache_service, test_settings)
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=tweets, fetched_at=time.time() - 120, ttl=60, limit=30)
+        )
+        service.cache_service.set = AsyncMock()
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=tweets)
+
+        await service.get_tweets_by_hashtag("test")
+
+        assert service.refresh_stats.stats == {"early": 0, "expired": 1}
+
+    @pytest.mark.asyncio
+    async def test_ttl_jitter_shortens_entry_ttl_within_bounds(
+        self, twitter_client, cache_service, test_settings: Settings
+    ):
+        service = self.make_service(
+            twitter_client, cache_service, test_settings, cache_ttl=1000, cache_ttl_jitter=0.2
+        )
+
+        ttls = {service._entry_ttl() for _ in range(200)}
+
+        assert all(800 <= ttl <= 1000 for ttl in ttls)
+        assert len(ttls) > 1
+
+
+class TestNegativeCache:
+    @pytest.fixture
+    def memory_service(self, twitter_client, test_settings: Settings) -> TweetService:
+        settings = test_settings.model_copy(update={"cache_enabled": True, "cache_negative_ttl": 60})
+        return TweetService(twitter_client, RedisCacheService(settings), settings)
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_cached(self, memory_service: TweetService):
+        memory_service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        assert await memory_service.get_tweets_by_hashtag("deadtag") == []
+        assert await memory_service.get_tweets_by_hashtag("DeadTag", limit=100) == []
+
+        memory_service.tweet_repository.get_tweets_by_hashtag.assert_called_once()
+        entry = await memory_service.cache_service.get("hashtag:deadtag")
+        assert entry.ttl == 60
+        assert not entry.missing
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_cached_as_missing(self, memory_service: TweetService):
+        memory_service.tweet_repository.get_tweets_by_user = AsyncMock(
+            side_effect=TwitterResourceNotFoundError("User @ghost not found")
+        )
+
+        for _ in range(3):
+            with pytest.raises(TwitterResourceNotFoundError):
+                await memory_service.get_tweets_by_user("ghost")
+
+        memory_service.tweet_repository.get_tweets_by_user.assert_called_once()
+        entry = await memory_service.cache_service.get("user:ghost")
+        assert entry.missing
+
+    @pytest.mark.asyncio
+    async def test_negative_caching_can_be_disabled(self, twitter_client, test_settings: Settings):
+        settings = test_settings.model_copy(update={"cache_enabled": True, "cache_negative_ttl": 0})
+        service = TweetService(twitter_client, RedisCacheService(settings), settings)
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        await service.get_tweets_by_hashtag("deadtag")
+        await service.get_tweets_by_hashtag("deadtag")
+
+        assert service.tweet_repository.get_tweets_by_hashtag.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_user_filter_skips_cache(self, twitter_client, cache_service, test_settings: Settings):
+        missing_users = RotatingBloomFilter(capacity=1000)
+        service = TweetService(twitter_client, cache_service, test_settings, missing_users=missing_users)
+        service.cache_service.get = AsyncMock(return_value=None)
+        service.tweet_repository.get_tweets_by_user = AsyncMock(
+            side_effect=TwitterResourceNotFoundError("User @Ghost not found")
+        )
+
+        with pytest.raises(TwitterResourceNotFoundError):
+            await service.get_tweets_by_user("Ghost")
+        with pytest.raises(TwitterResourceNotFoundError):
+            await service.get_tweets_by_user("ghost")
+
+        service.cache_service.get.assert_called_once()
+        assert missing_users.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_usernames_gain_no_popularity(
+        self, twitter_client, cache_service, test_settings: Settings
+    ):
+        missing_users = RotatingBloomFilter(capacity=1000)
+        missing_users.add("ghost")
+        prewarm = MagicMock()
+        service = TweetService(
+            twitter_client, cache_service, test_settings, missing_users=missing_users, prewarm=prewarm
+        )
+
+        with pytest.raises(TwitterResourceNotFoundError):
+            await service.get_tweets_by_user("ghost")
+
+        prewarm.record.assert_not_called()
+
+
+class TestIncrementalRefresh:
+    @pytest.fixture
+    def service(self, twitter_client, cache_service, test_settings: Settings) -> TweetService:
+        settings = test_settings.model_copy(
+            update={"cache_incremental_refresh_enabled": True, "cache_ttl": 60}
+        )
+        return TweetService(twitter_client, cache_service, settings)
+
+    def make_tweet(self, tweet_id: int) -> Tweet:
+        return Tweet(
+            account=Account(fullname="Test", href="/test", id=1),
+            date="1 Jan 2024",
+            hashtags=[],
+            likes=0,
+            replies=0,
+            retweets=0,
+            text=f"Tweet {tweet_id}",
+            id=str(tweet_id),
+        )
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refreshed_with_since_id_and_merged(self, service: TweetService):
+        cached = [self.make_tweet(i) for i in (103, 102, 101)]
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=cached, fetched_at=time.time() - 120, ttl=60, limit=3)
+        )
+        service.cache_service.set = AsyncMock()
+        delta = [self.make_tweet(105), self.make_tweet(104), self.make_tweet(103)]
+        service.tweet_repository.get_tweets_by_user = AsyncMock(return_value=delta)
+
+        result = await service.get_tweets_by_user("user", limit=3)
+
+        service.tweet_repository.get_tweets_by_user.assert_called_once_with("user", 3, since_id="103")
+        assert [tweet.id for tweet in result] == ["105", "104", "103"]
+
+    @pytest.mark.asyncio
+    async def test_empty_delta_keeps_cached_tweets(self, service: TweetService):
+        cached = [self.make_tweet(i) for i in (103, 102)]
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=cached, fetched_at=time.time() - 120, ttl=60, limit=30)
+        )
+        service.cache_service.set = AsyncMock()
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=[])
+
+        result = await service.get_tweets_by_hashtag("test")
+
+        assert result == cached
+        entry = service.cache_service.set.call_args.args[1]
+        assert entry.tweets == cached
+        assert entry.is_fresh(time.time())
+
+    @pytest.mark.asyncio
+    async def test_failed_delta_falls_back_to_full_fetch(self, service: TweetService):
+        cached = [self.make_tweet(i) for i in (103, 102)]
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=cached, fetched_at=time.time() - 120, ttl=60, limit=30)
+        )
+        service.cache_service.set = AsyncMock()
+        fresh = [self.make_tweet(110)]
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(
+            side_effect=[TwitterAPIError("Invalid since_id", 400), fresh]
+        )
+
+        result = await service.get_tweets_by_hashtag("test")
+
+        assert result == fresh
+        assert service.tweet_repository.get_tweets_by_hashtag.call_args_list[1].args == ("test", 30)
+        assert service.tweet_repository.get_tweets_by_hashtag.call_args_list[1].kwargs == {}
+
+    @pytest.mark.asyncio
+    async def test_larger_limit_fetches_full_result(self, service: TweetService):
+        cached = [self.make_tweet(i) for i in range(10)]
+        service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=cached, fetched_at=time.time(), ttl=60, limit=10)
+        )
+        service.cache_service.set = AsyncMock()
+        service.tweet_repository.get_tweets_by_hashtag = AsyncMock(return_value=cached)
+
+        await service.get_tweets_by_hashtag("test", limit=20)
+
+        service.tweet_repository.get_tweets_by_hashtag.assert_called_once_with("test", 20)
+
+
+class TestPrewarmRefresh:
+    @pytest.mark.asyncio
+    async def test_refresh_recomputes_fresh_entry(self, tweet_service: TweetService):
+        tweet = Tweet(
+            account=Account(fullname="Test", href="/test", id=1),
+            date="1 Jan 2024",
+            hashtags=[],
+            likes=0,
+            replies=0,
+            retweets=0,
+            text="Tweet",
+        )
+        tweet_service.cache_service.get = AsyncMock(
+            return_value=CacheEntry(tweets=[tweet], fetched_at=time.time(), ttl=300, limit=50)
+        )
+        tweet_service.cache_service.set = AsyncMock()
+        tweet_service.tweet_repository.get_tweets_by_user = AsyncMock(return_value=[tweet])
+
+        await tweet_service.refresh("user", "Jack", 30)
+
+        tweet_service.tweet_repository.get_tweets_by_user.assert_called_once_with("Jack", 50)
+        assert tweet_service.cache_service.set.call_args.args[0] == "user:jack"
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+
+from app.bootstrap.config import Settings
+from app.core.entities import Account, CacheEntry, Tweet
+from app.infrastructure.cache.cache_service import RedisCacheService
+from app.infrastructure.cache.lru import LRUCache
+from app.infrastructure.cache.tiered import TieredCacheService
+
+
+class FakePubSub:
+    def __init__(self, bus: "FakeRedis") -> None:
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.bus = bus
+
+    async def __aenter__(self) -> "FakePubSub":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        self.bus.subscribers.remove(self)
+
+    async def subscribe(self, _channel: str) -> None:
+        self.bus.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.subscribers: list[FakePubSub] = []
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def publish(self, _channel: str, data: str) -> None:
+        for subscriber in self.subscribers:
+            subscriber.queue.put_nowait({"type": "message", "data": data.encode()})
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.fixture
+def entry() -> CacheEntry:
+    tweet = Tweet(
+        account=Account(fullname="Test", href="/test", id=1),
+        date="1 Jan 2024",
+        hashtags=[],
+        likes=0,
+        replies=0,
+        retweets=0,
+        text="Test tweet",
+    )
+    return CacheEntry(tweets=[tweet], fetched_at=time.time(), ttl=300)
+
+
+@pytest.fixture
+def l2(test_settings: Settings) -> RedisCacheService:
+    return RedisCacheService(test_settings.model_copy(update={"cache_enabled": True}))
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        lru: LRUCache[int] = LRUCache(max_entries=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("a") == 1
+        assert lru.get("b") is None
+        assert lru.get("c") == 3
+
+    def test_expired_entry_is_dropped(self):
+        lru: LRUCache[int] = LRUCache(max_entries=2, ttl=0)
+        lru.set("a", 1)
+
+        assert lru.get("a") is None
+        assert len(lru) == 0
+
+
+class TestTieredCacheService:
+    @pytest.mark.asyncio
+    async def test_read_through_counts_l1_and_l2_hits(self, l2, entry: CacheEntry):
+        await l2.set("key", entry, 300)
+        cache = TieredCacheService(l2, FakeRedis(), max_entries=10, ttl=10)
+
+        assert await cache.get("key") == entry
+        assert await cache.get("key") == entry
+        assert await cache.get("missing") is None
+
+        assert cache.stats["l2_hits"] == 1
+        assert cache.stats["l1_hits"] == 1
+        assert cache.stats["misses"] == 1
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_write_through_populates_both_tiers(self, l2, entry: CacheEntry):
+        cache = TieredCacheService(l2, FakeRedis(), max_entries=10, ttl=10)
+
+        await cache.set("key", entry, 300)
+
+        assert cache.l1.get("key") == entry
+        assert await l2.get("key") == entry
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_other_workers_l1(self, l2, entry: CacheEntry):
+        bus = FakeRedis()
+        worker_a = TieredCacheService(l2, bus, max_entries=10, ttl=10)
+        worker_b = TieredCacheService(l2, bus, max_entries=10, ttl=10)
+        await worker_a.set("key", entry, 300)
+        await worker_b.get("missing")
+        await asyncio.sleep(0)
+        await worker_b.get("key")
+        assert worker_b.l1.get("key") == entry
+
+        await worker_a.delete("key")
+        await asyncio.sleep(0)
+
+        assert worker_b.l1.get("key") is None
+        assert await worker_b.get("key") is None
+        await worker_a.close()
+        await worker_b.close()
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from app.infrastructure.twitter.rate_limiter import RateLimiter
+from app.infrastructure.twitter.token_pool import TokenPool
+
+
+@pytest.fixture
+def pool() -> TokenPool:
+    return TokenPool(["token_a", "token_b"], RateLimiter(), ejection_period=60.0)
+
+
+class TestTokenPool:
+    @pytest.mark.asyncio
+    async def test_select_prefers_token_with_most_remaining_quota(self, pool: TokenPool):
+        first = pool.select("search_tweets")
+        await pool.rate_limiter.acquire(first.limiter_key("search_tweets"))
+
+        second = pool.select("search_tweets")
+
+        assert second is not first
+        assert pool.capacity("search_tweets") == 24
+        assert pool.remaining("search_tweets") == 23
+
+    def test_auth_failure_ejects_token(self, pool: TokenPool):
+        token = pool.select("get_user")
+
+        pool.record(token, "get_user", 401, {})
+
+        assert all(pool.select("get_user") is not token for _ in range(3))
+        assert pool.stats[token.label]["auth_failures"] == 1
+        assert pool.stats[token.label]["healthy"] == 0
+
+    def test_rate_limited_token_is_ejected_until_reset(self, pool: TokenPool):
+        token = pool.select("user_timeline")
+        reset = int(time.time()) + 900
+
+        pool.record(token, "user_timeline", 429, {"x-rate-limit-reset": str(reset)})
+
+        assert token.ejected_until == reset
+        assert pool.stats[token.label]["rate_limited"] == 1
+        assert pool.remaining("user_timeline") == 100
+
+    def test_all_tokens_are_tried_when_every_token_is_ejected(self, pool: TokenPool):
+        for token in pool.tokens:
+            pool.record(token, "get_user", 403, {})
+
+        assert pool.select("get_user") in pool.tokens
+
+    def test_single_token_is_never_ejected(self):
+        pool = TokenPool(["only_token"], RateLimiter())
+        token = pool.select("get_user")
+
+        pool.record(token, "get_user", 429, {})
+
+        assert pool.stats[token.label] == {
+            "requests": 1,
+            "auth_failures": 0,
+            "rate_limited": 1,
+            "ejections": 0,
+            "healthy": 1,
+        }
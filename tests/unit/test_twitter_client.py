@@ -1,3 +1,5 @@
+import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock
 
 import httpx
@@ -25,6 +27,7 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 200
         mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
         mock_http_client.get.return_value = mock_response
@@ -42,6 +45,7 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 200
         mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
         mock_http_client.get.return_value = mock_response
@@ -56,10 +60,13 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         user_response = MagicMock(spec=httpx.Response)
+        user_response.headers = {}
         user_response.status_code = 200
         user_response.json.return_value = MOCK_USER_LOOKUP_RESPONSE
 
         timeline_response = MagicMock(spec=httpx.Response)
+
+        timeline_response.headers = {}
         timeline_response.status_code = 200
         timeline_response.json.return_value = MOCK_USER_TIMELINE_RESPONSE
 
@@ -72,11 +79,240 @@ class TestTwitterClient:
         assert tweets[0].likes == 287
         assert tweets[0].account.fullname == "Twitter"
 
+    @pytest.mark.asyncio
+    async def test_user_id_is_resolved_once(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        user_response = MagicMock(spec=httpx.Response)
+        user_response.headers = {}
+        user_response.status_code = 200
+        user_response.json.return_value = MOCK_USER_LOOKUP_RESPONSE
+
+        timeline_response = MagicMock(spec=httpx.Response)
+
+        timeline_response.headers = {}
+        timeline_response.status_code = 200
+        timeline_response.json.return_value = MOCK_USER_TIMELINE_RESPONSE
+
+        mock_http_client.get.side_effect = [user_response, timeline_response, timeline_response]
+
+        await twitter_client.get_tweets_by_user("twitter", limit=10)
+        await twitter_client.get_tweets_by_user("Twitter", limit=10)
+
+        assert mock_http_client.get.call_count == 3
+        assert mock_http_client.get.call_args.args[0].endswith("/users/783214/tweets")
+
+    @pytest.mark.asyncio
+    async def test_search_expansions_populate_user_ids(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        search_response = MagicMock(spec=httpx.Response)
+        search_response.headers = {}
+        search_response.status_code = 200
+        search_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
+
+        timeline_response = MagicMock(spec=httpx.Response)
+
+        timeline_response.headers = {}
+        timeline_response.status_code = 200
+        timeline_response.json.return_value = MOCK_USER_TIMELINE_RESPONSE
+
+        mock_http_client.get.side_effect = [search_response, timeline_response]
+
+        await twitter_client.get_tweets_by_hashtag("Python", limit=10)
+        await twitter_client.get_tweets_by_user("RaymondH", limit=10)
+
+        assert mock_http_client.get.call_count == 2
+        assert mock_http_client.get.call_args.args[0].endswith("/users/14159138/tweets")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_user_lookups_are_batched(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        twitter_client.settings = twitter_client.settings.model_copy(
+            update={"twitter_user_batch_window": 0.01}
+        )
+        twitter_client.user_batcher.window = 0.01
+        lookup_response = MagicMock(spec=httpx.Response)
+        lookup_response.headers = {}
+        lookup_response.status_code = 200
+        lookup_response.json.return_value = {
+            "data": [
+                {"id": "783214", "name": "Twitter", "username": "Twitter"},
+                {"id": "14159138", "name": "Raymond Hettinger", "username": "raymondh"},
+            ],
+            "errors": [{"value": "ghost", "detail": "Could not find user with usernames: [ghost]."}],
+        }
+        mock_http_client.get.return_value = lookup_response
+
+        results = await asyncio.gather(
+            twitter_client._resolve_user_id("twitter"),
+            twitter_client._resolve_user_id("RaymondH"),
+            twitter_client._resolve_user_id("ghost"),
+            return_exceptions=True,
+        )
+
+        assert results[:2] == ["783214", "14159138"]
+        assert isinstance(results[2], TwitterResourceNotFoundError)
+        mock_http_client.get.assert_called_once()
+        assert mock_http_client.get.call_args.args[0].endswith("/users/by")
+        assert mock_http_client.get.call_args.kwargs["params"]["usernames"] == "twitter,raymondh,ghost"
+        assert twitter_client.user_ids.get("RAYMONDH") == "14159138"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_hashtag_searches_share_one_query(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        twitter_client.settings = twitter_client.settings.model_copy(
+            update={"twitter_search_batch_window": 0.01}
+        )
+        twitter_client.search_batcher.window = 0.01
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
+        mock_response.status_code = 200
+        mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
+        mock_http_client.get.return_value = mock_response
+
+        python, coding = await asyncio.gather(
+            twitter_client.get_tweets_by_hashtag("Python", limit=10),
+            twitter_client.get_tweets_by_hashtag("coding", limit=10),
+        )
+
+        mock_http_client.get.assert_called_once()
+        params = mock_http_client.get.call_args.kwargs["params"]
+        assert params["query"] == "#Python OR #coding"
+        assert params["max_results"] == 20
+        assert len(python) == 2
+        assert [tweet.text for tweet in coding] == ["Learning #Python is fun! #coding"]
+
+    @pytest.mark.asyncio
+    async def test_underfilled_hashtag_is_refetched_when_combined_result_is_truncated(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        combined_response = MagicMock(spec=httpx.Response)
+        combined_response.headers = {}
+        combined_response.status_code = 200
+        # Fewer tweets than requested, but Twitter reports more results
+        combined_response.json.return_value = {
+            **MOCK_TWEET_SEARCH_RESPONSE,
+            "meta": {"result_count": 2, "next_token": "next"},
+        }
+        single_response = MagicMock(spec=httpx.Response)
+        single_response.headers = {}
+        single_response.status_code = 200
+        single_response.json.return_value = {"data": [], "meta": {"result_count": 0}}
+        mock_http_client.get.side_effect = [combined_response, single_response]
+
+        results = await twitter_client.search_hashtags([("Python", 1), ("rust", 1)])
+
+        assert mock_http_client.get.call_count == 2
+        combined_params = mock_http_client.get.call_args_list[0].kwargs["params"]
+        assert combined_params["max_results"] == 10
+        assert mock_http_client.get.call_args.kwargs["params"]["query"] == "#rust"
+        assert len(results[("Python", 1)]) == 1
+        assert results[("rust", 1)] == []
+
+    @pytest.mark.asyncio
+    async def test_combined_result_without_next_token_is_complete(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
+        mock_response.status_code = 200
+        mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
+        mock_http_client.get.return_value = mock_response
+
+        results = await twitter_client.search_hashtags([("Python", 5), ("rust", 5)])
+
+        mock_http_client.get.assert_called_once()
+        assert results[("rust", 5)] == []
+
+    def test_hashtag_groups_respect_result_and_query_limits(self, twitter_client: TwitterClient):
+        wanted = {f"tag{i}": (f"tag{i}", 30) for i in range(7)}
+        groups = twitter_client._group_hashtags(wanted)
+        assert [len(group) for group in groups] == [3, 3, 1]
+
+        long_tags = {f"{'x' * 200}{i}": (f"{'x' * 200}{i}", 10) for i in range(3)}
+        assert [len(group) for group in twitter_client._group_hashtags(long_tags)] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_pagination_follows_next_token_up_to_limit(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        twitter_client.settings = twitter_client.settings.model_copy(
+            update={"twitter_max_results": 10, "twitter_max_pages": 3}
+        )
+        page = MOCK_TWEET_SEARCH_RESPONSE["data"][0]
+
+        def make_page(count: int, next_token: str | None) -> MagicMock:
+            response = MagicMock(spec=httpx.Response)
+            response.headers = {}
+            response.status_code = 200
+            meta = {"result_count": count} | ({"next_token": next_token} if next_token else {})
+            response.json.return_value = {
+                "data": [page] * count,
+                "includes": MOCK_TWEET_SEARCH_RESPONSE["includes"],
+                "meta": meta,
+            }
+            return response
+
+        mock_http_client.get.side_effect = [make_page(10, "p2"), make_page(10, "p3")]
+
+        tweets = await twitter_client.get_tweets_by_hashtag("Python", limit=20)
+
+        assert len(tweets) == 20
+        assert mock_http_client.get.call_count == 2
+        first, second = (call.kwargs["params"] for call in mock_http_client.get.call_args_list)
+        assert "next_token" not in first
+        assert second["next_token"] == "p2"
+
+    @pytest.mark.asyncio
+    async def test_pagination_stops_at_page_cap(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        twitter_client.settings = twitter_client.settings.model_copy(
+            update={"twitter_max_results": 10, "twitter_max_pages": 2}
+        )
+        response = MagicMock(spec=httpx.Response)
+        response.headers = {}
+        response.status_code = 200
+        response.json.return_value = {
+            "data": [MOCK_USER_TIMELINE_RESPONSE["data"][0]] * 10,
+            "includes": MOCK_USER_TIMELINE_RESPONSE["includes"],
+            "meta": {"result_count": 10, "next_token": "more"},
+        }
+        mock_http_client.get.return_value = response
+        twitter_client.user_ids.set("twitter", "783214")
+
+        tweets = await twitter_client.get_tweets_by_user("twitter", limit=1000)
+
+        assert len(tweets) == 20
+        assert mock_http_client.get.call_count == 2
+        assert mock_http_client.get.call_args.kwargs["params"]["pagination_token"] == "more"
+
+    @pytest.mark.asyncio
+    async def test_since_id_bypasses_batching_and_is_forwarded(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
+        mock_response.status_code = 200
+        mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
+        mock_http_client.get.return_value = mock_response
+
+        tweets = await twitter_client.get_tweets_by_hashtag("Python", limit=10, since_id="1234567889")
+
+        params = mock_http_client.get.call_args.kwargs["params"]
+        assert params["query"] == "#Python"
+        assert params["since_id"] == "1234567889"
+        assert [tweet.id for tweet in tweets] == ["1234567890", "1234567891"]
+
     @pytest.mark.asyncio
     async def test_authentication_error_401(
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 401
         mock_response.is_success = False
         mock_response.json.return_value = MOCK_ERROR_RESPONSE_401
@@ -93,6 +329,7 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 404
         mock_response.is_success = False
         mock_response.json.return_value = MOCK_ERROR_RESPONSE_404
@@ -122,11 +359,64 @@ class TestTwitterClient:
 
         assert exc_info.value.reset_time == 1234567890
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers_update_limiter(
+        self, twitter_client: TwitterClient, mock_http_client: AsyncMock
+    ):
+        mock_response = MagicMock(spec=httpx.Response)
+        mock_response.status_code = 200
+        mock_response.is_success = True
+        mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
+        mock_response.headers = {
+            "x-rate-limit-limit": "450",
+            "x-rate-limit-remaining": "0",
+            "x-rate-limit-reset": str(int(time.time()) + 900),
+        }
+        mock_http_client.get.return_value = mock_response
+
+        await twitter_client.get_tweets_by_hashtag("Python", limit=10)
+
+        assert twitter_client.tokens.capacity("search_tweets") == 450
+        # The exhausted quota is known before Twitter has to answer with a 429
+        with pytest.raises(TwitterRateLimitError):
+            await twitter_client.get_tweets_by_hashtag("Rust", limit=10)
+        assert mock_http_client.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_token_fails_over_to_next_token(
+        self, test_settings, mock_http_client: AsyncMock
+    ):
+        settings = test_settings.model_copy(
+            update={"twitter_bearer_tokens": "second_bearer_token", "twitter_search_batch_window": 0}
+        )
+        client = TwitterClient(settings, mock_http_client)
+        limited = MagicMock(spec=httpx.Response)
+        limited.status_code = 429
+        limited.is_success = False
+        limited.json.return_value = {}
+        limited.text = "Rate limit exceeded"
+        limited.url = "https://api.twitter.com/2/tweets/search/recent"
+        limited.headers = {"x-rate-limit-reset": str(int(time.time()) + 900)}
+        success = MagicMock(spec=httpx.Response)
+        success.headers = {}
+        success.status_code = 200
+        success.is_success = True
+        success.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
+        mock_http_client.get.side_effect = [limited, success]
+
+        with pytest.raises(TwitterRateLimitError):
+            await client.get_tweets_by_hashtag("Python", limit=10)
+        await client.get_tweets_by_hashtag("Python", limit=10)
+
+        tokens_used = [call.kwargs["headers"]["Authorization"] for call in mock_http_client.get.call_args_list]
+        assert tokens_used == ["Bearer test_bearer_token", "Bearer second_bearer_token"]
+
     @pytest.mark.asyncio
     async def test_limit_validation(
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 200
         mock_response.json.return_value = MOCK_TWEET_SEARCH_RESPONSE
         mock_http_client.get.return_value = mock_response
@@ -136,6 +426,11 @@ class TestTwitterClient:
         call_args = mock_http_client.get.call_args
         assert call_args.kwargs["params"]["max_results"] == 100
 
+        # The first page respects the API minimum as well
+        await twitter_client.get_tweets_by_hashtag("Python", limit=5)
+
+        assert mock_http_client.get.call_args.kwargs["params"]["max_results"] == 10
+
     @pytest.mark.asyncio
     async def test_network_error(
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
@@ -152,6 +447,7 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 500
         mock_response.is_success = False
         mock_response.json.return_value = {}
@@ -170,6 +466,7 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 200
         mock_response.json.return_value = {"data": [], "includes": {"users": []}}
         mock_http_client.get.return_value = mock_response
@@ -183,6 +480,7 @@ class TestTwitterClient:
         self, twitter_client: TwitterClient, mock_http_client: AsyncMock
     ):
         mock_response = MagicMock(spec=httpx.Response)
+        mock_response.headers = {}
         mock_response.status_code = 404
         mock_response.json.return_value = MOCK_ERROR_RESPONSE_404
         mock_response.text = "User not found"
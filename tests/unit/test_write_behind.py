@@ -0,0 +1,115 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.entities import Account, CacheEntry, Tweet
+from app.core.exceptions import CacheError
+from app.infrastructure.cache.memory import MemoryCacheService
+from app.infrastructure.cache.write_behind import WriteBehindCacheService
+
+
+@pytest.fixture
+def entry() -> CacheEntry:
+    tweet = Tweet(
+        account=Account(fullname="Test", href="/test", id=1),
+        date="1 Jan 2024",
+        hashtags=[],
+        likes=0,
+        replies=0,
+        retweets=0,
+        text="Test tweet",
+    )
+    return CacheEntry(tweets=[tweet], fetched_at=time.time(), ttl=300, limit=30)
+
+
+class TestWriteBehindCacheService:
+    @pytest.mark.asyncio
+    async def test_set_returns_before_backend_write(self, entry: CacheEntry):
+        backend = MemoryCacheService(max_bytes=1024 * 1024)
+        backend.set_many = AsyncMock(side_effect=backend.set_many)
+        cache = WriteBehindCacheService(backend, flush_interval=0.01)
+
+        await cache.set("key", entry, 300)
+
+        backend.set_many.assert_not_called()
+        assert await cache.get("key") is entry
+        await asyncio.sleep(0.05)
+        assert await backend.get("key") is entry
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_batched(self, entry: CacheEntry):
+        backend = MemoryCacheService(max_bytes=1024 * 1024)
+        backend.set_many = AsyncMock(side_effect=backend.set_many)
+        cache = WriteBehindCacheService(backend, batch_size=4, flush_interval=0.01)
+
+        for i in range(10):
+            await cache.set(f"key-{i}", entry, 300)
+        await asyncio.sleep(0.05)
+
+        assert [len(call.args[0]) for call in backend.set_many.call_args_list] == [4, 4, 2]
+        assert cache.stats["written"] == 10
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_writes(self, entry: CacheEntry):
+        cache = WriteBehindCacheService(MemoryCacheService(max_bytes=1024 * 1024), max_pending=2)
+
+        for i in range(5):
+            await cache.set(f"key-{i}", entry, 300)
+        await cache.set("key-0", entry, 300)
+
+        assert cache.stats["dropped"] == 3
+        assert cache.stats["pending"] == 2
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_is_counted_not_raised(self, entry: CacheEntry):
+        backend = MemoryCacheService(max_bytes=1024 * 1024)
+        backend.set_many = AsyncMock(side_effect=CacheError("redis down"))
+        cache = WriteBehindCacheService(backend, flush_interval=0)
+
+        await cache.set("key", entry, 300)
+        await cache.flush()
+
+        assert cache.stats["failed"] == 1
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_writes(self, entry: CacheEntry):
+        backend = MemoryCacheService(max_bytes=1024 * 1024)
+        cache = WriteBehindCacheService(backend, flush_interval=10)
+
+        await cache.set("key", entry, 300)
+        await cache.close()
+
+        assert await backend.get("key") is entry
+
+    @pytest.mark.asyncio
+    async def test_entries_stay_readable_while_flushing(self, entry: CacheEntry):
+        backend = MemoryCacheService(max_bytes=1024 * 1024)
+        release = asyncio.Event()
+        newer = CacheEntry(tweets=entry.tweets, fetched_at=time.time(), ttl=300, limit=50)
+
+        async def slow_set_many(_items):
+            await release.wait()
+
+        backend.set_many = AsyncMock(side_effect=slow_set_many)
+        cache = WriteBehindCacheService(backend, flush_interval=0)
+
+        await cache.set("key", entry, 300)
+        await cache.set("other", entry, 300)
+        flush = asyncio.create_task(cache.flush())
+        await asyncio.sleep(0)
+
+        assert await cache.get("key") is entry
+        await cache.set("other", newer, 300)
+        release.set()
+        await flush
+
+        assert cache.stats["written"] == 3
+        backend.set_many.assert_called_with([("other", newer, 300)])
+        assert cache.stats["pending"] == 0
+        await cache.close()